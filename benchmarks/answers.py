@@ -0,0 +1,184 @@
+"""Deterministic provider answers, and fetchers that replay them offline."""
+import json
+import logging
+from random import Random
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from fastapi_boilerplate.tools.provider_stand_in import synthetic_payload
+from fastapi_boilerplate.types import (
+    EdamamConfig,
+    NutrientsConfig,
+    NutrientSource,
+    NutritionixConfig,
+    SpoonacularConfig,
+)
+
+FOODS = ["apple", "whole milk", "egg", "banana", "cheddar cheese"]
+FOODS += ["white rice", "chicken breast", "olive oil", "oat", "almond"]
+AMOUNTS = ["1", "2", "1 cup", "100 g"]
+INGREDIENTS = [f"{amount} {food}" for food in FOODS for amount in AMOUNTS]
+
+# Fields the providers send besides those the fetchers read; their values do
+# not matter, but decoding has to skip them as it does in production.
+EXTRA_NUTRIENTS = [f"Vitamin {name}" for name in "A B1 B2 B3 B5 B6 B12 C D E K"]
+EXTRA_NUTRIENTS += ["Calcium", "Iron", "Magnesium", "Phosphorus", "Potassium"]
+EXTRA_NUTRIENTS += ["Zinc", "Copper", "Manganese", "Selenium", "Folate", "Choline"]
+EXTRA_CODES = ["CA", "FE", "MG", "P", "K", "ZN", "VITA_RAE", "VITC", "THIA"]
+EXTRA_CODES += ["RIBF", "NIA", "VITB6A", "FOLDFE", "VITB12", "VITD", "TOCPHA"]
+
+
+def nutritionix_food(line: str, random: Random) -> Dict[str, Any]:
+    food = synthetic_payload(NutrientSource.NUTRITIONIX, line)
+    return {
+        **food,
+        "full_nutrients": [
+            {"attr_id": attr_id, "value": round(random.uniform(0, 50), 4)}
+            for attr_id in range(200, 310)
+        ],
+        "nix_brand_name": None,
+        "nix_brand_id": None,
+        "nix_item_name": None,
+        "nix_item_id": None,
+        "upc": None,
+        "consumed_at": "2023-08-01T12:00:00+00:00",
+        "metadata": {"is_raw_food": False},
+        "source": 1,
+        "tags": {"item": food["food_name"], "quantity": "1.0", "tag_id": 1},
+        "alt_measures": [
+            {"serving_weight": 100, "measure": "g", "seq": seq, "qty": 100}
+            for seq in range(8)
+        ],
+        "photo": {"thumb": None, "highres": None, "is_user_uploaded": False},
+    }
+
+
+def spoonacular_ingredient(line: str, random: Random) -> Dict[str, Any]:
+    ingredient = synthetic_payload(NutrientSource.SPOONACULAR, line)
+    nutrition = ingredient["nutrition"]
+    return {
+        **ingredient,
+        "original": line,
+        "originalName": ingredient["name"],
+        "unitShort": ingredient["unit"],
+        "unitLong": ingredient["unit"],
+        "possibleUnits": ["g", "oz", "cup", "serving"],
+        "estimatedCost": {
+            "value": round(random.uniform(10, 500), 2),
+            "unit": "US Cents",
+        },
+        "consistency": "SOLID",
+        "aisle": "Produce",
+        "meta": [],
+        "nutrition": {
+            **nutrition,
+            "nutrients": [
+                *nutrition["nutrients"],
+                *(
+                    {
+                        "name": name,
+                        "amount": round(random.uniform(0, 20), 2),
+                        "unit": "mg",
+                        "percentOfDailyNeeds": round(random.uniform(0, 30), 2),
+                    }
+                    for name in EXTRA_NUTRIENTS
+                ),
+            ],
+            "properties": [
+                {"name": "Glycemic Index", "amount": 38, "unit": ""},
+                {"name": "Nutrition Score", "amount": 5.2, "unit": "%"},
+            ],
+            "caloricBreakdown": {
+                "percentProtein": 10,
+                "percentFat": 30,
+                "percentCarbs": 60,
+            },
+        },
+    }
+
+
+def edamam_ingredient(line: str, random: Random) -> Dict[str, Any]:
+    ingredient = synthetic_payload(NutrientSource.EDAMAM, line)
+    return {
+        **ingredient,
+        "parsed": [
+            {
+                **parsed,
+                "foodMatch": parsed["food"],
+                "foodId": "food_" + parsed["food"].replace(" ", "_"),
+                "retainedWeight": parsed["weight"],
+                "nutrients": {
+                    **parsed["nutrients"],
+                    **{
+                        code: {
+                            "label": code,
+                            "quantity": round(random.uniform(0, 20), 2),
+                            "unit": "mg",
+                        }
+                        for code in EXTRA_CODES
+                    },
+                },
+                "measureURI": None,
+            }
+            for parsed in ingredient["parsed"]
+        ],
+    }
+
+
+def provider_answer(name: str) -> bytes:
+    """Returns the same answer on every run, listing all of `INGREDIENTS`."""
+    random = Random(name)
+    match NutrientSource(name):
+        case NutrientSource.NUTRITIONIX:
+            answer: Any = {
+                "foods": [nutritionix_food(line, random) for line in INGREDIENTS]
+            }
+        case NutrientSource.SPOONACULAR:
+            answer = [spoonacular_ingredient(line, random) for line in INGREDIENTS]
+        case NutrientSource.EDAMAM:
+            ingredients: List[Any] = [
+                edamam_ingredient(line, random) for line in INGREDIENTS
+            ]
+            answer = {
+                "uri": None,
+                "yield": 1,
+                "dietLabels": [],
+                "healthLabels": ["VEGETARIAN", "PESCATARIAN"],
+                "cautions": [],
+                "ingredients": ingredients,
+            }
+    return json.dumps(answer).encode()
+
+
+class ReplayedResponse:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class ReplaySendProviderRequest:
+    def __init__(self, content: bytes):
+        self.response = ReplayedResponse(content)
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, *, send):
+        return self.response
+
+
+def create_fetcher(cls, content: bytes, *, fast_decoding: bool = False):
+    config = SimpleNamespace(
+        nutritionix=NutritionixConfig(base_url="", app_id="", app_key=""),
+        spoonacular=SpoonacularConfig(base_url="", api_key=""),
+        edamam=EdamamConfig(base_url="", app_id="", app_key=""),
+        nutrients=NutrientsConfig(fast_decoding=fast_decoding),
+    )
+    return cls(
+        config,
+        logging.getLogger(__name__),
+        None,
+        ReplaySendProviderRequest(content),
+    )
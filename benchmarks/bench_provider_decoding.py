@@ -0,0 +1,80 @@
+"""Benchmark of pydantic against fast decoding of provider answers."""
+import asyncio
+import json
+import timeit
+from typing import Any, Callable
+
+from fastapi_boilerplate.services.fetch_edamam_nutrients import (
+    EdamamResponse,
+    FetchEdamamNutrients,
+    decode_edamam_response,
+)
+from fastapi_boilerplate.services.fetch_nutritionix_nutrients import (
+    FetchNutritionixNutrients,
+    NutritionixResponse,
+    decode_nutritionix_response,
+)
+from fastapi_boilerplate.services.fetch_spoonacular_nutrients import (
+    FetchSpoonacularNutrients,
+    SpoonacularIngredient,
+    decode_spoonacular_ingredients,
+)
+from fastapi_boilerplate.utils import fast_decoder
+
+from .answers import create_fetcher, provider_answer
+
+PROVIDERS = [
+    (
+        "nutritionix",
+        FetchNutritionixNutrients,
+        lambda data: NutritionixResponse(**data),
+        decode_nutritionix_response,
+    ),
+    (
+        "spoonacular",
+        FetchSpoonacularNutrients,
+        lambda data: [SpoonacularIngredient(**item) for item in data],
+        decode_spoonacular_ingredients,
+    ),
+    (
+        "edamam",
+        FetchEdamamNutrients,
+        lambda data: EdamamResponse(**data),
+        decode_edamam_response,
+    ),
+]
+
+
+def best(call: Callable[[], Any], number: int = 20) -> float:
+    return min(timeit.repeat(call, number=number, repeat=5)) / number
+
+
+def report(label: str, pydantic: float, fast: float) -> None:
+    print(
+        f"{label:<24} pydantic {pydantic * 1000:8.2f} ms   "
+        f"fast {fast * 1000:8.2f} ms   speedup {pydantic / fast:5.2f}x"
+    )
+
+
+def main() -> None:
+    print(f"JSON parser: {fast_decoder.loads.__module__}, best of 5")
+    for name, cls, validate, decode in PROVIDERS:
+        content = provider_answer(name)
+        report(
+            f"{name} decode",
+            best(lambda: validate(json.loads(content))),
+            best(lambda: decode(content)),
+        )
+        pydantic_fetcher = create_fetcher(cls, content)
+        fast_fetcher = create_fetcher(cls, content, fast_decoding=True)
+        expected = asyncio.run(pydantic_fetcher.execute(query=""))
+        assert expected and expected == asyncio.run(fast_fetcher.execute(query=""))
+        report(
+            f"{name} execute",
+            best(lambda: asyncio.run(pydantic_fetcher.execute(query=""))),
+            best(lambda: asyncio.run(fast_fetcher.execute(query=""))),
+        )
+
+
+if __name__ == "__main__":
+    main()
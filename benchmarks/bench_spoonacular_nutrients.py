@@ -0,0 +1,115 @@
+"""Benchmark of the Spoonacular nutrient index against a linear scan."""
+import asyncio
+import json
+import timeit
+from typing import Dict, List
+
+from fastapi_boilerplate.services.fetch_spoonacular_nutrients import (
+    SPOONACULAR_FIELDS,
+    FetchSpoonacularNutrients,
+    SpoonacularIngredient,
+    SpoonacularNutrient,
+)
+from fastapi_boilerplate.utils.map_nutrients import resolve
+
+from .answers import create_fetcher
+
+INGREDIENTS = 200
+NUTRIENTS = 40
+
+
+def recipe_response() -> List[Dict]:
+    # Spoonacular lists the mapped nutrients among dozens of vitamins and
+    # minerals; the mapped ones are spread through the list as in real answers.
+    names = ["Calories"] + [f"Vitamin {i}" for i in range(NUTRIENTS - 9)]
+    for position, field in enumerate(SPOONACULAR_FIELDS[1:]):
+        names.insert(4 * (position + 1), field.path[0])
+    return [
+        {
+            "name": f"food_{i}",
+            "amount": 1.0,
+            "unit": "serving",
+            "nutrition": {
+                "nutrients": [
+                    {
+                        "name": name,
+                        "amount": 1.5 + i,
+                        "unit": "kcal" if name == "Calories" else "mg",
+                    }
+                    for name in names
+                ],
+                "weightPerServing": {"amount": 100, "unit": "g"},
+            },
+        }
+        for i in range(INGREDIENTS)
+    ]
+
+
+class LinearIndex(dict):
+    def __init__(self, nutrients: List[SpoonacularNutrient]):
+        super().__init__()
+        self.nutrients = nutrients
+
+    def get(self, name: str, default=None) -> SpoonacularNutrient | None:
+        return next(
+            filter(lambda nutrient: nutrient.name == name, self.nutrients), default
+        )
+
+
+class LinearScanFetchSpoonacularNutrients(FetchSpoonacularNutrients):
+    def index_nutrients(self, *, nutrients):
+        return LinearIndex(nutrients)
+
+
+def lookup(fetch: FetchSpoonacularNutrients, ingredients) -> None:
+    for ingredient in ingredients:
+        nutrients = fetch.index_nutrients(nutrients=ingredient.nutrition.nutrients)
+        for field in SPOONACULAR_FIELDS:
+            resolve(nutrients, field.path)
+            if not isinstance(field.unit, str):
+                resolve(nutrients, field.unit)
+
+
+def report(label: str, linear: float, indexed: float) -> None:
+    print(
+        f"{label:<10} linear {linear * 1000:8.2f} ms   "
+        f"indexed {indexed * 1000:8.2f} ms   speedup {linear / indexed:5.2f}x"
+    )
+
+
+def main() -> None:
+    data = recipe_response()
+    ingredients = [SpoonacularIngredient(**item) for item in data]
+    content = json.dumps(data).encode()
+    linear = create_fetcher(LinearScanFetchSpoonacularNutrients, content)
+    indexed = create_fetcher(FetchSpoonacularNutrients, content)
+    assert asyncio.run(linear.execute(query="")) == asyncio.run(
+        indexed.execute(query="")
+    )
+    print(f"{INGREDIENTS} ingredients x {NUTRIENTS} nutrients, best of 5")
+    report(
+        "lookups",
+        min(timeit.repeat(lambda: lookup(linear, ingredients), number=10, repeat=5))
+        / 10,
+        min(timeit.repeat(lambda: lookup(indexed, ingredients), number=10, repeat=5))
+        / 10,
+    )
+    report(
+        "execute",
+        min(
+            timeit.repeat(
+                lambda: asyncio.run(linear.execute(query="")), number=10, repeat=5
+            )
+        )
+        / 10,
+        min(
+            timeit.repeat(
+                lambda: asyncio.run(indexed.execute(query="")), number=10, repeat=5
+            )
+        )
+        / 10,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark of fuzzy matching on a large trigram index against a linear scan."""
+import random
+import timeit
+from typing import Any, Callable
+
+from fastapi_boilerplate.utils.trigram_index import TrigramIndex, trigrams
+
+SIZE = 100_000
+THRESHOLD = 0.7
+COMMON_WORDS = [
+    "raw",
+    "cooked",
+    "fresh",
+    "chicken",
+    "cheese",
+    "sauce",
+    "with",
+    "low",
+    "fat",
+    "milk",
+    "apple",
+    "bread",
+    "rice",
+]
+QUERIES = [
+    "banana",
+    "bananna",
+    "chese sauce",
+    "low fat milk",
+    "fresh bread with butter",
+    "xqzt",
+]
+
+
+def generate_names(size: int) -> list[str]:
+    generator = random.Random(0)
+    words = [
+        "".join(
+            generator.choice("aeioubcdfghlmnprst")
+            for _ in range(generator.randint(3, 9))
+        )
+        for _ in range(3000)
+    ] + COMMON_WORDS * 20
+    names = {"banana", "cheese sauce"}
+    while len(names) < size:
+        names.add(
+            " ".join(generator.choice(words) for _ in range(generator.randint(1, 4)))
+        )
+    return list(names)
+
+
+def linear_match(names: list[str], query: str) -> tuple[str, float] | None:
+    query_trigrams = trigrams(query)
+    best = None
+    for name in names:
+        name_trigrams = trigrams(name)
+        similarity = len(query_trigrams & name_trigrams) / len(
+            query_trigrams | name_trigrams
+        )
+        if similarity >= THRESHOLD and (best is None or similarity > best[1]):
+            best = name, similarity
+    return best
+
+
+def build_index(names: list[str]) -> TrigramIndex:
+    trigram_index = TrigramIndex(THRESHOLD)
+    for name in names:
+        trigram_index.add(name)
+    return trigram_index
+
+
+def best(call: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(call, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    names = generate_names(SIZE)
+    build = best(lambda: build_index(names), number=1)
+    trigram_index = build_index(names)
+    print(f"{SIZE} names, threshold {THRESHOLD}, built in {build:.2f} s")
+    for query in QUERIES:
+        match = trigram_index.match(query)
+        assert match == linear_match(names, query)
+        indexed = best(lambda: trigram_index.match(query), number=200)
+        linear = best(lambda: linear_match(names, query), number=1)
+        print(
+            f"{query:<24} indexed {indexed * 1e6:8.1f} µs   "
+            f"linear {linear * 1000:8.1f} ms   match {match}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,96 @@
 import logging
 import os
+from typing import List
 
 from dotenv import load_dotenv
 
 from .types import (
+    AdaptiveTimeoutConfig,
+    CacheConfig,
+    CircuitBreakerConfig,
     Config,
     DatabaseConfig,
     EdamamConfig,
+    HedgeConfig,
+    HttpClientConfig,
+    LocalNutrientsConfig,
+    NutrientsConfig,
+    NutrientSource,
     NutritionixConfig,
+    ProviderRankingConfig,
+    ProviderScoreConfig,
+    QuotaConfig,
+    RetryConfig,
     SpoonacularConfig,
+    WarmUpConfig,
 )
 
 
 load_dotenv()
 
 
+def http_client_config(prefix: str) -> HttpClientConfig:
+    return HttpClientConfig(
+        max_connections=int(os.environ.get(f"{prefix}_MAX_CONNECTIONS") or 100),
+        max_keepalive_connections=int(
+            os.environ.get(f"{prefix}_MAX_KEEPALIVE_CONNECTIONS") or 20
+        ),
+        keepalive_expiry_seconds=float(
+            os.environ.get(f"{prefix}_KEEPALIVE_EXPIRY_SECONDS") or 5
+        ),
+        connect_timeout_seconds=float(
+            os.environ.get(f"{prefix}_CONNECT_TIMEOUT_SECONDS") or 5
+        ),
+        read_timeout_seconds=float(
+            os.environ.get(f"{prefix}_READ_TIMEOUT_SECONDS") or 5
+        ),
+        pool_timeout_seconds=float(
+            os.environ.get(f"{prefix}_POOL_TIMEOUT_SECONDS") or 5
+        ),
+        http2=(os.environ.get(f"{prefix}_HTTP2") or "").lower() == "true",
+    )
+
+
+def quota_config(prefix: str) -> QuotaConfig:
+    return QuotaConfig(
+        rate_per_second=float(os.environ[f"{prefix}_RATE_PER_SECOND"])
+        if os.environ.get(f"{prefix}_RATE_PER_SECOND")
+        else None,
+        burst=int(os.environ[f"{prefix}_BURST"])
+        if os.environ.get(f"{prefix}_BURST")
+        else None,
+        max_concurrency=int(os.environ[f"{prefix}_MAX_CONCURRENCY"])
+        if os.environ.get(f"{prefix}_MAX_CONCURRENCY")
+        else None,
+        daily_quota=int(os.environ.get(f"{prefix}_DAILY_QUOTA") or 0),
+        max_wait_seconds=float(os.environ.get(f"{prefix}_MAX_WAIT_SECONDS") or 0.5),
+    )
+
+
+def hedge_config(prefix: str) -> HedgeConfig:
+    return HedgeConfig(
+        enabled=(os.environ.get(f"{prefix}_HEDGE") or "").lower() == "true",
+        percentile=float(os.environ.get(f"{prefix}_HEDGE_PERCENTILE") or 0.95),
+        max_load=float(os.environ.get(f"{prefix}_HEDGE_MAX_LOAD") or 0.5),
+        min_remaining_quota=float(
+            os.environ.get(f"{prefix}_HEDGE_MIN_REMAINING_QUOTA") or 0.2
+        ),
+    )
+
+
+def provider_score_config(prefix: str) -> ProviderScoreConfig:
+    return ProviderScoreConfig(
+        weight=float(os.environ.get(f"{prefix}_WEIGHT") or 1),
+        cost_per_call=float(os.environ.get(f"{prefix}_COST_PER_CALL") or 1),
+    )
+
+
+def provider_order(value: str) -> List[str]:
+    return [
+        NutrientSource(name.strip()).value for name in value.split(",") if name.strip()
+    ]
+
+
 config = Config(
     log_level=logging.WARNING,
     db=DatabaseConfig(
@@ -25,14 +101,123 @@ config = Config(
         base_url=os.environ.get("NUTRITIONIX_BASE_URL") or "",
         app_id=os.environ.get("NUTRITIONIX_APP_ID") or "",
         app_key=os.environ.get("NUTRITIONIX_APP_KEY") or "",
+        http_client=http_client_config("NUTRITIONIX"),
+        quota=quota_config("NUTRITIONIX"),
+        score=provider_score_config("NUTRITIONIX"),
+        hedge=hedge_config("NUTRITIONIX"),
     ),
     spoonacular=SpoonacularConfig(
         base_url=os.environ.get("SPOONACULAR_BASE_URL") or "",
         api_key=os.environ.get("SPOONACULAR_API_KEY") or "",
+        http_client=http_client_config("SPOONACULAR"),
+        quota=quota_config("SPOONACULAR"),
+        score=provider_score_config("SPOONACULAR"),
+        hedge=hedge_config("SPOONACULAR"),
     ),
     edamam=EdamamConfig(
         base_url=os.environ.get("EDAMAM_BASE_URL") or "",
         app_id=os.environ.get("EDAMAM_APP_ID") or "",
         app_key=os.environ.get("EDAMAM_APP_KEY") or "",
+        http_client=http_client_config("EDAMAM"),
+        quota=quota_config("EDAMAM"),
+        score=provider_score_config("EDAMAM"),
+        hedge=hedge_config("EDAMAM"),
+    ),
+    nutrients=NutrientsConfig(
+        hedge_delay_seconds=float(os.environ["NUTRIENTS_HEDGE_DELAY_SECONDS"])
+        if os.environ.get("NUTRIENTS_HEDGE_DELAY_SECONDS")
+        else None,
+        batch_max_ingredients=int(
+            os.environ.get("NUTRIENTS_BATCH_MAX_INGREDIENTS") or 20
+        ),
+        micro_batch_window_seconds=float(
+            os.environ["NUTRIENTS_MICRO_BATCH_WINDOW_SECONDS"]
+        )
+        if os.environ.get("NUTRIENTS_MICRO_BATCH_WINDOW_SECONDS")
+        else None,
+        fast_decoding=(
+            (os.environ.get("NUTRIENTS_FAST_DECODING") or "").lower() == "true"
+        ),
+        fuzzy_match_threshold=float(os.environ["NUTRIENTS_FUZZY_MATCH_THRESHOLD"])
+        if os.environ.get("NUTRIENTS_FUZZY_MATCH_THRESHOLD")
+        else None,
+    ),
+    cache=CacheConfig(
+        memory_max_size=int(os.environ.get("CACHE_MEMORY_MAX_SIZE") or 10000),
+        memory_ttl_seconds=float(os.environ.get("CACHE_MEMORY_TTL_SECONDS") or 3600),
+        db_ttl_seconds=float(os.environ.get("CACHE_DB_TTL_SECONDS") or 86400),
+        soft_ttl_seconds=float(os.environ["CACHE_SOFT_TTL_SECONDS"])
+        if os.environ.get("CACHE_SOFT_TTL_SECONDS")
+        else None,
+        refresh_concurrency=int(os.environ.get("CACHE_REFRESH_CONCURRENCY") or 4),
+        refresh_max_pending=int(os.environ.get("CACHE_REFRESH_MAX_PENDING") or 1000),
+        negative_ttl_seconds=float(os.environ["CACHE_NEGATIVE_TTL_SECONDS"])
+        if os.environ.get("CACHE_NEGATIVE_TTL_SECONDS")
+        else None,
+        negative_max_size=int(os.environ.get("CACHE_NEGATIVE_MAX_SIZE") or 10000),
+        negative_false_positive_rate=float(
+            os.environ.get("CACHE_NEGATIVE_FALSE_POSITIVE_RATE") or 0.01
+        ),
+    ),
+    circuit_breaker=CircuitBreakerConfig(
+        window_size=int(os.environ.get("CIRCUIT_BREAKER_WINDOW_SIZE") or 20),
+        minimum_calls=int(os.environ.get("CIRCUIT_BREAKER_MINIMUM_CALLS") or 10),
+        failure_rate_threshold=float(
+            os.environ.get("CIRCUIT_BREAKER_FAILURE_RATE_THRESHOLD") or 0.5
+        ),
+        consecutive_timeouts_threshold=int(
+            os.environ.get("CIRCUIT_BREAKER_CONSECUTIVE_TIMEOUTS_THRESHOLD") or 3
+        ),
+        open_seconds=float(os.environ.get("CIRCUIT_BREAKER_OPEN_SECONDS") or 30),
+        half_open_max_calls=int(
+            os.environ.get("CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS") or 2
+        ),
+    ),
+    adaptive_timeout=AdaptiveTimeoutConfig(
+        window_size=int(os.environ.get("ADAPTIVE_TIMEOUT_WINDOW_SIZE") or 200),
+        min_samples=int(os.environ.get("ADAPTIVE_TIMEOUT_MIN_SAMPLES") or 20),
+        percentile=float(os.environ.get("ADAPTIVE_TIMEOUT_PERCENTILE") or 0.99),
+        margin_seconds=float(os.environ.get("ADAPTIVE_TIMEOUT_MARGIN_SECONDS") or 0.1),
+        floor_seconds=float(os.environ.get("ADAPTIVE_TIMEOUT_FLOOR_SECONDS") or 0.25),
+        ceiling_seconds=float(os.environ.get("ADAPTIVE_TIMEOUT_CEILING_SECONDS") or 5),
+    ),
+    retry=RetryConfig(
+        max_attempts=int(os.environ.get("RETRY_MAX_ATTEMPTS") or 3),
+        base_delay_seconds=float(os.environ.get("RETRY_BASE_DELAY_SECONDS") or 0.05),
+        max_delay_seconds=float(os.environ.get("RETRY_MAX_DELAY_SECONDS") or 1),
+        time_budget_seconds=float(os.environ.get("RETRY_TIME_BUDGET_SECONDS") or 3),
+        budget_ratio=float(os.environ.get("RETRY_BUDGET_RATIO") or 0.1),
+        budget_capacity=float(os.environ.get("RETRY_BUDGET_CAPACITY") or 10),
+    ),
+    provider_ranking=ProviderRankingConfig(
+        pinned_order=provider_order(
+            os.environ.get("PROVIDER_RANKING_PINNED_ORDER") or ""
+        ),
+        ewma_alpha=float(os.environ.get("PROVIDER_RANKING_EWMA_ALPHA") or 0.2),
+        recovery_half_life_seconds=float(
+            os.environ.get("PROVIDER_RANKING_RECOVERY_HALF_LIFE_SECONDS") or 300
+        ),
+    ),
+    local_nutrients=LocalNutrientsConfig(
+        index_path=os.environ.get("LOCAL_NUTRIENTS_INDEX_PATH") or "",
+        record=(os.environ.get("LOCAL_NUTRIENTS_RECORD") or "").lower() == "true",
+        flush_interval_seconds=float(
+            os.environ.get("LOCAL_NUTRIENTS_FLUSH_INTERVAL_SECONDS") or 300
+        ),
+    ),
+    warm_up=WarmUpConfig(
+        queries=int(os.environ.get("WARM_UP_QUERIES") or 0),
+        provider_budget=int(os.environ.get("WARM_UP_PROVIDER_BUDGET") or 500),
+        timeout_seconds=float(os.environ.get("WARM_UP_TIMEOUT_SECONDS") or 60),
+        concurrency=int(os.environ.get("WARM_UP_CONCURRENCY") or 4),
+        query_log_max_entries=int(
+            os.environ.get("WARM_UP_QUERY_LOG_MAX_ENTRIES") or 100000
+        ),
+        query_log_size_bytes=int(
+            os.environ.get("WARM_UP_QUERY_LOG_SIZE_BYTES") or 16 * 1024 * 1024
+        ),
+        query_log_max_pending=int(
+            os.environ.get("WARM_UP_QUERY_LOG_MAX_PENDING") or 1000
+        ),
     ),
 )
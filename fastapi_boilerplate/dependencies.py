@@ -1,5 +1,3 @@
-from httpx import AsyncClient
-
 from .config import config
 from .logger import Logger
 from .db import Db
@@ -17,19 +15,86 @@ from .routes.get_foods import GetFoods
 from .routes.get_food_by_id import GetFoodById
 from .routes.put_food import PutFood
 from .routes.delete_food import DeleteFood
+from .metrics import Metrics
+from .types import NutrientSource
+from .services.fetch_nutrients import FetchNutrients
+from .services.fetch_nutrients_batch import FetchNutrientsBatch
+from .services.known_ingredients import KnownIngredients
+from .services.local_nutrients import LocalNutrients
+from .services.negative_cache import NegativeCache
+from .services.nutrients_cache import NutrientsCache
+from .services.query_log import QueryLog
+from .services.send_provider_request import SendProviderRequest
+from .services.stream_nutrients import StreamNutrients
+from .services.warm_up_nutrients import WarmUpNutrients
+from .repositories.create_cached_nutrients_index import CreateCachedNutrientsIndex
+from .repositories.create_provider_calls_index import CreateProviderCallsIndex
+from .repositories.create_query_log_collection import CreateQueryLogCollection
+from .repositories.find_cached_nutrients import FindCachedNutrients
+from .repositories.find_known_ingredient_names import FindKnownIngredientNames
+from .repositories.find_top_logged_queries import FindTopLoggedQueries
+from .repositories.increment_provider_calls import IncrementProviderCalls
+from .repositories.insert_query_log_entries import InsertQueryLogEntries
+from .repositories.upsert_cached_nutrients import UpsertCachedNutrients
+from .routes.get_circuit_breakers import GetCircuitBreakers
+from .routes.get_metrics import GetMetrics
+from .routes.get_nutrients_stream import GetNutrientsStream
+from .routes.get_readiness import GetReadiness
+from .routes.post_nutrients_batch import PostNutrientsBatch
+from .utils.adaptive_timeout import AdaptiveTimeout
+from .utils.background_refresh import BackgroundRefresh
+from .utils.bloom_filter import BloomFilter
+from .utils.circuit_breaker import CircuitBreaker
+from .utils.create_http_client import create_http_client
+from .utils.daily_budget import DailyBudget
+from .utils.http_pool_stats import http_pool_stats
+from .utils.key_ratio import KeyRatio
+from .utils.lru_cache import LruCache
+from .utils.micro_batcher import MicroBatcher
+from .utils.provider_ranking import ProviderRanking
+from .utils.provider_scheduler import ProviderScheduler
+from .utils.retry_budget import RetryBudget
+from .utils.retry_policy import RetryPolicy
+from .utils.single_flight import SingleFlight
+from .utils.token_bucket import TokenBucket
 
 
-http_client = AsyncClient()
 logger = Logger(config)
+metrics = Metrics()
 db = Db(config)
+http_client_configs = {
+    NutrientSource.NUTRITIONIX: config.nutritionix.http_client,
+    NutrientSource.SPOONACULAR: config.spoonacular.http_client,
+    NutrientSource.EDAMAM: config.edamam.http_client,
+}
+http_clients = {
+    source: create_http_client(http_client_config, logger)
+    for source, http_client_config in http_client_configs.items()
+}
 
 
-# Services
+def collect_http_pool_stats(metrics: Metrics) -> None:
+    for source, http_client in http_clients.items():
+        for name, value in http_pool_stats(http_client).items():
+            metrics.set_gauge(f"http_pool_{name}", value, provider=source)
 
 
-fetch_nutritionix_nutrients = FetchNutritionixNutrients(config, logger, http_client)
-fetch_spoonacular_nutrients = FetchSpoonacularNutrients(config, logger, http_client)
-fetch_edamam_nutrients = FetchEdamamNutrients(config, logger, http_client)
+metrics.register_collector(collect_http_pool_stats)
+hedge_configs = {
+    NutrientSource.NUTRITIONIX: config.nutritionix.hedge,
+    NutrientSource.SPOONACULAR: config.spoonacular.hedge,
+    NutrientSource.EDAMAM: config.edamam.hedge,
+}
+provider_score_configs = {
+    NutrientSource.NUTRITIONIX: config.nutritionix.score,
+    NutrientSource.SPOONACULAR: config.spoonacular.score,
+    NutrientSource.EDAMAM: config.edamam.score,
+}
+quota_configs = {
+    NutrientSource.NUTRITIONIX: config.nutritionix.quota,
+    NutrientSource.SPOONACULAR: config.spoonacular.quota,
+    NutrientSource.EDAMAM: config.edamam.quota,
+}
 
 
 # Repositories
@@ -40,28 +105,245 @@ find_foods = FindFoods(config, db)
 find_food_by_id = FindFoodById(config, db)
 update_food = UpdateFood(config, db)
 remove_food = RemoveFood(config, db)
+find_cached_nutrients = FindCachedNutrients(config, db)
+upsert_cached_nutrients = UpsertCachedNutrients(config, db)
+create_cached_nutrients_index = CreateCachedNutrientsIndex(config, db)
+find_known_ingredient_names = FindKnownIngredientNames(config, db)
+create_query_log_collection = CreateQueryLogCollection(config, db)
+insert_query_log_entries = InsertQueryLogEntries(config, db)
+find_top_logged_queries = FindTopLoggedQueries(config, db)
+increment_provider_calls = IncrementProviderCalls(config, db)
+create_provider_calls_index = CreateProviderCallsIndex(config, db)
 
 
-# Routes
+# Services
+
+
+circuit_breakers = {
+    source: CircuitBreaker(
+        window_size=config.circuit_breaker.window_size,
+        minimum_calls=config.circuit_breaker.minimum_calls,
+        failure_rate_threshold=config.circuit_breaker.failure_rate_threshold,
+        consecutive_timeouts_threshold=config.circuit_breaker.consecutive_timeouts_threshold,
+        open_seconds=config.circuit_breaker.open_seconds,
+        half_open_max_calls=config.circuit_breaker.half_open_max_calls,
+    )
+    for source in http_client_configs
+}
+provider_schedulers = {
+    source: ProviderScheduler(
+        token_bucket=(
+            TokenBucket(
+                rate_per_second=quota_config.rate_per_second,
+                capacity=quota_config.burst or quota_config.rate_per_second,
+            )
+            if quota_config.rate_per_second
+            else None
+        ),
+        daily_budget=DailyBudget(
+            limit=quota_config.daily_quota,
+            name=source,
+            increment_provider_calls=increment_provider_calls,
+        ),
+        max_concurrency=quota_config.max_concurrency,
+        max_wait_seconds=quota_config.max_wait_seconds,
+    )
+    for source, quota_config in quota_configs.items()
+}
+
+
+def collect_daily_budgets(metrics: Metrics) -> None:
+    for source, provider_scheduler in provider_schedulers.items():
+        remaining = provider_scheduler.daily_budget.remaining
+        if remaining is not None:
+            metrics.set_gauge(
+                "provider_daily_budget_remaining", remaining, provider=source
+            )
 
 
-get_nutrients = GetNutrients(
+metrics.register_collector(collect_daily_budgets)
+retry_budget = RetryBudget(
+    ratio=config.retry.budget_ratio, capacity=config.retry.budget_capacity
+)
+send_provider_requests = {
+    source: SendProviderRequest(
+        config,
+        logger,
+        metrics,
+        source,
+        http_client_config,
+        hedge_configs[source],
+        circuit_breakers[source],
+        AdaptiveTimeout(
+            window_size=config.adaptive_timeout.window_size,
+            min_samples=config.adaptive_timeout.min_samples,
+            percentile=config.adaptive_timeout.percentile,
+            margin_seconds=config.adaptive_timeout.margin_seconds,
+            floor_seconds=config.adaptive_timeout.floor_seconds,
+            ceiling_seconds=config.adaptive_timeout.ceiling_seconds,
+        ),
+        provider_schedulers[source],
+        RetryPolicy(
+            max_attempts=config.retry.max_attempts,
+            base_delay_seconds=config.retry.base_delay_seconds,
+            max_delay_seconds=config.retry.max_delay_seconds,
+            time_budget_seconds=config.retry.time_budget_seconds,
+            retry_budget=retry_budget,
+        ),
+    )
+    for source, http_client_config in http_client_configs.items()
+}
+fetch_nutritionix_nutrients = FetchNutritionixNutrients(
+    config,
+    logger,
+    http_clients[NutrientSource.NUTRITIONIX],
+    send_provider_requests[NutrientSource.NUTRITIONIX],
+)
+fetch_spoonacular_nutrients = FetchSpoonacularNutrients(
+    config,
+    logger,
+    http_clients[NutrientSource.SPOONACULAR],
+    send_provider_requests[NutrientSource.SPOONACULAR],
+)
+fetch_edamam_nutrients = FetchEdamamNutrients(
+    config,
+    logger,
+    http_clients[NutrientSource.EDAMAM],
+    send_provider_requests[NutrientSource.EDAMAM],
+)
+background_refresh = BackgroundRefresh(
+    max_concurrency=config.cache.refresh_concurrency,
+    max_pending=config.cache.refresh_max_pending,
+)
+nutrients_cache = NutrientsCache(
+    config,
     logger,
+    metrics,
+    LruCache(
+        max_size=config.cache.memory_max_size,
+        ttl_seconds=config.cache.memory_ttl_seconds,
+    ),
+    find_cached_nutrients,
+    upsert_cached_nutrients,
+    background_refresh,
+)
+local_nutrients = LocalNutrients(config, logger, metrics)
+known_ingredients = KnownIngredients(
+    config, logger, metrics, find_known_ingredient_names
+)
+query_log = QueryLog(config, logger, metrics, insert_query_log_entries)
+negative_cache = NegativeCache(
+    config,
+    logger,
+    metrics,
+    LruCache(
+        max_size=config.cache.negative_max_size,
+        ttl_seconds=config.cache.negative_ttl_seconds or 0,
+    ),
+    BloomFilter(
+        capacity=2 * config.cache.negative_max_size,
+        false_positive_rate=config.cache.negative_false_positive_rate,
+    ),
+)
+fetch_nutrients = FetchNutrients(
+    config,
+    logger,
+    metrics,
     fetch_nutritionix_nutrients,
     fetch_spoonacular_nutrients,
     fetch_edamam_nutrients,
+    nutrients_cache,
+    local_nutrients,
+    known_ingredients,
+    query_log,
+    negative_cache,
+    SingleFlight(),
+    KeyRatio(window_size=10000),
+    ProviderRanking(
+        pinned_order=[
+            NutrientSource(name) for name in config.provider_ranking.pinned_order
+        ],
+        weights={
+            source: score_config.weight
+            for source, score_config in provider_score_configs.items()
+        },
+        costs_per_call={
+            source: score_config.cost_per_call
+            for source, score_config in provider_score_configs.items()
+        },
+        ewma_alpha=config.provider_ranking.ewma_alpha,
+        recovery_half_life_seconds=config.provider_ranking.recovery_half_life_seconds,
+    ),
+    MicroBatcher(
+        window_seconds=config.nutrients.micro_batch_window_seconds or 0,
+        max_size=config.nutrients.batch_max_ingredients,
+    ),
+)
+
+
+def collect_provider_scores(metrics: Metrics) -> None:
+    for source in fetch_nutrients.sources:
+        metrics.set_gauge(
+            "provider_score",
+            fetch_nutrients.provider_ranking.score(source),
+            provider=source,
+        )
+
+
+metrics.register_collector(collect_provider_scores)
+stream_nutrients = StreamNutrients(config, logger, metrics, fetch_nutrients)
+fetch_nutrients_batch = FetchNutrientsBatch(
+    config, logger, metrics, fetch_nutrients, nutrients_cache
 )
+warm_up_nutrients = WarmUpNutrients(
+    config, logger, metrics, find_top_logged_queries, fetch_nutrients
+)
+
+
+# Routes
+
+
+get_nutrients = GetNutrients(logger, fetch_nutrients)
+get_nutrients_stream = GetNutrientsStream(logger, stream_nutrients)
+post_nutrients_batch = PostNutrientsBatch(logger, fetch_nutrients_batch)
 post_food = PostFood(logger, insert_food)
 get_foods = GetFoods(logger, find_foods)
 get_food_by_id = GetFoodById(logger, find_food_by_id)
 put_food = PutFood(logger, update_food)
 delete_food = DeleteFood(logger, remove_food)
+get_metrics = GetMetrics(logger, metrics)
+get_circuit_breakers = GetCircuitBreakers(logger, circuit_breakers)
+get_readiness = GetReadiness(logger, warm_up_nutrients)
 
 
 async def startup() -> None:
     db.connect()
+    try:
+        create_cached_nutrients_index.execute()
+    except Exception as e:
+        logger.error(f"Failed to create cached nutrients index: {str(e)}")
+    if any(quota_config.daily_quota for quota_config in quota_configs.values()):
+        try:
+            create_provider_calls_index.execute()
+        except Exception as e:
+            logger.error(f"Failed to create provider calls index: {str(e)}")
+    local_nutrients.load()
+    local_nutrients.start()
+    known_ingredients.load()
+    if config.warm_up.queries > 0:
+        try:
+            create_query_log_collection.execute()
+        except Exception as e:
+            logger.error(f"Failed to create query log collection: {str(e)}")
+    warm_up_nutrients.start()
 
 
 async def shutdown() -> None:
+    await warm_up_nutrients.close()
+    await query_log.close()
+    await background_refresh.close()
+    await local_nutrients.close()
+    await known_ingredients.close()
     db.disconnect()
-    await http_client.aclose()
+    for http_client in http_clients.values():
+        await http_client.aclose()
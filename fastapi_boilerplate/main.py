@@ -1,20 +1,27 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, APIRouter
+from fastapi import APIRouter, FastAPI
 
 from .dependencies import (
+    delete_food,
+    get_food_by_id,
+    get_foods,
+    get_metrics,
+    get_circuit_breakers,
     get_nutrients,
+    get_nutrients_stream,
+    get_readiness,
     post_food,
-    get_foods,
-    get_food_by_id,
+    post_nutrients_batch,
     put_food,
-    delete_food,
     shutdown,
+    startup,
 )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await startup()
     yield
     await shutdown()
 
@@ -28,9 +35,15 @@ async def get_health():
 
 
 nutrients_router = APIRouter(prefix="/nutrients", tags=["nutrients"])
+nutrients_router.add_api_route(
+    "/batch", endpoint=post_nutrients_batch.execute, methods=["POST"]
+)
 nutrients_router.add_api_route(
     "/{query}", endpoint=get_nutrients.execute, methods=["GET"]
 )
+nutrients_router.add_api_route(
+    "/{query}/stream", endpoint=get_nutrients_stream.execute, methods=["GET"]
+)
 
 # todo: add response model
 # @router.get("/", response_description="List all books", response_model=List[Book])
@@ -43,5 +56,14 @@ foods_router.add_api_route("/{id}", endpoint=put_food.execute, methods=["PUT"])
 foods_router.add_api_route("/{id}", endpoint=delete_food.execute, methods=["DELETE"])
 
 
+internal_router = APIRouter(prefix="/internal", include_in_schema=False)
+internal_router.add_api_route("/metrics", endpoint=get_metrics.execute, methods=["GET"])
+internal_router.add_api_route(
+    "/circuit-breakers", endpoint=get_circuit_breakers.execute, methods=["GET"]
+)
+internal_router.add_api_route("/ready", endpoint=get_readiness.execute, methods=["GET"])
+
+
 app.include_router(nutrients_router)
 app.include_router(foods_router)
+app.include_router(internal_router)
@@ -0,0 +1,38 @@
+from collections import defaultdict
+from enum import Enum
+from typing import Callable, Dict, List
+
+
+class Metrics:
+    def __init__(self):
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.gauges: Dict[str, float] = {}
+        self.collectors: List[Callable[["Metrics"], None]] = []
+
+    def key(self, name: str, labels: Dict[str, str]) -> str:
+        if not labels:
+            return name
+        label_pairs = ",".join(
+            f"{label}={value.value if isinstance(value, Enum) else value}"
+            for label, value in sorted(labels.items())
+        )
+        return f"{name}{{{label_pairs}}}"
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        self.counters[self.key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        self.gauges[self.key(name, labels)] = value
+
+    def register_collector(self, collector: Callable[["Metrics"], None]) -> None:
+        """Registers a callback that refreshes gauges on every snapshot."""
+        self.collectors.append(collector)
+
+    def get(self, name: str, **labels: str) -> float:
+        key = self.key(name, labels)
+        return self.counters.get(key, self.gauges.get(key, 0))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        for collector in self.collectors:
+            collector(self)
+        return {"counters": dict(self.counters), "gauges": dict(self.gauges)}
@@ -0,0 +1,11 @@
+from ..types import Collection, Config, Db
+
+
+class CreateCachedNutrientsIndex:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self) -> None:
+        cache_collection = self.db.get_collection(Collection.NUTRIENTS_CACHE)
+        cache_collection.create_index("expires_at", expireAfterSeconds=0)
@@ -0,0 +1,11 @@
+from ..types import Collection, Config, Db
+
+
+class CreateProviderCallsIndex:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self) -> None:
+        calls_collection = self.db.get_collection(Collection.PROVIDER_CALLS)
+        calls_collection.create_index("expires_at", expireAfterSeconds=0)
@@ -0,0 +1,19 @@
+from ..types import Collection, Config, Db
+
+
+class CreateQueryLogCollection:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self) -> None:
+        cache_collection = self.db.get_collection(Collection.NUTRIENTS_CACHE)
+        database = cache_collection.database
+        if Collection.QUERY_LOG.value in database.list_collection_names():
+            return
+        database.create_collection(
+            Collection.QUERY_LOG.value,
+            capped=True,
+            size=self.config.warm_up.query_log_size_bytes,
+            max=self.config.warm_up.query_log_max_entries,
+        )
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from ..types import Collection, Config, Db
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class FindCachedNutrients:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self, *, key: str):
+        cache_collection = self.db.get_collection(Collection.NUTRIENTS_CACHE)
+        now = datetime.now(timezone.utc)
+        cached = cache_collection.find_one({"_id": key, "expires_at": {"$gt": now}})
+        if not cached:
+            return None
+        expires_at = as_utc(cached["expires_at"])
+        updated_at = as_utc(cached.get("updated_at"))
+        refresh_at = as_utc(cached.get("refresh_at"))
+        return {
+            "nutrients": cached["nutrients"],
+            "stale": refresh_at is not None and refresh_at <= now,
+            "ttl_seconds": (expires_at - now).total_seconds(),
+            "age_seconds": (
+                (now - updated_at).total_seconds() if updated_at is not None else 0
+            ),
+        }
@@ -0,0 +1,17 @@
+from typing import List
+
+from ..types import Collection, Config, Db
+
+
+class FindKnownIngredientNames:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self) -> List[str]:
+        cache_collection = self.db.get_collection(Collection.NUTRIENTS_CACHE)
+        foods_collection = self.db.get_collection(Collection.FOODS)
+        return [
+            *cache_collection.distinct("nutrients.name"),
+            *foods_collection.distinct("name"),
+        ]
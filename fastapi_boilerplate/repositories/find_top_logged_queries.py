@@ -0,0 +1,29 @@
+from typing import List, Tuple
+
+from ..types import Collection, Config, Db, Language
+
+
+class FindTopLoggedQueries:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self, *, limit: int) -> List[Tuple[str, Language]]:
+        query_log_collection = self.db.get_collection(Collection.QUERY_LOG)
+        top_queries = query_log_collection.aggregate(
+            [
+                {
+                    "$group": {
+                        "_id": {"query": "$query", "language": "$language"},
+                        "count": {"$sum": 1},
+                    }
+                },
+                {"$sort": {"count": -1}},
+                {"$limit": limit},
+            ],
+            allowDiskUse=True,
+        )
+        return [
+            (top_query["_id"]["query"], Language(top_query["_id"]["language"]))
+            for top_query in top_queries
+        ]
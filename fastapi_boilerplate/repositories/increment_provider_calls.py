@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+
+from ..types import Collection, Config, Db
+
+
+class IncrementProviderCalls:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self, *, key: str) -> int:
+        calls_collection = self.db.get_collection(Collection.PROVIDER_CALLS)
+        document = calls_collection.find_one_and_update(
+            {"_id": key},
+            {
+                "$inc": {"calls": 1},
+                "$setOnInsert": {
+                    "expires_at": datetime.now(timezone.utc) + timedelta(days=2)
+                },
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return document["calls"]
@@ -0,0 +1,13 @@
+from typing import List
+
+from ..types import Collection, Config, Db
+
+
+class InsertQueryLogEntries:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self, *, entries: List[dict]) -> None:
+        query_log_collection = self.db.get_collection(Collection.QUERY_LOG)
+        query_log_collection.insert_many(entries, ordered=False)
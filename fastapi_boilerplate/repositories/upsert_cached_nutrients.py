@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from ..types import Collection, Config, Db
+
+
+class UpsertCachedNutrients:
+    def __init__(self, config: Config, db: Db):
+        self.config = config
+        self.db = db
+
+    def execute(self, *, key: str, nutrients: List[dict]) -> None:
+        cache_collection = self.db.get_collection(Collection.NUTRIENTS_CACHE)
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.config.cache.db_ttl_seconds)
+        soft_ttl_seconds = self.config.cache.soft_ttl_seconds
+        refresh_at = (
+            now + timedelta(seconds=soft_ttl_seconds)
+            if soft_ttl_seconds is not None
+            else None
+        )
+        cache_collection.update_one(
+            {"_id": key},
+            {
+                "$set": {
+                    "nutrients": nutrients,
+                    "updated_at": now,
+                    "expires_at": expires_at,
+                    "refresh_at": refresh_at,
+                }
+            },
+            upsert=True,
+        )
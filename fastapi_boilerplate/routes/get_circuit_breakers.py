@@ -0,0 +1,28 @@
+from typing import Dict
+
+from fastapi import HTTPException
+from ..types import (
+    Logger,
+    NutrientSource,
+)
+from ..utils.circuit_breaker import CircuitBreaker
+
+
+class GetCircuitBreakers:
+    def __init__(
+        self,
+        logger: Logger,
+        circuit_breakers: Dict[NutrientSource, CircuitBreaker],
+    ):
+        self.logger = logger
+        self.circuit_breakers = circuit_breakers
+
+    async def execute(self):
+        try:
+            return {
+                source.value: circuit_breaker.snapshot()
+                for source, circuit_breaker in self.circuit_breakers.items()
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to get circuit breakers: {str(e)}")
+            raise HTTPException(status_code=500)
@@ -0,0 +1,22 @@
+from fastapi import HTTPException
+from ..types import (
+    Logger,
+    Metrics,
+)
+
+
+class GetMetrics:
+    def __init__(
+        self,
+        logger: Logger,
+        metrics: Metrics,
+    ):
+        self.logger = logger
+        self.metrics = metrics
+
+    async def execute(self):
+        try:
+            return self.metrics.snapshot()
+        except Exception as e:
+            self.logger.error(f"Failed to get metrics: {str(e)}")
+            raise HTTPException(status_code=500)
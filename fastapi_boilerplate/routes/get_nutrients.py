@@ -1,9 +1,8 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from ..types import (
     Logger,
-    FetchNutritionixNutrients,
-    FetchSpoonacularNutrients,
-    FetchEdamamNutrients,
+    FetchNutrients,
+    Language,
 )
 
 
@@ -11,31 +10,19 @@ class GetNutrients:
     def __init__(
         self,
         logger: Logger,
-        fetch_nutritionix_nutrients: FetchNutritionixNutrients,
-        fetch_spoonacular_nutrients: FetchSpoonacularNutrients,
-        fetch_edamam_nutrients: FetchEdamamNutrients,
+        fetch_nutrients: FetchNutrients,
     ):
         self.logger = logger
-        self.fetch_nutritionix_nutrients = fetch_nutritionix_nutrients
-        self.fetch_spoonacular_nutrients = fetch_spoonacular_nutrients
-        self.fetch_edamam_nutrients = fetch_edamam_nutrients
+        self.fetch_nutrients = fetch_nutrients
 
-    async def execute(self, query: str):
+    async def execute(self, query: str, response: Response):
         try:
-            language = "en_US"
-            nutritionix_nutrients = await self.fetch_nutritionix_nutrients.execute(
-                query=query, language=language
+            result = await self.fetch_nutrients.execute(
+                query=query, language=Language.EN_US
             )
-            if nutritionix_nutrients:
-                return nutritionix_nutrients
-            spoonacular_nutrients = await self.fetch_spoonacular_nutrients.execute(
-                query=query
-            )
-            if spoonacular_nutrients:
-                return spoonacular_nutrients
-            edamam_nutrients = await self.fetch_edamam_nutrients.execute(query=query)
-            if edamam_nutrients:
-                return edamam_nutrients
+            if result:
+                response.headers["X-Nutrient-Source"] = result.source.value
+                return result.nutrients
         except Exception as e:
             self.logger.error(f"Failed to get nutrients: {str(e)}")
             raise HTTPException(status_code=500)
@@ -0,0 +1,47 @@
+import json
+from typing import AsyncIterator
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from ..types import (
+    Logger,
+    StreamNutrients,
+    Language,
+)
+
+
+class GetNutrientsStream:
+    def __init__(
+        self,
+        logger: Logger,
+        stream_nutrients: StreamNutrients,
+    ):
+        self.logger = logger
+        self.stream_nutrients = stream_nutrients
+
+    async def stream(self, query: str, sse: bool) -> AsyncIterator[str]:
+        try:
+            async for item in self.stream_nutrients.execute(
+                query=query, language=Language.EN_US
+            ):
+                data = json.dumps(jsonable_encoder(item))
+                yield f"event: nutrients\ndata: {data}\n\n" if sse else f"{data}\n"
+            if sse:
+                yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            self.logger.error(f"Failed to stream nutrients: {str(e)}")
+            if sse:
+                yield "event: error\ndata: {}\n\n"
+
+    async def execute(self, query: str, request: Request):
+        try:
+            sse = "text/event-stream" in request.headers.get("accept", "")
+            return StreamingResponse(
+                self.stream(query, sse),
+                media_type="text/event-stream" if sse else "application/x-ndjson",
+                headers={"Cache-Control": "no-cache"},
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to get nutrients stream: {str(e)}")
+            raise HTTPException(status_code=500)
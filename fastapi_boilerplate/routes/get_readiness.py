@@ -0,0 +1,24 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from ..types import Logger
+from ..services.warm_up_nutrients import WarmUpNutrients
+
+
+class GetReadiness:
+    def __init__(
+        self,
+        logger: Logger,
+        warm_up_nutrients: WarmUpNutrients,
+    ):
+        self.logger = logger
+        self.warm_up_nutrients = warm_up_nutrients
+
+    async def execute(self):
+        try:
+            status = self.warm_up_nutrients.status
+            return JSONResponse(
+                {"status": status}, status_code=200 if status == "ready" else 503
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to get readiness: {str(e)}")
+            raise HTTPException(status_code=500)
@@ -0,0 +1,47 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+from fastapi import HTTPException, Body
+from ..types import (
+    Logger,
+    FetchNutrientsBatch,
+    Language,
+)
+
+
+class Data(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=100)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "queries": ["1 apple", "2 eggs, 100g rice"],
+            }
+        }
+
+
+class PostNutrientsBatch:
+    def __init__(
+        self,
+        logger: Logger,
+        fetch_nutrients_batch: FetchNutrientsBatch,
+    ):
+        self.logger = logger
+        self.fetch_nutrients_batch = fetch_nutrients_batch
+
+    async def execute(self, data: Data = Body(...)):
+        try:
+            results = await self.fetch_nutrients_batch.execute(
+                queries=data.queries, language=Language.EN_US
+            )
+            return [
+                {
+                    "query": query,
+                    "source": result.source.value if result else None,
+                    "nutrients": result.nutrients if result else [],
+                }
+                for query, result in zip(data.queries, results)
+            ]
+        except Exception as e:
+            self.logger.error(f"Failed to post nutrients batch: {str(e)}")
+            raise HTTPException(status_code=500)
@@ -3,10 +3,16 @@ from typing import List
 from httpx import AsyncClient
 from pydantic import BaseModel
 
-from ..types import Config, Logger, Nutrients, NutrientSource
-from ..utils.micrograms_to_grams import micrograms_to_grams
-from ..utils.milligrams_to_grams import milligrams_to_grams
-from ..utils.nutrient_to_int import nutrient_to_int
+from ..types import (
+    Config,
+    Logger,
+    NutrientField,
+    Nutrients,
+    NutrientSource,
+    SendProviderRequest,
+)
+from ..utils.fast_decoder import fast_decoder
+from ..utils.map_nutrients import map_nutrients
 
 
 class EdamamNutrient(BaseModel):
@@ -44,35 +50,73 @@ class EdamamResponse(BaseModel):
     ingredients: List[EdamamIngredient]
 
 
+decode_edamam_response = fast_decoder(EdamamResponse)
+
+EDAMAM_FIELDS = [
+    NutrientField(
+        target="calories_kcal",
+        path=("nutrients", "ENERC_KCAL", "quantity"),
+        unit="kcal",
+    ),
+    NutrientField(target="weight_grams", path=("weight",), unit="g"),
+    NutrientField(
+        target="protein_grams",
+        path=("nutrients", "PROCNT", "quantity"),
+        unit=("nutrients", "PROCNT", "unit"),
+    ),
+    NutrientField(
+        target="total_fat_grams",
+        path=("nutrients", "FAT", "quantity"),
+        unit=("nutrients", "FAT", "unit"),
+    ),
+    NutrientField(
+        target="saturated_fat_grams",
+        path=("nutrients", "FASAT", "quantity"),
+        unit=("nutrients", "FASAT", "unit"),
+    ),
+    NutrientField(
+        target="total_carbohydrates_grams",
+        path=("nutrients", "CHOCDF", "quantity"),
+        unit=("nutrients", "CHOCDF", "unit"),
+    ),
+    NutrientField(
+        target="dietary_fiber_grams",
+        path=("nutrients", "FIBTG", "quantity"),
+        unit=("nutrients", "FIBTG", "unit"),
+    ),
+    NutrientField(
+        target="sugars_grams",
+        path=("nutrients", "SUGAR", "quantity"),
+        unit=("nutrients", "SUGAR", "unit"),
+    ),
+    NutrientField(
+        target="cholesterol_mg",
+        path=("nutrients", "CHOLE", "quantity"),
+        unit=("nutrients", "CHOLE", "unit"),
+    ),
+    NutrientField(
+        target="sodium_mg",
+        path=("nutrients", "NA", "quantity"),
+        unit=("nutrients", "NA", "unit"),
+    ),
+]
+
+
 class FetchEdamamNutrients:
-    def __init__(self, config: Config, logger: Logger, http_client: AsyncClient):
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        http_client: AsyncClient,
+        send_provider_request: SendProviderRequest,
+    ):
         self.config = config
         self.logger = logger
         self.http_client = http_client
+        self.send_provider_request = send_provider_request
 
-    def get_nutrient_milligrams(
-        self, *, nutrient: EdamamNutrient | None
-    ) -> float | None:
-        if nutrient:
-            match nutrient.unit:
-                case "mg":
-                    return nutrient.quantity
-                case _:
-                    return None
-        return None
-
-    def get_nutrient_grams(self, *, nutrient: EdamamNutrient | None) -> float | None:
-        if nutrient:
-            match nutrient.unit:
-                case "µg":
-                    return micrograms_to_grams(nutrient.quantity)
-                case "mg":
-                    return milligrams_to_grams(nutrient.quantity)
-                case "g":
-                    return nutrient.quantity
-                case _:
-                    return None
-        return None
+    def is_available(self) -> bool:
+        return self.send_provider_request.is_available()
 
     async def execute(self, *, query: str) -> List[Nutrients] | None:
         try:
@@ -86,77 +130,30 @@ class FetchEdamamNutrients:
                 "app_key": self.config.edamam.app_key,
                 "nutrition-type": "cooking",
             }
-            response = await self.http_client.get(
-                url, headers=headers, params=params, timeout=5
+            response = await self.send_provider_request.execute(
+                send=lambda timeout: self.http_client.get(
+                    url, headers=headers, params=params, timeout=timeout
+                )
+            )
+            if self.config.nutrients.fast_decoding:
+                edamam_response = decode_edamam_response(response.content)
+            else:
+                edamam_response = EdamamResponse(**response.json())
+            parsed_ingredients = [
+                edamam_parsed_ingredient
+                for edamam_ingredient in edamam_response.ingredients
+                for edamam_parsed_ingredient in edamam_ingredient.parsed
+            ]
+            return map_nutrients(
+                items=parsed_ingredients,
+                fields=EDAMAM_FIELDS,
+                columns={
+                    "name": [item.food for item in parsed_ingredients],
+                    "quantity": [int(item.quantity) for item in parsed_ingredients],
+                    "unit": [item.measure for item in parsed_ingredients],
+                },
+                source=NutrientSource.EDAMAM,
             )
-            response.raise_for_status()
-            response_data = response.json()
-            edamam_response = EdamamResponse(**response_data)
-            nutrients: List[Nutrients] = []
-            for edamam_ingredient in edamam_response.ingredients:
-                for edamam_parsed_ingredient in edamam_ingredient.parsed:
-                    nutrients.append(
-                        Nutrients(
-                            name=edamam_parsed_ingredient.food,
-                            quantity=int(edamam_parsed_ingredient.quantity),
-                            unit=edamam_parsed_ingredient.measure,
-                            calories_kcal=nutrient_to_int(
-                                edamam_parsed_ingredient.nutrients.ENERC_KCAL.quantity
-                            ),
-                            weight_grams=nutrient_to_int(
-                                edamam_parsed_ingredient.weight
-                            ),
-                            calories_kcal_per_gram=nutrient_to_int(
-                                edamam_parsed_ingredient.nutrients.ENERC_KCAL.quantity
-                                / edamam_parsed_ingredient.weight
-                            )
-                            if edamam_parsed_ingredient.nutrients.ENERC_KCAL.quantity
-                            and edamam_parsed_ingredient.weight
-                            else None,
-                            protein_grams=nutrient_to_int(
-                                self.get_nutrient_grams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.PROCNT
-                                )
-                            ),
-                            total_fat_grams=nutrient_to_int(
-                                self.get_nutrient_grams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.FAT
-                                )
-                            ),
-                            saturated_fat_grams=nutrient_to_int(
-                                self.get_nutrient_grams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.FASAT
-                                )
-                            ),
-                            total_carbohydrates_grams=nutrient_to_int(
-                                self.get_nutrient_grams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.CHOCDF
-                                )
-                            ),
-                            dietary_fiber_grams=nutrient_to_int(
-                                self.get_nutrient_grams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.FIBTG
-                                )
-                            ),
-                            sugars_grams=nutrient_to_int(
-                                self.get_nutrient_grams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.SUGAR
-                                )
-                            ),
-                            cholesterol_mg=nutrient_to_int(
-                                self.get_nutrient_milligrams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.CHOLE
-                                )
-                            ),
-                            sodium_mg=nutrient_to_int(
-                                self.get_nutrient_milligrams(
-                                    nutrient=edamam_parsed_ingredient.nutrients.NA
-                                )
-                            ),
-                            source=NutrientSource.EDAMAM,
-                        )
-                    )
-            return nutrients
         except Exception as e:
             self.logger.error(f"Failed to fetch edamam nutrients: {str(e)}")
             return None
@@ -0,0 +1,475 @@
+import asyncio
+import time
+from dataclasses import replace
+from functools import partial
+from typing import Dict, List
+
+from ..types import (
+    Config,
+    FetchEdamamNutrients,
+    FetchNutritionixNutrients,
+    FetchSpoonacularNutrients,
+    KnownIngredients,
+    Language,
+    LocalNutrients,
+    Logger,
+    Metrics,
+    NegativeCache,
+    Nutrients,
+    NutrientsCache,
+    NutrientSource,
+    NutrientsResult,
+    QueryLog,
+)
+from ..utils.canonicalize_ingredient import canonicalize_ingredient, format_ingredient
+from ..utils.key_ratio import KeyRatio
+from ..utils.matches_ingredient import matches_ingredient
+from ..utils.micro_batcher import MicroBatcher
+from ..utils.provider_calls import current_provider_calls
+from ..utils.provider_ranking import ProviderRanking
+from ..utils.scale_nutrients import scale_nutrients, to_base_nutrients
+from ..utils.single_flight import SingleFlight
+from ..utils.split_ingredients import split_ingredients
+
+# Edamam looks up the ingredients of a query together, so batching distinct
+# lookups would only turn them into misses.
+MICRO_BATCHED_SOURCES = {NutrientSource.NUTRITIONIX, NutrientSource.SPOONACULAR}
+
+
+class FetchNutrients:
+    """Resolves a query against the nutrient providers in priority order."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        fetch_nutritionix_nutrients: FetchNutritionixNutrients,
+        fetch_spoonacular_nutrients: FetchSpoonacularNutrients,
+        fetch_edamam_nutrients: FetchEdamamNutrients,
+        nutrients_cache: NutrientsCache,
+        local_nutrients: LocalNutrients,
+        known_ingredients: KnownIngredients,
+        query_log: QueryLog,
+        negative_cache: NegativeCache,
+        single_flight: SingleFlight[NutrientsResult | None],
+        key_ratio: KeyRatio,
+        provider_ranking: ProviderRanking,
+        micro_batcher: MicroBatcher[str, Dict[str, List[Nutrients]] | None],
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.fetch_nutritionix_nutrients = fetch_nutritionix_nutrients
+        self.fetch_spoonacular_nutrients = fetch_spoonacular_nutrients
+        self.fetch_edamam_nutrients = fetch_edamam_nutrients
+        self.nutrients_cache = nutrients_cache
+        self.local_nutrients = local_nutrients
+        self.known_ingredients = known_ingredients
+        self.query_log = query_log
+        self.negative_cache = negative_cache
+        self.single_flight = single_flight
+        self.key_ratio = key_ratio
+        self.provider_ranking = provider_ranking
+        self.micro_batcher = micro_batcher
+        self.sources = [
+            NutrientSource.NUTRITIONIX,
+            NutrientSource.SPOONACULAR,
+            NutrientSource.EDAMAM,
+        ]
+
+    def ordered_sources(self) -> List[NutrientSource]:
+        return self.provider_ranking.order(self.sources)
+
+    def available_sources(self) -> List[NutrientSource]:
+        return [source for source in self.sources if self.is_provider_available(source)]
+
+    def is_provider_available(self, source: NutrientSource) -> bool:
+        match source:
+            case NutrientSource.NUTRITIONIX:
+                return self.fetch_nutritionix_nutrients.is_available()
+            case NutrientSource.SPOONACULAR:
+                return self.fetch_spoonacular_nutrients.is_available()
+            case NutrientSource.EDAMAM:
+                return self.fetch_edamam_nutrients.is_available()
+
+    def canonicalize(self, *, query: str, language: Language) -> str:
+        """Returns the key under which the query is looked up and coalesced."""
+        ingredients = split_ingredients(query)
+        if language == Language.EN_US:
+            canonical_ingredients = []
+            for ingredient in ingredients:
+                canonical_ingredient = canonicalize_ingredient(ingredient)
+                food = self.known_ingredients.resolve(
+                    ingredient=canonical_ingredient.food
+                )
+                canonical_ingredients.append(
+                    format_ingredient(replace(canonical_ingredient, food=food))
+                )
+            ingredients = canonical_ingredients
+        key = ", ".join(ingredients)
+        self.key_ratio.add((query, language), (key, language))
+        self.metrics.set_gauge("nutrients_canonical_key_ratio", self.key_ratio.ratio())
+        return key
+
+    def fetch_from_local(self, *, query: str) -> NutrientsResult | None:
+        ingredients = split_ingredients(query)
+        if not ingredients:
+            return None
+        nutrients: List[Nutrients] = []
+        for ingredient in ingredients:
+            ingredient_nutrients = self.local_nutrients.get(ingredient=ingredient)
+            if ingredient_nutrients is None:
+                self.metrics.increment("nutrients_local_misses")
+                return None
+            nutrients.append(ingredient_nutrients)
+        self.metrics.increment("nutrients_local_hits")
+        return NutrientsResult(nutrients=nutrients, source=NutrientSource.LOCAL)
+
+    def record_to_local(
+        self, *, ingredient: str, nutrients: List[Nutrients], language: Language
+    ) -> None:
+        """Only single-item English answers can be told apart per ingredient."""
+        if language == Language.EN_US and len(nutrients) == 1:
+            self.local_nutrients.record(ingredient=ingredient, nutrients=nutrients[0])
+
+    def fetch_scaled(
+        self, *, source: NutrientSource, ingredients: List[str], language: Language
+    ) -> Dict[str, List[Nutrients]]:
+        """Scales ingredients whose food and unit were fetched for another quantity."""
+        if language != Language.EN_US:
+            return {}
+        canonical_ingredients = {
+            ingredient: canonicalize_ingredient(ingredient)
+            for ingredient in ingredients
+        }
+        scalable = {
+            ingredient: canonical_ingredient
+            for ingredient, canonical_ingredient in canonical_ingredients.items()
+            if canonical_ingredient.quantity
+        }
+        bases = [
+            self.nutrients_cache.get_base(
+                source=source,
+                food=canonical_ingredient.food,
+                unit=canonical_ingredient.unit,
+                language=language,
+            )
+            for canonical_ingredient in scalable.values()
+        ]
+        scaled = {
+            ingredient: [scale_nutrients(base, canonical_ingredient.quantity)]
+            for (ingredient, canonical_ingredient), base in zip(scalable.items(), bases)
+            if base is not None
+        }
+        if scaled:
+            self.metrics.increment(
+                "nutrients_scaled_hits", len(scaled), provider=source
+            )
+        return scaled
+
+    def store_base(
+        self,
+        *,
+        source: NutrientSource,
+        ingredient: str,
+        nutrients: List[Nutrients],
+        language: Language,
+    ) -> None:
+        if language != Language.EN_US or len(nutrients) != 1:
+            return
+        canonical_ingredient = canonicalize_ingredient(ingredient)
+        if not canonical_ingredient.quantity:
+            return
+        base_nutrients = to_base_nutrients(nutrients[0], canonical_ingredient.quantity)
+        if base_nutrients is not None:
+            self.nutrients_cache.set_base(
+                source=source,
+                food=canonical_ingredient.food,
+                unit=canonical_ingredient.unit,
+                language=language,
+                base_nutrients=base_nutrients,
+            )
+
+    async def fetch_from_provider(
+        self, *, source: NutrientSource, query: str, language: Language
+    ) -> List[Nutrients] | None:
+        match source:
+            case NutrientSource.NUTRITIONIX:
+                return await self.fetch_nutritionix_nutrients.execute(
+                    query=query, language=language
+                )
+            case NutrientSource.SPOONACULAR:
+                return await self.fetch_spoonacular_nutrients.execute(query=query)
+            case NutrientSource.EDAMAM:
+                return await self.fetch_edamam_nutrients.execute(query=query)
+
+    async def fetch_ingredients_from_provider(
+        self, *, source: NutrientSource, ingredients: List[str], language: Language
+    ) -> Dict[str, List[Nutrients]] | None:
+        """Fetches the ingredients in one call, split only if each item matches."""
+        query = ", ".join(ingredients)
+        started_at = time.monotonic()
+        nutrients = await self.fetch_from_provider(
+            source=source, query=query, language=language
+        )
+        self.provider_ranking.record(
+            source,
+            seconds=time.monotonic() - started_at,
+            failed=nutrients is None,
+            empty=not nutrients,
+        )
+        if nutrients is None:
+            return None
+        if language == Language.EN_US:
+            self.known_ingredients.add(names=[item.name for item in nutrients])
+        if (
+            len(ingredients) > 1
+            and len(nutrients) == len(ingredients)
+            and all(
+                matches_ingredient(item.name, ingredient)
+                for item, ingredient in zip(nutrients, ingredients)
+            )
+        ):
+            return {
+                ingredient: [ingredient_nutrients]
+                for ingredient, ingredient_nutrients in zip(ingredients, nutrients)
+            }
+        return {query: nutrients}
+
+    async def fetch_batch(
+        self, ingredients: List[str], *, source: NutrientSource, language: Language
+    ) -> Dict[str, Dict[str, List[Nutrients]] | None]:
+        """Fetches a micro-batch, split back only if each ingredient got its item."""
+        fetched = await self.fetch_ingredients_from_provider(
+            source=source, ingredients=ingredients, language=language
+        )
+        if len(ingredients) == 1 or fetched is None:
+            return {ingredient: fetched for ingredient in ingredients}
+        self.metrics.increment("nutrients_micro_batches", provider=source)
+        if all(ingredient in fetched for ingredient in ingredients):
+            self.metrics.increment(
+                "nutrients_micro_batched_ingredients", len(ingredients), provider=source
+            )
+            return {
+                ingredient: {ingredient: fetched[ingredient]}
+                for ingredient in ingredients
+            }
+        self.metrics.increment("nutrients_micro_batch_fallbacks", provider=source)
+        answers = await asyncio.gather(
+            *(
+                self.fetch_ingredients_from_provider(
+                    source=source, ingredients=[ingredient], language=language
+                )
+                for ingredient in ingredients
+            )
+        )
+        return dict(zip(ingredients, answers))
+
+    async def fetch_missing_from_provider(
+        self, *, source: NutrientSource, ingredients: List[str], language: Language
+    ) -> Dict[str, List[Nutrients]] | None:
+        if (
+            len(ingredients) > 1
+            or source not in MICRO_BATCHED_SOURCES
+            or self.config.nutrients.micro_batch_window_seconds is None
+            # The warm-up counts its own provider calls, so it stays out of
+            # batches shared with user traffic
+            or current_provider_calls.get() is not None
+        ):
+            return await self.fetch_ingredients_from_provider(
+                source=source, ingredients=ingredients, language=language
+            )
+        return await self.micro_batcher.execute(
+            (source, language),
+            ingredients[0],
+            partial(self.fetch_batch, source=source, language=language),
+        )
+
+    async def refresh(
+        self, *, source: NutrientSource, query: str, language: Language
+    ) -> None:
+        """Fetches the query again in place of a stale cached answer."""
+        if not self.is_provider_available(source):
+            return
+        fetched = await self.fetch_ingredients_from_provider(
+            source=source, ingredients=split_ingredients(query), language=language
+        )
+        if fetched is None:
+            return
+        for key, nutrients in fetched.items():
+            if nutrients:
+                await self.nutrients_cache.set(
+                    source=source, query=key, language=language, nutrients=nutrients
+                )
+        self.metrics.increment("nutrients_refreshes", provider=source)
+
+    async def fetch_from_source(
+        self, *, source: NutrientSource, query: str, language: Language
+    ) -> List[Nutrients] | None:
+        ingredients = split_ingredients(query)
+        unique_ingredients = list(dict.fromkeys(ingredients))
+        cached = await asyncio.gather(
+            *(
+                self.nutrients_cache.get(
+                    source=source,
+                    query=ingredient,
+                    language=language,
+                    refresh=partial(
+                        self.refresh, source=source, query=ingredient, language=language
+                    ),
+                )
+                for ingredient in unique_ingredients
+            )
+        )
+        found = {
+            ingredient: nutrients
+            for ingredient, nutrients in zip(unique_ingredients, cached)
+            if nutrients is not None
+        }
+        found.update(
+            self.fetch_scaled(
+                source=source,
+                ingredients=[
+                    ingredient
+                    for ingredient in unique_ingredients
+                    if ingredient not in found
+                ],
+                language=language,
+            )
+        )
+        missing = [
+            ingredient for ingredient in unique_ingredients if ingredient not in found
+        ]
+        block: List[Nutrients] = []
+        if len(missing) > 1:
+            cached_block = await self.nutrients_cache.get(
+                source=source,
+                query=", ".join(missing),
+                language=language,
+                refresh=partial(
+                    self.refresh,
+                    source=source,
+                    query=", ".join(missing),
+                    language=language,
+                ),
+            )
+            if cached_block is not None:
+                block, missing = cached_block, []
+        if missing and not self.is_provider_available(source):
+            self.metrics.increment("nutrients_skipped_providers", provider=source)
+            return None
+        if missing:
+            fetched = await self.fetch_missing_from_provider(
+                source=source, ingredients=missing, language=language
+            )
+            if fetched is None:
+                return None
+            for key, nutrients in fetched.items():
+                if nutrients:
+                    await self.nutrients_cache.set(
+                        source=source, query=key, language=language, nutrients=nutrients
+                    )
+                    if key in missing:
+                        self.record_to_local(
+                            ingredient=key, nutrients=nutrients, language=language
+                        )
+                        self.store_base(
+                            source=source,
+                            ingredient=key,
+                            nutrients=nutrients,
+                            language=language,
+                        )
+            if len(missing) > 1:
+                block = fetched.pop(", ".join(missing), [])
+            found.update(fetched)
+        nutrients: List[Nutrients] = []
+        for ingredient in ingredients:
+            if ingredient in found:
+                nutrients.extend(found[ingredient])
+            elif block:
+                nutrients.extend(block)
+                block = []
+        return nutrients
+
+    def is_unresolvable(self, *, query: str, language: Language) -> bool:
+        """Whether every provider recently answered the query empty."""
+        if not self.negative_cache.contains(query=query, language=language):
+            return False
+        self.metrics.increment("nutrients_unresolvable_lookups")
+        return True
+
+    async def fetch(self, *, query: str, language: Language) -> NutrientsResult | None:
+        hedge_delay = self.config.nutrients.hedge_delay_seconds
+        sources = self.ordered_sources()
+        tasks: List[asyncio.Task] = []
+
+        def start_next() -> None:
+            source = sources[len(tasks)]
+            tasks.append(
+                asyncio.create_task(
+                    self.fetch_from_source(
+                        source=source, query=query, language=language
+                    )
+                )
+            )
+
+        try:
+            start_next()
+            while hedge_delay == 0 and len(tasks) < len(sources):
+                start_next()
+            winner = 0
+            while True:
+                while winner < len(tasks) and tasks[winner].done():
+                    nutrients = tasks[winner].result()
+                    if nutrients:
+                        source = sources[winner]
+                        self.logger.debug(f"Nutrients for {query} from {source}")
+                        return NutrientsResult(nutrients=nutrients, source=source)
+                    winner += 1
+                if winner == len(sources):
+                    if all(task.result() is not None for task in tasks):
+                        self.negative_cache.add(query=query, language=language)
+                    return None
+                pending = [task for task in tasks if not task.done()]
+                if not pending:
+                    start_next()
+                    continue
+                answered = any(
+                    task.done() and task.result() for task in tasks[winner + 1 :]
+                )
+                can_hedge = (
+                    hedge_delay is not None
+                    and len(tasks) < len(sources)
+                    and not answered
+                )
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    start_next()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def execute(
+        self, *, query: str, language: Language = Language.EN_US
+    ) -> NutrientsResult | None:
+        query = self.canonicalize(query=query, language=language)
+        if language == Language.EN_US:
+            local = self.fetch_from_local(query=query)
+            if local is not None:
+                return local
+        if self.is_unresolvable(query=query, language=language):
+            return None
+        self.query_log.record(query=query, language=language)
+        key = (query, language)
+        if key in self.single_flight:
+            self.metrics.increment("nutrients_coalesced_lookups")
+        self.metrics.increment("nutrients_lookups")
+        return await self.single_flight.execute(
+            key, lambda: self.fetch(query=query, language=language)
+        )
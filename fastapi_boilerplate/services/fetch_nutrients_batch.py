@@ -0,0 +1,176 @@
+import asyncio
+from functools import partial
+from typing import Dict, List, Tuple
+
+from ..types import (
+    Config,
+    Language,
+    Logger,
+    Metrics,
+    Nutrients,
+    NutrientsCache,
+    NutrientSource,
+    NutrientsResult,
+)
+from ..utils.split_ingredients import split_ingredients
+from .fetch_nutrients import FetchNutrients
+
+
+class FetchNutrientsBatch:
+    """Resolves many queries with as few provider calls as possible."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        fetch_nutrients: FetchNutrients,
+        nutrients_cache: NutrientsCache,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.fetch_nutrients = fetch_nutrients
+        self.nutrients_cache = nutrients_cache
+
+    async def fetch_ingredients_from_source(
+        self, *, source: NutrientSource, ingredients: List[str], language: Language
+    ) -> Tuple[Dict[str, List[Nutrients]], bool]:
+        """Returns the answers per ingredient and whether every call was split."""
+        cached = await asyncio.gather(
+            *(
+                self.nutrients_cache.get(
+                    source=source,
+                    query=ingredient,
+                    language=language,
+                    refresh=partial(
+                        self.fetch_nutrients.refresh,
+                        source=source,
+                        query=ingredient,
+                        language=language,
+                    ),
+                )
+                for ingredient in ingredients
+            )
+        )
+        found = {
+            ingredient: nutrients
+            for ingredient, nutrients in zip(ingredients, cached)
+            if nutrients
+        }
+        found.update(
+            self.fetch_nutrients.fetch_scaled(
+                source=source,
+                ingredients=[
+                    ingredient for ingredient in ingredients if ingredient not in found
+                ],
+                language=language,
+            )
+        )
+        missing = [ingredient for ingredient in ingredients if ingredient not in found]
+        if not missing:
+            return found, True
+        if not self.fetch_nutrients.is_provider_available(source):
+            self.metrics.increment("nutrients_skipped_providers", provider=source)
+            return found, True
+        size = self.config.nutrients.batch_max_ingredients
+        chunks = [missing[i : i + size] for i in range(0, len(missing), size)]
+        self.metrics.increment(
+            "nutrients_batch_provider_calls", len(chunks), provider=source
+        )
+        fetched = await asyncio.gather(
+            *(
+                self.fetch_nutrients.fetch_ingredients_from_provider(
+                    source=source, ingredients=chunk, language=language
+                )
+                for chunk in chunks
+            )
+        )
+        aligned = True
+        for chunk, chunk_nutrients in zip(chunks, fetched):
+            if chunk_nutrients is None or not any(chunk_nutrients.values()):
+                continue
+            if set(chunk_nutrients) != set(chunk):
+                aligned = False
+                continue
+            for ingredient, nutrients in chunk_nutrients.items():
+                if not nutrients:
+                    continue
+                await self.nutrients_cache.set(
+                    source=source,
+                    query=ingredient,
+                    language=language,
+                    nutrients=nutrients,
+                )
+                self.fetch_nutrients.record_to_local(
+                    ingredient=ingredient, nutrients=nutrients, language=language
+                )
+                self.fetch_nutrients.store_base(
+                    source=source,
+                    ingredient=ingredient,
+                    nutrients=nutrients,
+                    language=language,
+                )
+                found[ingredient] = nutrients
+        return found, aligned
+
+    async def execute(
+        self, *, queries: List[str], language: Language = Language.EN_US
+    ) -> List[NutrientsResult | None]:
+        keys = {
+            query: self.fetch_nutrients.canonicalize(query=query, language=language)
+            for query in queries
+        }
+        unique_queries = [
+            key
+            for key in dict.fromkeys(keys.values())
+            if key
+            and not self.fetch_nutrients.is_unresolvable(query=key, language=language)
+        ]
+        self.metrics.increment("nutrients_batch_queries", len(queries))
+        results: Dict[str, NutrientsResult] = {}
+        if language == Language.EN_US:
+            for query in unique_queries:
+                local = self.fetch_nutrients.fetch_from_local(query=query)
+                if local is not None:
+                    results[query] = local
+        for source in self.fetch_nutrients.ordered_sources():
+            pending = [query for query in unique_queries if query not in results]
+            if not pending:
+                break
+            ingredients = list(
+                dict.fromkeys(
+                    ingredient
+                    for query in pending
+                    for ingredient in split_ingredients(query)
+                )
+            )
+            found, aligned = await self.fetch_ingredients_from_source(
+                source=source, ingredients=ingredients, language=language
+            )
+            for query in pending:
+                query_ingredients = split_ingredients(query)
+                if all(ingredient in found for ingredient in query_ingredients):
+                    results[query] = NutrientsResult(
+                        nutrients=[
+                            item
+                            for ingredient in query_ingredients
+                            for item in found[ingredient]
+                        ],
+                        source=source,
+                    )
+            if aligned:
+                continue
+            pending = [query for query in pending if query not in results]
+            fallback = await asyncio.gather(
+                *(
+                    self.fetch_nutrients.fetch_from_source(
+                        source=source, query=query, language=language
+                    )
+                    for query in pending
+                )
+            )
+            for query, nutrients in zip(pending, fallback):
+                if nutrients:
+                    results[query] = NutrientsResult(nutrients=nutrients, source=source)
+        return [results.get(keys[query]) for query in queries]
@@ -1,10 +1,19 @@
 from typing import List
 
-from httpx import AsyncClient
+from httpx import AsyncClient, HTTPStatusError
 from pydantic import BaseModel
 
-from ..types import Config, Language, Logger, Nutrients, NutrientSource
-from ..utils.nutrient_to_int import nutrient_to_int
+from ..types import (
+    Config,
+    Language,
+    Logger,
+    NutrientField,
+    Nutrients,
+    NutrientSource,
+    SendProviderRequest,
+)
+from ..utils.fast_decoder import fast_decoder
+from ..utils.map_nutrients import map_nutrients
 
 
 class NutritionixNutrients(BaseModel):
@@ -28,11 +37,39 @@ class NutritionixResponse(BaseModel):
     foods: List[NutritionixNutrients]
 
 
+decode_nutritionix_response = fast_decoder(NutritionixResponse)
+
+NUTRITIONIX_FIELDS = [
+    NutrientField(target="calories_kcal", path=("nf_calories",), unit="kcal"),
+    NutrientField(target="weight_grams", path=("serving_weight_grams",), unit="g"),
+    NutrientField(target="protein_grams", path=("nf_protein",), unit="g"),
+    NutrientField(target="total_fat_grams", path=("nf_total_fat",), unit="g"),
+    NutrientField(target="saturated_fat_grams", path=("nf_saturated_fat",), unit="g"),
+    NutrientField(
+        target="total_carbohydrates_grams", path=("nf_total_carbohydrate",), unit="g"
+    ),
+    NutrientField(target="dietary_fiber_grams", path=("nf_dietary_fiber",), unit="g"),
+    NutrientField(target="sugars_grams", path=("nf_sugars",), unit="g"),
+    NutrientField(target="cholesterol_mg", path=("nf_cholesterol",), unit="mg"),
+    NutrientField(target="sodium_mg", path=("nf_sodium",), unit="mg"),
+]
+
+
 class FetchNutritionixNutrients:
-    def __init__(self, config: Config, logger: Logger, http_client: AsyncClient):
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        http_client: AsyncClient,
+        send_provider_request: SendProviderRequest,
+    ):
         self.config = config
         self.logger = logger
         self.http_client = http_client
+        self.send_provider_request = send_provider_request
+
+    def is_available(self) -> bool:
+        return self.send_provider_request.is_available()
 
     async def execute(
         self, *, query: str, language: Language = Language.EN_US
@@ -53,55 +90,33 @@ class FetchNutritionixNutrients:
                 "use_raw_foods": False,
                 "use_branded_foods": False,
             }
-            response = await self.http_client.post(
-                url, headers=headers, json=body, timeout=5
-            )
-            response.raise_for_status()
-            response_data = response.json()
-            nutritionix_response = NutritionixResponse(**response_data)
-            nutrients: List[Nutrients] = []
-            for nutritionix_nutrients in nutritionix_response.foods:
-                nutrients.append(
-                    Nutrients(
-                        name=nutritionix_nutrients.food_name,
-                        brand_name=nutritionix_nutrients.brand_name,
-                        quantity=nutritionix_nutrients.serving_qty,
-                        unit=nutritionix_nutrients.serving_unit,
-                        calories_kcal=nutrient_to_int(
-                            nutritionix_nutrients.nf_calories
-                        ),
-                        weight_grams=nutrient_to_int(
-                            nutritionix_nutrients.serving_weight_grams
-                        ),
-                        calories_kcal_per_gram=nutrient_to_int(
-                            nutritionix_nutrients.nf_calories
-                            / nutritionix_nutrients.serving_weight_grams
-                        )
-                        if nutritionix_nutrients.nf_calories
-                        and nutritionix_nutrients.serving_weight_grams
-                        else None,
-                        protein_grams=nutrient_to_int(nutritionix_nutrients.nf_protein),
-                        total_fat_grams=nutrient_to_int(
-                            nutritionix_nutrients.nf_total_fat
-                        ),
-                        saturated_fat_grams=nutrient_to_int(
-                            nutritionix_nutrients.nf_saturated_fat
-                        ),
-                        total_carbohydrates_grams=nutrient_to_int(
-                            nutritionix_nutrients.nf_total_carbohydrate
-                        ),
-                        dietary_fiber_grams=nutrient_to_int(
-                            nutritionix_nutrients.nf_dietary_fiber
-                        ),
-                        sugars_grams=nutrient_to_int(nutritionix_nutrients.nf_sugars),
-                        cholesterol_mg=nutrient_to_int(
-                            nutritionix_nutrients.nf_cholesterol
-                        ),
-                        sodium_mg=nutrient_to_int(nutritionix_nutrients.nf_sodium),
-                        source=NutrientSource.NUTRITIONIX,
-                    )
+            response = await self.send_provider_request.execute(
+                send=lambda timeout: self.http_client.post(
+                    url, headers=headers, json=body, timeout=timeout
                 )
-            return nutrients
+            )
+            if self.config.nutrients.fast_decoding:
+                nutritionix_response = decode_nutritionix_response(response.content)
+            else:
+                nutritionix_response = NutritionixResponse(**response.json())
+            foods = nutritionix_response.foods
+            return map_nutrients(
+                items=foods,
+                fields=NUTRITIONIX_FIELDS,
+                columns={
+                    "name": [food.food_name for food in foods],
+                    "brand_name": [food.brand_name for food in foods],
+                    "quantity": [food.serving_qty for food in foods],
+                    "unit": [food.serving_unit for food in foods],
+                },
+                source=NutrientSource.NUTRITIONIX,
+            )
+        except HTTPStatusError as e:
+            # Nutritionix answers 404 when no food in the query matches
+            if e.response.status_code == 404:
+                return []
+            self.logger.error(f"Failed to fetch nutritionix nutrients: {str(e)}")
+            return None
         except Exception as e:
             self.logger.error(f"Failed to fetch nutritionix nutrients: {str(e)}")
             return None
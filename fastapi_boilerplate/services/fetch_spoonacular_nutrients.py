@@ -1,12 +1,18 @@
-from typing import List
+from typing import Dict, List
 
 from httpx import AsyncClient
 from pydantic import BaseModel
 
-from ..types import Config, Logger, Nutrients, NutrientSource
-from ..utils.micrograms_to_grams import micrograms_to_grams
-from ..utils.milligrams_to_grams import milligrams_to_grams
-from ..utils.nutrient_to_int import nutrient_to_int
+from ..types import (
+    Config,
+    Logger,
+    NutrientField,
+    Nutrients,
+    NutrientSource,
+    SendProviderRequest,
+)
+from ..utils.fast_decoder import fast_decoder
+from ..utils.map_nutrients import map_nutrients
 
 
 class SpoonacularNutrient(BaseModel):
@@ -32,44 +38,77 @@ class SpoonacularIngredient(BaseModel):
     nutrition: SpoonacularNutrition
 
 
+decode_spoonacular_ingredients = fast_decoder(List[SpoonacularIngredient])
+
+SPOONACULAR_FIELDS = [
+    NutrientField(target="calories_kcal", path=("Calories", "amount"), unit="kcal"),
+    NutrientField(
+        target="protein_grams",
+        path=("Protein", "amount"),
+        unit=("Protein", "unit"),
+    ),
+    NutrientField(
+        target="total_fat_grams",
+        path=("Fat", "amount"),
+        unit=("Fat", "unit"),
+    ),
+    NutrientField(
+        target="saturated_fat_grams",
+        path=("Saturated Fat", "amount"),
+        unit=("Saturated Fat", "unit"),
+    ),
+    NutrientField(
+        target="total_carbohydrates_grams",
+        path=("Carbohydrates", "amount"),
+        unit=("Carbohydrates", "unit"),
+    ),
+    NutrientField(
+        target="dietary_fiber_grams",
+        path=("Fiber", "amount"),
+        unit=("Fiber", "unit"),
+    ),
+    NutrientField(
+        target="sugars_grams",
+        path=("Sugar", "amount"),
+        unit=("Sugar", "unit"),
+    ),
+    NutrientField(
+        target="cholesterol_mg",
+        path=("Cholesterol", "amount"),
+        unit=("Cholesterol", "unit"),
+    ),
+    NutrientField(
+        target="sodium_mg",
+        path=("Sodium", "amount"),
+        unit=("Sodium", "unit"),
+    ),
+]
+
+
 class FetchSpoonacularNutrients:
-    def __init__(self, config: Config, logger: Logger, http_client: AsyncClient):
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        http_client: AsyncClient,
+        send_provider_request: SendProviderRequest,
+    ):
         self.config = config
         self.logger = logger
         self.http_client = http_client
+        self.send_provider_request = send_provider_request
 
-    def find_nutrient(
-        self, *, name: str, nutrients: List[SpoonacularNutrient]
-    ) -> SpoonacularNutrient | None:
-        return next(filter(lambda nutrient: nutrient.name == name, nutrients), None)
-
-    def get_nutrient_milligrams(
-        self, *, name: str, nutrients: List[SpoonacularNutrient]
-    ) -> float | None:
-        nutrient = self.find_nutrient(name=name, nutrients=nutrients)
-        if nutrient:
-            match nutrient.unit:
-                case "mg":
-                    return nutrient.amount
-                case _:
-                    return None
-        return None
-
-    def get_nutrient_grams(
-        self, *, name: str, nutrients: List[SpoonacularNutrient]
-    ) -> float | None:
-        nutrient = self.find_nutrient(name=name, nutrients=nutrients)
-        if nutrient:
-            match nutrient.unit:
-                case "µg":
-                    return micrograms_to_grams(nutrient.amount)
-                case "mg":
-                    return milligrams_to_grams(nutrient.amount)
-                case "g":
-                    return nutrient.amount
-                case _:
-                    return None
-        return None
+    def is_available(self) -> bool:
+        return self.send_provider_request.is_available()
+
+    def index_nutrients(
+        self, *, nutrients: List[SpoonacularNutrient]
+    ) -> Dict[str, SpoonacularNutrient]:
+        """Indexes the nutrients by name, keeping the first of duplicates."""
+        index: Dict[str, SpoonacularNutrient] = {}
+        for nutrient in nutrients:
+            index.setdefault(nutrient.name, nutrient)
+        return index
 
     async def execute(self, *, query: str) -> List[Nutrients] | None:
         try:
@@ -84,90 +123,55 @@ class FetchSpoonacularNutrients:
                 "includeNutrition": "true",
                 "language": "en",
             }
-            response = await self.http_client.post(
-                url, headers=headers, data=data, timeout=5
+            response = await self.send_provider_request.execute(
+                send=lambda timeout: self.http_client.post(
+                    url, headers=headers, data=data, timeout=timeout
+                )
             )
-            response.raise_for_status()
-            response_data = response.json()
-            nutrients: List[Nutrients] = []
-            for response_item in response_data:
-                spoonacular_ingredient = SpoonacularIngredient(**response_item)
-                spoonacular_nutrients = spoonacular_ingredient.nutrition.nutrients
-                spoonacular_weight_per_serving = (
-                    spoonacular_ingredient.nutrition.weightPerServing
+            if self.config.nutrients.fast_decoding:
+                spoonacular_ingredients = decode_spoonacular_ingredients(
+                    response.content
                 )
-                if spoonacular_weight_per_serving.unit != "g":
+            else:
+                spoonacular_ingredients = [
+                    SpoonacularIngredient(**response_item)
+                    for response_item in response.json()
+                ]
+            indexes: List[Dict[str, SpoonacularNutrient]] = []
+            for spoonacular_ingredient in spoonacular_ingredients:
+                spoonacular_nutrients = self.index_nutrients(
+                    nutrients=spoonacular_ingredient.nutrition.nutrients
+                )
+                if spoonacular_ingredient.nutrition.weightPerServing.unit != "g":
                     self.logger.error(
                         f"Failed to fetch Spoonacular nutrients: {spoonacular_ingredient.name} does not have weight in grams"
                     )
                     return None
-                calories = self.find_nutrient(
-                    name="Calories", nutrients=spoonacular_nutrients
-                )
+                calories = spoonacular_nutrients.get("Calories")
                 if not calories or calories.unit != "kcal":
                     self.logger.error(
                         f"Failed to fetch Spoonacular nutrients: {spoonacular_ingredient.name} does not have calories"
                     )
                     return None
-                calories_kcal = calories.amount
-                quantity = int(spoonacular_ingredient.amount)
-                weight_grams = spoonacular_weight_per_serving.amount * quantity
-                nutrients.append(
-                    Nutrients(
-                        name=spoonacular_ingredient.name,
-                        quantity=quantity,
-                        unit=spoonacular_ingredient.unit,
-                        calories_kcal=nutrient_to_int(calories_kcal),
-                        weight_grams=nutrient_to_int(weight_grams),
-                        calories_kcal_per_gram=nutrient_to_int(
-                            calories_kcal / weight_grams
-                        )
-                        if calories_kcal and weight_grams
-                        else None,
-                        protein_grams=nutrient_to_int(
-                            self.get_nutrient_grams(
-                                name="Protein", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        total_fat_grams=nutrient_to_int(
-                            self.get_nutrient_grams(
-                                name="Fat", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        saturated_fat_grams=nutrient_to_int(
-                            self.get_nutrient_grams(
-                                name="Saturated Fat", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        total_carbohydrates_grams=nutrient_to_int(
-                            self.get_nutrient_grams(
-                                name="Carbohydrates", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        dietary_fiber_grams=nutrient_to_int(
-                            self.get_nutrient_grams(
-                                name="Fiber", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        sugars_grams=nutrient_to_int(
-                            self.get_nutrient_grams(
-                                name="Sugar", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        cholesterol_mg=nutrient_to_int(
-                            self.get_nutrient_milligrams(
-                                name="Cholesterol", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        sodium_mg=nutrient_to_int(
-                            self.get_nutrient_milligrams(
-                                name="Sodium", nutrients=spoonacular_nutrients
-                            )
-                        ),
-                        source=NutrientSource.SPOONACULAR,
-                    )
-                )
-            return nutrients
+                indexes.append(spoonacular_nutrients)
+            quantities = [
+                int(spoonacular_ingredient.amount)
+                for spoonacular_ingredient in spoonacular_ingredients
+            ]
+            return map_nutrients(
+                items=indexes,
+                fields=SPOONACULAR_FIELDS,
+                columns={
+                    "name": [item.name for item in spoonacular_ingredients],
+                    "quantity": quantities,
+                    "unit": [item.unit for item in spoonacular_ingredients],
+                    "weight_grams": [
+                        item.nutrition.weightPerServing.amount * quantity
+                        for item, quantity in zip(spoonacular_ingredients, quantities)
+                    ],
+                },
+                source=NutrientSource.SPOONACULAR,
+            )
         except Exception as e:
             self.logger.error(f"Failed to fetch spoonacular nutrients: {str(e)}")
             return None
@@ -0,0 +1,80 @@
+import asyncio
+from typing import List
+
+from anyio import to_thread
+
+from ..types import Config, FindKnownIngredientNames, Logger, Metrics
+from ..utils.trigram_index import TrigramIndex
+
+
+class KnownIngredients:
+    """Resolves misspelled ingredients to the closest known ingredient name."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        find_known_ingredient_names: FindKnownIngredientNames,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.find_known_ingredient_names = find_known_ingredient_names
+        threshold = config.nutrients.fuzzy_match_threshold
+        self.trigram_index = TrigramIndex(threshold) if threshold else None
+        self.task: asyncio.Task | None = None
+
+    def load(self) -> None:
+        if self.trigram_index is None:
+            return
+        try:
+            names = self.find_known_ingredient_names.execute()
+        except Exception as e:
+            self.logger.error(f"Failed to load known ingredients: {str(e)}")
+            return
+        for name in names:
+            if "," not in name:
+                self.trigram_index.add(name)
+        self.metrics.set_gauge("known_ingredients_size", len(self.trigram_index))
+        self.logger.info(f"Loaded {len(self.trigram_index)} known ingredients")
+
+    def add(self, *, names: List[str]) -> None:
+        if self.trigram_index is None:
+            return
+        for name in names:
+            if "," not in name:
+                self.trigram_index.add(name, rebuild=False)
+        self.metrics.set_gauge("known_ingredients_size", len(self.trigram_index))
+        if self.trigram_index.needs_rebuild() and self.task is None:
+            self.task = asyncio.create_task(self.rebuild())
+
+    async def rebuild(self) -> None:
+        trigram_index = self.trigram_index
+        size = len(trigram_index)
+        try:
+            ranks, postings = await to_thread.run_sync(
+                trigram_index.build, trigram_index.counts.copy(), size
+            )
+            trigram_index.swap(ranks, postings, size)
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild known ingredients: {str(e)}")
+        finally:
+            self.task = None
+
+    async def close(self) -> None:
+        if self.task is not None:
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    def resolve(self, *, ingredient: str) -> str:
+        if self.trigram_index is None or any(char.isdigit() for char in ingredient):
+            return ingredient
+        match = self.trigram_index.match(ingredient)
+        if match is None:
+            self.metrics.increment("nutrients_fuzzy_misses")
+            return ingredient
+        name, _ = match
+        if name != ingredient:
+            self.metrics.increment("nutrients_fuzzy_matches")
+            self.logger.debug(f"Resolved {ingredient} to {name}")
+        return name
@@ -0,0 +1,112 @@
+import asyncio
+import fcntl
+import os
+from itertools import chain
+from typing import Dict
+
+from anyio import to_thread
+
+from ..types import Config, Logger, Metrics, Nutrients
+from ..utils.canonicalize_ingredient import ingredient_key
+from ..utils.nutrients_index import NutrientsIndex, write_nutrients_index
+
+
+class LocalNutrients:
+    """Offline nutrients of known ingredients, looked up before any provider."""
+
+    def __init__(self, config: Config, logger: Logger, metrics: Metrics):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.index: NutrientsIndex | None = None
+        self.recorded: Dict[str, Nutrients] = {}
+        self.task: asyncio.Task | None = None
+
+    def load(self) -> None:
+        index_path = self.config.local_nutrients.index_path
+        if not index_path or not os.path.exists(index_path):
+            return
+        try:
+            self.index = NutrientsIndex(index_path)
+        except Exception as e:
+            self.logger.error(f"Failed to load local nutrients: {str(e)}")
+            return
+        self.metrics.set_gauge("local_nutrients_size", len(self.index))
+        self.logger.info(f"Loaded {len(self.index)} local nutrients")
+
+    def get(self, *, ingredient: str) -> Nutrients | None:
+        key = ingredient_key(ingredient)
+        nutrients = self.recorded.get(key)
+        if nutrients is None and self.index is not None:
+            nutrients = self.index.get(key)
+        return nutrients
+
+    def record(self, *, ingredient: str, nutrients: Nutrients) -> None:
+        if not self.config.local_nutrients.record:
+            return
+        key = ingredient_key(ingredient)
+        if key and self.get(ingredient=key) is None:
+            self.recorded[key] = nutrients
+            self.metrics.increment("local_nutrients_recorded")
+
+    def write(self, recorded: Dict[str, Nutrients]) -> NutrientsIndex:
+        """Merges the entries into the index on disk, keeping other workers'."""
+        index_path = self.config.local_nutrients.index_path
+        with open(f"{index_path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            current = NutrientsIndex(index_path) if os.path.exists(index_path) else None
+            try:
+                entries = chain(
+                    recorded.items(), current.items() if current is not None else []
+                )
+                write_nutrients_index(index_path, entries)
+            finally:
+                if current is not None:
+                    current.close()
+            return NutrientsIndex(index_path)
+
+    def swap(self, index: NutrientsIndex, recorded: Dict[str, Nutrients]) -> None:
+        if self.index is not None:
+            self.index.close()
+        self.index = index
+        for key in recorded:
+            self.recorded.pop(key, None)
+        self.metrics.set_gauge("local_nutrients_size", len(self.index))
+
+    def flush(self) -> None:
+        if not self.config.local_nutrients.index_path or not self.recorded:
+            return
+        recorded = dict(self.recorded)
+        try:
+            index = self.write(recorded)
+        except Exception as e:
+            self.logger.error(f"Failed to save local nutrients: {str(e)}")
+            return
+        self.swap(index, recorded)
+
+    def start(self) -> None:
+        if (
+            self.config.local_nutrients.record
+            and self.config.local_nutrients.index_path
+            and self.task is None
+        ):
+            self.task = asyncio.create_task(self.flush_periodically())
+
+    async def flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.local_nutrients.flush_interval_seconds)
+            if not self.recorded:
+                continue
+            recorded = dict(self.recorded)
+            try:
+                index = await to_thread.run_sync(self.write, recorded)
+            except Exception as e:
+                self.logger.error(f"Failed to save local nutrients: {str(e)}")
+                continue
+            self.swap(index, recorded)
+
+    async def close(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        self.flush()
@@ -0,0 +1,52 @@
+from ..types import Config, Language, Logger, Metrics
+from ..utils.bloom_filter import BloomFilter
+from ..utils.lru_cache import LruCache
+from ..utils.normalize_query import normalize_query
+
+
+class NegativeCache:
+    """Short-lived memory of the queries no provider has nutrients for."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        lru_cache: LruCache[bool],
+        bloom_filter: BloomFilter,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.lru_cache = lru_cache
+        self.bloom_filter = bloom_filter
+
+    def key(self, *, query: str, language: Language) -> str:
+        return f"{language.value}:{normalize_query(query)}"
+
+    def contains(self, *, query: str, language: Language) -> bool:
+        if self.config.cache.negative_ttl_seconds is None:
+            return False
+        key = self.key(query=query, language=language)
+        if key not in self.bloom_filter:
+            return False
+        if self.lru_cache.get(key) is None:
+            self.metrics.increment("nutrients_negative_cache_false_positives")
+            return False
+        self.metrics.increment("nutrients_negative_cache_hits")
+        return True
+
+    def add(self, *, query: str, language: Language) -> None:
+        if self.config.cache.negative_ttl_seconds is None:
+            return
+        key = self.key(query=query, language=language)
+        if len(self.bloom_filter) >= self.bloom_filter.capacity:
+            self.rebuild()
+        self.lru_cache.set(key, True)
+        self.bloom_filter.add(key)
+        self.metrics.set_gauge("nutrients_negative_cache_size", len(self.lru_cache))
+
+    def rebuild(self) -> None:
+        self.bloom_filter.clear()
+        for key in self.lru_cache.keys():
+            self.bloom_filter.add(key)
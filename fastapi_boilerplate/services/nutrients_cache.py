@@ -0,0 +1,194 @@
+from dataclasses import asdict
+from functools import partial
+from typing import Any, Awaitable, Callable, List
+
+from anyio import to_thread
+
+from ..types import (
+    BaseNutrients,
+    Config,
+    FindCachedNutrients,
+    Language,
+    Logger,
+    Metrics,
+    Nutrients,
+    NutrientSource,
+    UpsertCachedNutrients,
+)
+from ..utils.background_refresh import BackgroundRefresh
+from ..utils.lru_cache import LruCache
+from ..utils.normalize_query import normalize_query
+
+
+class NutrientsCache:
+    """Two-tier cache of provider answers: in-process LRU, then MongoDB."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        lru_cache: LruCache[List[Nutrients] | BaseNutrients],
+        find_cached_nutrients: FindCachedNutrients,
+        upsert_cached_nutrients: UpsertCachedNutrients,
+        background_refresh: BackgroundRefresh,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.lru_cache = lru_cache
+        self.find_cached_nutrients = find_cached_nutrients
+        self.upsert_cached_nutrients = upsert_cached_nutrients
+        self.background_refresh = background_refresh
+
+    def key(self, *, source: NutrientSource, query: str, language: Language) -> str:
+        return f"{source.value}:{language.value}:{normalize_query(query)}"
+
+    def base_key(
+        self, *, source: NutrientSource, food: str, unit: str | None, language: Language
+    ) -> str:
+        return f"{source.value}:{language.value}:base:{unit or ''}:{food}"
+
+    async def get(
+        self,
+        *,
+        source: NutrientSource,
+        query: str,
+        language: Language,
+        refresh: Callable[[], Awaitable[None]] | None = None,
+    ) -> List[Nutrients] | None:
+        return await self.lookup(
+            key=self.key(source=source, query=query, language=language),
+            decode=lambda cached: [
+                Nutrients(**{**item, "source": NutrientSource(item["source"])})
+                for item in cached
+            ],
+            refresh=refresh,
+        )
+
+    async def set(
+        self,
+        *,
+        source: NutrientSource,
+        query: str,
+        language: Language,
+        nutrients: List[Nutrients],
+    ) -> None:
+        await self.store(
+            key=self.key(source=source, query=query, language=language),
+            value=nutrients,
+            encoded=[
+                {**asdict(item), "source": item.source.value} for item in nutrients
+            ],
+        )
+
+    def get_base(
+        self, *, source: NutrientSource, food: str, unit: str | None, language: Language
+    ) -> BaseNutrients | None:
+        return self.lru_cache.get(
+            self.base_key(source=source, food=food, unit=unit, language=language)
+        )
+
+    def set_base(
+        self,
+        *,
+        source: NutrientSource,
+        food: str,
+        unit: str | None,
+        language: Language,
+        base_nutrients: BaseNutrients,
+    ) -> None:
+        self.store_in_memory(
+            key=self.base_key(source=source, food=food, unit=unit, language=language),
+            value=base_nutrients,
+        )
+
+    async def lookup(
+        self,
+        *,
+        key: str,
+        decode: Callable[[List[dict]], Any],
+        refresh: Callable[[], Awaitable[None]] | None = None,
+    ) -> Any:
+        value = self.lru_cache.get(key)
+        if value is not None:
+            self.metrics.increment("nutrients_cache_hits", tier="memory")
+            soft_ttl_seconds = self.config.cache.soft_ttl_seconds
+            if (
+                soft_ttl_seconds is not None
+                and (self.lru_cache.age(key) or 0) >= soft_ttl_seconds
+            ):
+                self.revalidate(key=key, tier="memory", refresh=refresh)
+            return value
+        self.metrics.increment("nutrients_cache_misses", tier="memory")
+        try:
+            cached = await to_thread.run_sync(
+                partial(self.find_cached_nutrients.execute, key=key)
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to find cached nutrients: {str(e)}")
+            return None
+        if cached is None:
+            self.metrics.increment("nutrients_cache_misses", tier="mongodb")
+            return None
+        self.metrics.increment("nutrients_cache_hits", tier="mongodb")
+        if cached.get("stale"):
+            self.revalidate(key=key, tier="mongodb", refresh=refresh)
+        value = decode(cached["nutrients"])
+        self.store_in_memory(
+            key=key,
+            value=value,
+            ttl_seconds=min(self.lru_cache.ttl_seconds, cached["ttl_seconds"]),
+            age_seconds=cached["age_seconds"],
+        )
+        return value
+
+    def revalidate(
+        self, *, key: str, tier: str, refresh: Callable[[], Awaitable[None]] | None
+    ) -> None:
+        if refresh is None:
+            return
+        self.metrics.increment("nutrients_cache_stale_hits", tier=tier)
+        if self.background_refresh.schedule(
+            key, partial(self.refresh_entry, refresh=refresh)
+        ):
+            self.metrics.increment("nutrients_cache_refreshes")
+        elif key not in self.background_refresh:
+            self.metrics.increment("nutrients_cache_skipped_refreshes")
+        self.metrics.set_gauge(
+            "nutrients_cache_pending_refreshes", len(self.background_refresh)
+        )
+
+    async def refresh_entry(self, *, refresh: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await refresh()
+        except Exception as e:
+            self.logger.error(f"Failed to refresh cached nutrients: {str(e)}")
+
+    async def store(self, *, key: str, value: Any, encoded: List[dict]) -> None:
+        self.store_in_memory(key=key, value=value)
+        try:
+            await to_thread.run_sync(
+                partial(
+                    self.upsert_cached_nutrients.execute, key=key, nutrients=encoded
+                )
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to cache nutrients: {str(e)}")
+
+    def store_in_memory(
+        self,
+        *,
+        key: str,
+        value: Any,
+        ttl_seconds: float | None = None,
+        age_seconds: float = 0,
+    ) -> None:
+        evicted = self.lru_cache.set(
+            key, value, ttl_seconds=ttl_seconds, age_seconds=age_seconds
+        )
+        if evicted:
+            self.metrics.increment("nutrients_cache_evictions", evicted, tier="memory")
+        self.metrics.set_gauge(
+            "nutrients_cache_size", len(self.lru_cache), tier="memory"
+        )
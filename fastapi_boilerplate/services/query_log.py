@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timezone
+from functools import partial
+from typing import List
+
+from anyio import to_thread
+
+from ..types import Config, InsertQueryLogEntries, Language, Logger, Metrics
+
+
+class QueryLog:
+    """Logs the canonical queries served, written in background batches."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        insert_query_log_entries: InsertQueryLogEntries,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.insert_query_log_entries = insert_query_log_entries
+        self.pending: List[dict] = []
+        self.task: asyncio.Task | None = None
+
+    def record(self, *, query: str, language: Language) -> None:
+        if self.config.warm_up.queries <= 0:
+            return
+        if len(self.pending) >= self.config.warm_up.query_log_max_pending:
+            self.metrics.increment("query_log_dropped_entries")
+            return
+        self.pending.append(
+            {
+                "query": query,
+                "language": language.value,
+                "logged_at": datetime.now(timezone.utc),
+            }
+        )
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.flush())
+
+    async def flush(self) -> None:
+        while self.pending:
+            entries, self.pending = self.pending, []
+            try:
+                await to_thread.run_sync(
+                    partial(self.insert_query_log_entries.execute, entries=entries)
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to log nutrient queries: {str(e)}")
+                self.metrics.increment("query_log_dropped_entries", len(entries))
+                continue
+            self.metrics.increment("query_log_entries", len(entries))
+
+    async def close(self) -> None:
+        if self.task is not None:
+            await asyncio.gather(self.task, return_exceptions=True)
@@ -0,0 +1,259 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from httpx import (
+    ConnectTimeout,
+    HTTPStatusError,
+    NetworkError,
+    RemoteProtocolError,
+    Response,
+    Timeout,
+    TimeoutException,
+)
+
+from ..types import (
+    Config,
+    HedgeConfig,
+    HttpClientConfig,
+    Logger,
+    Metrics,
+    NutrientSource,
+)
+from ..utils.adaptive_timeout import AdaptiveTimeout
+from ..utils.circuit_breaker import CircuitBreaker
+from ..utils.http_timeout import http_timeout
+from ..utils.provider_calls import count_provider_call
+from ..utils.provider_scheduler import ProviderScheduler, ProviderThrottledError
+from ..utils.retry_policy import RetryPolicy
+
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
+
+class ProviderUnavailableError(Exception):
+    pass
+
+
+class SendProviderRequest:
+    """Sends provider requests through the circuit breaker and the scheduler."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        source: NutrientSource,
+        http_client_config: HttpClientConfig,
+        hedge_config: HedgeConfig,
+        circuit_breaker: CircuitBreaker,
+        adaptive_timeout: AdaptiveTimeout,
+        provider_scheduler: ProviderScheduler,
+        retry_policy: RetryPolicy,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.source = source
+        self.http_client_config = http_client_config
+        self.hedge_config = hedge_config
+        self.circuit_breaker = circuit_breaker
+        self.adaptive_timeout = adaptive_timeout
+        self.provider_scheduler = provider_scheduler
+        self.retry_policy = retry_policy
+
+    def is_available(self) -> bool:
+        return (
+            self.circuit_breaker.is_available() and self.provider_scheduler.has_budget()
+        )
+
+    async def execute(
+        self, *, send: Callable[[Timeout], Awaitable[Response]]
+    ) -> Response:
+        self.retry_policy.start()
+        started_at = time.monotonic()
+        attempt = 1
+        max_read_timeout: float | None = None
+        while True:
+            try:
+                return await self.send_attempt(
+                    send=send, max_read_timeout=max_read_timeout
+                )
+            except Exception as e:
+                if not self.is_retryable(e):
+                    raise
+                delay = self.retry_policy.backoff(
+                    attempt=attempt, elapsed_seconds=time.monotonic() - started_at
+                )
+                if delay is None:
+                    self.metrics.increment(
+                        "provider_retries_denied", provider=self.source
+                    )
+                    raise
+            self.metrics.increment("provider_retries", provider=self.source)
+            attempt += 1
+            max_read_timeout = (
+                self.retry_policy.time_budget_seconds
+                - (time.monotonic() - started_at)
+                - delay
+            )
+            await asyncio.sleep(delay)
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, (NetworkError, RemoteProtocolError, ConnectTimeout))
+
+    def hedge_delay(self) -> float | None:
+        if not self.hedge_config.enabled:
+            return None
+        return self.adaptive_timeout.latency(self.hedge_config.percentile)
+
+    def can_hedge(self) -> bool:
+        if self.provider_scheduler.load() >= self.hedge_config.max_load:
+            self.metrics.increment(
+                "provider_skipped_hedges", provider=self.source, reason="load"
+            )
+            return False
+        remaining_quota = self.provider_scheduler.remaining_quota()
+        if (
+            remaining_quota is not None
+            and remaining_quota < self.hedge_config.min_remaining_quota
+        ):
+            self.metrics.increment(
+                "provider_skipped_hedges", provider=self.source, reason="quota"
+            )
+            return False
+        return True
+
+    async def send_attempt(
+        self,
+        *,
+        send: Callable[[Timeout], Awaitable[Response]],
+        max_read_timeout: float | None = None,
+    ) -> Response:
+        hedge_delay = self.hedge_delay()
+        if hedge_delay is None:
+            return await self.send_once(send=send, max_read_timeout=max_read_timeout)
+        primary = asyncio.create_task(
+            self.send_once(send=send, max_read_timeout=max_read_timeout)
+        )
+        hedge: asyncio.Task | None = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+            if done or not self.can_hedge():
+                return await primary
+            self.metrics.increment("provider_hedges", provider=self.source)
+            hedge = asyncio.create_task(
+                self.send_once(send=send, max_read_timeout=max_read_timeout)
+            )
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda task: task is hedge):
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics.increment(
+                                "provider_hedge_wins", provider=self.source
+                            )
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def send_once(
+        self,
+        *,
+        send: Callable[[Timeout], Awaitable[Response]],
+        max_read_timeout: float | None = None,
+    ) -> Response:
+        if not self.circuit_breaker.allow_request():
+            self.metrics.increment(
+                "provider_rejected_requests", provider=self.source, reason="circuit"
+            )
+            raise ProviderUnavailableError(
+                f"{self.source.value} circuit breaker is open"
+            )
+        generation = self.circuit_breaker.generation
+        try:
+            async with self.provider_scheduler.schedule():
+                return await self.send_scheduled(
+                    send=send, generation=generation, max_read_timeout=max_read_timeout
+                )
+        except ProviderThrottledError as e:
+            self.circuit_breaker.record_ignored(generation=generation)
+            self.metrics.increment(
+                "provider_rejected_requests", provider=self.source, reason=e.reason
+            )
+            raise
+
+    async def send_scheduled(
+        self,
+        *,
+        send: Callable[[Timeout], Awaitable[Response]],
+        generation: int,
+        max_read_timeout: float | None = None,
+    ) -> Response:
+        self.metrics.increment("provider_requests", provider=self.source)
+        count_provider_call()
+        read_timeout = min(
+            self.adaptive_timeout.timeout(),
+            self.http_client_config.read_timeout_seconds,
+        )
+        # A timeout cut short by the retry budget says nothing about the
+        # provider, so it is neither learned from nor held against it.
+        clamped = max_read_timeout is not None and max_read_timeout < read_timeout
+        if clamped:
+            read_timeout = max_read_timeout
+        self.metrics.set_gauge(
+            "provider_timeout_seconds", read_timeout, provider=self.source
+        )
+        started_at = time.monotonic()
+        try:
+            response = await send(http_timeout(self.http_client_config, read_timeout))
+            self.record_latency(time.monotonic() - started_at)
+            response.raise_for_status()
+        except TimeoutException:
+            if clamped:
+                self.circuit_breaker.record_ignored(generation=generation)
+                raise
+            self.adaptive_timeout.record_timeout(read_timeout)
+            self.record_failure(timeout=True, generation=generation)
+            raise
+        except HTTPStatusError as e:
+            if e.response.status_code == 429:
+                self.provider_scheduler.throttled()
+            if e.response.status_code >= 500 or e.response.status_code == 429:
+                self.record_failure(generation=generation)
+            else:
+                self.circuit_breaker.record_ignored(generation=generation)
+            raise
+        except asyncio.CancelledError:
+            self.circuit_breaker.record_ignored(generation=generation)
+            raise
+        except Exception:
+            self.record_failure(generation=generation)
+            raise
+        self.circuit_breaker.record_success(generation=generation)
+        return response
+
+    def record_latency(self, seconds: float) -> None:
+        self.adaptive_timeout.record(seconds)
+        for percentile in [0.5, 0.95, 0.99]:
+            latency = self.adaptive_timeout.latency(percentile)
+            if latency is not None:
+                self.metrics.set_gauge(
+                    "provider_latency_seconds",
+                    latency,
+                    provider=self.source,
+                    percentile=str(percentile),
+                )
+
+    def record_failure(self, *, timeout: bool = False, generation: int) -> None:
+        self.metrics.increment(
+            "provider_failed_requests", provider=self.source, timeout=str(timeout)
+        )
+        self.circuit_breaker.record_failure(timeout=timeout, generation=generation)
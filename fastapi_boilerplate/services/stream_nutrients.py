@@ -0,0 +1,67 @@
+import asyncio
+from typing import AsyncIterator, Dict, List
+
+from ..types import (
+    Config,
+    FetchNutrients,
+    IngredientNutrients,
+    Language,
+    Logger,
+    Metrics,
+)
+from ..utils.split_ingredients import split_ingredients
+
+
+class StreamNutrients:
+    """Yields the ingredients of a query as soon as each of them resolves."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        fetch_nutrients: FetchNutrients,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.fetch_nutrients = fetch_nutrients
+
+    async def execute(
+        self, *, query: str, language: Language = Language.EN_US
+    ) -> AsyncIterator[IngredientNutrients]:
+        positions: Dict[str, List[int]] = {}
+        for index, ingredient in enumerate(split_ingredients(query)):
+            positions.setdefault(ingredient, []).append(index)
+        self.metrics.increment("nutrients_streamed_ingredients", len(positions))
+        tasks = {
+            asyncio.create_task(
+                self.fetch_nutrients.execute(query=ingredient, language=language)
+            ): ingredient
+            for ingredient in positions
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=lambda task: positions[tasks[task]][0]):
+                    ingredient = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        self.logger.error(
+                            f"Failed to fetch {ingredient} nutrients: {str(e)}"
+                        )
+                        result = None
+                    for index in positions[ingredient]:
+                        yield IngredientNutrients(
+                            index=index,
+                            ingredient=ingredient,
+                            nutrients=result.nutrients if result else [],
+                            source=result.source if result else None,
+                        )
+        finally:
+            for task in pending:
+                task.cancel()
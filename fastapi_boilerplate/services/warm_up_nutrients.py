@@ -0,0 +1,87 @@
+import asyncio
+
+from anyio import to_thread
+
+from ..types import Config, FindTopLoggedQueries, Language, Logger, Metrics
+from ..utils.provider_calls import ProviderCalls, current_provider_calls
+from ..utils.split_ingredients import split_ingredients
+from .fetch_nutrients import FetchNutrients
+
+
+class WarmUpNutrients:
+    """Warms the nutrients cache at startup with the most logged queries."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: Logger,
+        metrics: Metrics,
+        find_top_logged_queries: FindTopLoggedQueries,
+        fetch_nutrients: FetchNutrients,
+    ):
+        self.config = config
+        self.logger = logger
+        self.metrics = metrics
+        self.find_top_logged_queries = find_top_logged_queries
+        self.fetch_nutrients = fetch_nutrients
+        self.status = "warming" if config.warm_up.queries > 0 else "ready"
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.status == "warming" and self.task is None:
+            self.task = asyncio.create_task(self.execute())
+
+    async def execute(self) -> None:
+        try:
+            await asyncio.wait_for(
+                self.warm_up(), timeout=self.config.warm_up.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning("Cache warm-up timed out")
+        except Exception as e:
+            self.logger.error(f"Failed to warm up nutrients cache: {str(e)}")
+        finally:
+            self.status = "ready"
+            self.metrics.set_gauge("cache_warming", 0)
+
+    async def warm_up(self) -> None:
+        self.metrics.set_gauge("cache_warming", 1)
+        queries = await to_thread.run_sync(
+            lambda: self.find_top_logged_queries.execute(
+                limit=self.config.warm_up.queries
+            )
+        )
+        budget = self.config.warm_up.provider_budget
+        provider_calls = ProviderCalls()
+        current_provider_calls.set(provider_calls)
+        reserved = 0
+        semaphore = asyncio.Semaphore(self.config.warm_up.concurrency)
+
+        async def warm_up_query(query: str, language: Language) -> None:
+            nonlocal reserved
+            async with semaphore:
+                # Hedging and fallbacks may call every provider per ingredient
+                cost = (len(split_ingredients(query)) or 1) * len(
+                    self.fetch_nutrients.available_sources()
+                )
+                if provider_calls.calls + reserved + cost > budget:
+                    return
+                reserved += cost
+                try:
+                    await self.fetch_nutrients.fetch(query=query, language=language)
+                finally:
+                    reserved -= cost
+                self.metrics.increment("cache_warm_up_queries")
+
+        await asyncio.gather(
+            *(warm_up_query(query, language) for query, language in queries)
+        )
+        self.logger.info(
+            f"Warmed up nutrients cache with {len(queries)} queries and "
+            f"{provider_calls.calls} provider requests"
+        )
+
+    async def close(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
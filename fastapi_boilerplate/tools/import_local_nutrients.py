@@ -0,0 +1,82 @@
+"""Builds the local nutrients index from CSV or JSON files."""
+
+import argparse
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, List, Tuple
+
+from ..types import Nutrients, NutrientSource
+from ..utils.canonicalize_ingredient import ingredient_key
+from ..utils.nutrient_to_int import nutrient_to_int
+from ..utils.nutrients_index import INT_FIELDS, NutrientsIndex, write_nutrients_index
+
+
+def read_rows(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.endswith(".json"):
+            return json.load(file)
+        return list(csv.DictReader(file))
+
+
+def to_float(value: Any) -> float | None:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def row_to_nutrients(row: Dict[str, Any]) -> Tuple[str, Nutrients]:
+    name = row.get("name")
+    if not name:
+        raise ValueError(f"Missing name: {row}")
+    key = ingredient_key(row.get("ingredient") or name)
+    values = {
+        field: nutrient_to_int(to_float(row.get(field)))
+        for field in INT_FIELDS
+        if field != "calories_kcal_per_gram"
+    }
+    calories = to_float(row.get("calories_kcal"))
+    weight = to_float(row.get("weight_grams"))
+    values["calories_kcal_per_gram"] = nutrient_to_int(
+        calories / weight if calories and weight else None
+    )
+    nutrients = Nutrients(
+        name=name,
+        brand_name=row.get("brand_name") or None,
+        quantity=int(to_float(row.get("quantity")) or 1),
+        unit=row.get("unit") or "serving",
+        **values,
+        source=NutrientSource(row.get("source") or NutrientSource.LOCAL.value),
+    )
+    return key, nutrients
+
+
+def import_local_nutrients(paths: List[str], output: str, merge: bool) -> int:
+    def entries() -> Iterator[Tuple[str, Nutrients]]:
+        if merge and os.path.exists(output):
+            index = NutrientsIndex(output)
+            try:
+                yield from index.items()
+            finally:
+                index.close()
+        for path in paths:
+            for row in read_rows(path):
+                yield row_to_nutrients(row)
+
+    return write_nutrients_index(output, entries())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the local nutrients index")
+    parser.add_argument("paths", nargs="+", help="CSV or JSON files to import")
+    parser.add_argument("--output", required=True, help="Index file to write")
+    parser.add_argument(
+        "--merge", action="store_true", help="Keep the ingredients already indexed"
+    )
+    args = parser.parse_args()
+    count = import_local_nutrients(args.paths, args.output, args.merge)
+    print(f"Indexed {count} ingredients into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
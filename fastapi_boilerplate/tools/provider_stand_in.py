@@ -0,0 +1,443 @@
+"""Local stand-ins of the provider APIs, with record/replay and fault injection."""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from random import Random
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from httpx import AsyncClient
+
+from ..types import NutrientSource
+from ..utils.canonicalize_ingredient import canonicalize_ingredient
+from ..utils.normalize_query import normalize_query
+from ..utils.token_bucket import TokenBucket
+
+PROVIDERS = [
+    NutrientSource.NUTRITIONIX,
+    NutrientSource.SPOONACULAR,
+    NutrientSource.EDAMAM,
+]
+
+UPSTREAMS = {
+    NutrientSource.NUTRITIONIX: "https://trackapi.nutritionix.com",
+    NutrientSource.SPOONACULAR: "https://api.spoonacular.com",
+    NutrientSource.EDAMAM: "https://api.edamam.com",
+}
+
+LATENCY_PARAMETERS = {"fixed": 1, "uniform": 2, "lognormal": 2}
+
+GRAMS_PER_UNIT = {"g": 1, "kg": 1000, "mg": 0.001, "oz": 28.35, "lb": 453.59}
+
+
+@dataclass(kw_only=True, slots=True)
+class Latency:
+    distribution: str = "fixed"
+    parameters: Tuple[float, ...] = (0,)
+
+    def sample(self, random: Random) -> float:
+        """Returns a latency in seconds."""
+        match self.distribution:
+            case "uniform":
+                milliseconds = random.uniform(*self.parameters)
+            case "lognormal":
+                median, sigma = self.parameters
+                milliseconds = random.lognormvariate(math.log(median), sigma)
+            case _:
+                milliseconds = self.parameters[0]
+        return milliseconds / 1000
+
+
+@dataclass(kw_only=True, slots=True)
+class StandInConfig:
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0
+    throttle_rate: float = 0
+    rate_limit: float | None = None
+
+
+def parse_latency(value: str) -> Latency:
+    distribution, *parameters = value.split(":")
+    if LATENCY_PARAMETERS.get(distribution) != len(parameters):
+        raise ValueError(f"Invalid latency: {value}")
+    return Latency(
+        distribution=distribution,
+        parameters=tuple(float(parameter) for parameter in parameters),
+    )
+
+
+def synthetic_values(food: str, unit: str, quantity: float) -> Dict[str, float]:
+    """Derives plausible nutrients of the amount, the same on every run."""
+    digest = hashlib.blake2b(f"{unit} {food}".encode(), digest_size=8).digest()
+    weight = GRAMS_PER_UNIT.get(unit, 50 + digest[0]) * quantity
+    protein, fat, carbohydrates = digest[1] / 10, digest[2] / 10, digest[3] / 5
+    per_100_grams = {
+        "calories_kcal": 4 * protein + 9 * fat + 4 * carbohydrates,
+        "protein_grams": protein,
+        "total_fat_grams": fat,
+        "saturated_fat_grams": fat * digest[4] / 510,
+        "total_carbohydrates_grams": carbohydrates,
+        "dietary_fiber_grams": carbohydrates * digest[5] / 1020,
+        "sugars_grams": carbohydrates * digest[6] / 510,
+        "cholesterol_mg": digest[7] / 2,
+        "sodium_mg": digest[4] * 4,
+    }
+    return {
+        "weight_grams": round(weight, 2),
+        **{key: round(value * weight / 100, 2) for key, value in per_100_grams.items()},
+    }
+
+
+def synthetic_payload(source: NutrientSource, ingredient: str) -> Any:
+    """Returns the payload of one ingredient as the provider lists it."""
+    canonical_ingredient = canonicalize_ingredient(ingredient)
+    food = canonical_ingredient.food
+    unit = canonical_ingredient.unit or "serving"
+    quantity = canonical_ingredient.quantity or 1
+    match source:
+        case NutrientSource.NUTRITIONIX:
+            # Nutritionix answers whole servings
+            quantity = max(round(quantity), 1)
+            values = synthetic_values(food, unit, quantity)
+            return {
+                "food_name": food,
+                "brand_name": None,
+                "serving_qty": quantity,
+                "serving_unit": unit,
+                "serving_weight_grams": values["weight_grams"],
+                "nf_calories": values["calories_kcal"],
+                "nf_protein": values["protein_grams"],
+                "nf_total_fat": values["total_fat_grams"],
+                "nf_saturated_fat": values["saturated_fat_grams"],
+                "nf_total_carbohydrate": values["total_carbohydrates_grams"],
+                "nf_dietary_fiber": values["dietary_fiber_grams"],
+                "nf_sugars": values["sugars_grams"],
+                "nf_cholesterol": values["cholesterol_mg"],
+                "nf_sodium": values["sodium_mg"],
+            }
+        case NutrientSource.SPOONACULAR:
+            nutrients = [
+                ("Calories", "calories_kcal", "kcal"),
+                ("Protein", "protein_grams", "g"),
+                ("Fat", "total_fat_grams", "g"),
+                ("Saturated Fat", "saturated_fat_grams", "g"),
+                ("Carbohydrates", "total_carbohydrates_grams", "g"),
+                ("Fiber", "dietary_fiber_grams", "g"),
+                ("Sugar", "sugars_grams", "g"),
+                ("Cholesterol", "cholesterol_mg", "mg"),
+                ("Sodium", "sodium_mg", "mg"),
+            ]
+            values = synthetic_values(food, unit, quantity)
+            return {
+                "name": food,
+                "amount": quantity,
+                "unit": unit,
+                "nutrition": {
+                    "nutrients": [
+                        {"name": name, "amount": values[key], "unit": unit}
+                        for name, key, unit in nutrients
+                    ],
+                    "weightPerServing": {
+                        "amount": round(values["weight_grams"] / quantity, 2),
+                        "unit": "g",
+                    },
+                },
+            }
+        case NutrientSource.EDAMAM:
+            nutrients = [
+                ("ENERC_KCAL", "Energy", "calories_kcal", "kcal"),
+                ("PROCNT", "Protein", "protein_grams", "g"),
+                ("FAT", "Total lipid (fat)", "total_fat_grams", "g"),
+                ("FASAT", "Fatty acids, total saturated", "saturated_fat_grams", "g"),
+                (
+                    "CHOCDF",
+                    "Carbohydrate, by difference",
+                    "total_carbohydrates_grams",
+                    "g",
+                ),
+                ("FIBTG", "Fiber, total dietary", "dietary_fiber_grams", "g"),
+                ("SUGAR", "Sugars, total", "sugars_grams", "g"),
+                ("CHOLE", "Cholesterol", "cholesterol_mg", "mg"),
+                ("NA", "Sodium, Na", "sodium_mg", "mg"),
+            ]
+            values = synthetic_values(food, unit, quantity)
+            return {
+                "text": ingredient,
+                "parsed": [
+                    {
+                        "quantity": quantity,
+                        "measure": unit,
+                        "food": food,
+                        "weight": values["weight_grams"],
+                        "nutrients": {
+                            code: {
+                                "label": label,
+                                "quantity": values[key],
+                                "unit": unit,
+                            }
+                            for code, label, key, unit in nutrients
+                        },
+                        "status": "OK",
+                    }
+                ],
+            }
+
+
+class ProviderStandIn:
+    """Answers provider requests from recordings, with injected faults."""
+
+    def __init__(
+        self,
+        *,
+        recordings: Dict[str, Dict[str, Any]],
+        configs: Dict[NutrientSource, StandInConfig],
+        synthesize: bool = True,
+        http_client: AsyncClient | None = None,
+        upstreams: Dict[NutrientSource, str] = UPSTREAMS,
+        random: Random | None = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        self.recordings = recordings
+        self.configs = configs
+        self.synthesize = synthesize
+        self.http_client = http_client
+        self.upstreams = upstreams
+        self.random = random or Random()
+        self.sleep = sleep
+        self.rate_limits = {
+            source: TokenBucket(
+                rate_per_second=config.rate_limit, capacity=config.rate_limit
+            )
+            for source, config in configs.items()
+            if config.rate_limit
+        }
+
+    def fault(self, source: NutrientSource) -> Response | None:
+        config = self.configs[source]
+        rate_limit = self.rate_limits.get(source)
+        if (
+            rate_limit is not None and rate_limit.reserve(max_wait_seconds=0) is None
+        ) or self.random.random() < config.throttle_rate:
+            return JSONResponse(
+                {"message": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+        if self.random.random() < config.error_rate:
+            return JSONResponse({"message": "Service unavailable"}, status_code=503)
+        return None
+
+    async def ingredients(self, source: NutrientSource, request: Request) -> List[str]:
+        match source:
+            case NutrientSource.NUTRITIONIX:
+                query = (await request.json()).get("query", "")
+                parts = query.split(",")
+            case NutrientSource.SPOONACULAR:
+                form = parse_qs((await request.body()).decode())
+                parts = form.get("ingredientList", [""])[0].split("\n")
+            case NutrientSource.EDAMAM:
+                parts = request.query_params.get("ingr", "").split(" AND ")
+        return [ingredient for ingredient in map(normalize_query, parts) if ingredient]
+
+    def items(self, source: NutrientSource, content: Any) -> List[Any]:
+        match source:
+            case NutrientSource.NUTRITIONIX:
+                return content["foods"]
+            case NutrientSource.SPOONACULAR:
+                return content
+            case NutrientSource.EDAMAM:
+                return content["ingredients"]
+
+    def payload(self, source: NutrientSource, ingredient: str) -> Any | None:
+        payload = self.recordings.get(source.value, {}).get(ingredient)
+        if payload is None and self.synthesize:
+            payload = synthetic_payload(source, ingredient)
+        return payload
+
+    def answer(self, source: NutrientSource, ingredients: List[str]) -> Response:
+        payloads = [self.payload(source, ingredient) for ingredient in ingredients]
+        found = [payload for payload in payloads if payload is not None]
+        match source:
+            case NutrientSource.NUTRITIONIX:
+                if not found:
+                    return JSONResponse(
+                        {"message": "We couldn't match any of your foods"},
+                        status_code=404,
+                    )
+                return JSONResponse({"foods": found})
+            case NutrientSource.SPOONACULAR:
+                return JSONResponse(found)
+            case NutrientSource.EDAMAM:
+                return JSONResponse(
+                    {
+                        "ingredients": [
+                            {"text": ingredient, "parsed": []}
+                            if payload is None
+                            else payload
+                            for ingredient, payload in zip(ingredients, payloads)
+                        ]
+                    }
+                )
+
+    def record(
+        self, source: NutrientSource, ingredients: List[str], content: Any
+    ) -> None:
+        items = self.items(source, content)
+        if len(items) != len(ingredients):
+            return
+        recordings = self.recordings.setdefault(source.value, {})
+        for ingredient, item in zip(ingredients, items):
+            recordings[ingredient] = item
+
+    async def forward(
+        self, source: NutrientSource, request: Request, ingredients: List[str]
+    ) -> Response:
+        path = request.url.path.removeprefix(f"/{source.value}")
+        response = await self.http_client.request(
+            request.method,
+            f"{self.upstreams[source]}{path}",
+            params=request.query_params,
+            headers={
+                name: value
+                for name, value in request.headers.items()
+                if name not in ("host", "content-length")
+            },
+            content=await request.body(),
+        )
+        if response.status_code == 200:
+            try:
+                self.record(source, ingredients, response.json())
+            except (ValueError, KeyError, TypeError):
+                pass
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type"),
+        )
+
+    async def execute(self, source: NutrientSource, request: Request) -> Response:
+        await self.sleep(self.configs[source].latency.sample(self.random))
+        fault = self.fault(source)
+        if fault is not None:
+            return fault
+        ingredients = await self.ingredients(source, request)
+        if self.http_client is not None:
+            return await self.forward(source, request, ingredients)
+        return self.answer(source, ingredients)
+
+
+def create_app(
+    stand_in: ProviderStandIn, *, recordings_path: str | None = None
+) -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        if stand_in.http_client is not None:
+            await stand_in.http_client.aclose()
+            if recordings_path:
+                save_recordings(recordings_path, stand_in.recordings)
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post("/nutritionix/v2/natural/nutrients")
+    async def nutritionix(request: Request) -> Response:
+        return await stand_in.execute(NutrientSource.NUTRITIONIX, request)
+
+    @app.post("/spoonacular/recipes/parseIngredients")
+    async def spoonacular(request: Request) -> Response:
+        return await stand_in.execute(NutrientSource.SPOONACULAR, request)
+
+    @app.get("/edamam/api/nutrition-data")
+    async def edamam(request: Request) -> Response:
+        return await stand_in.execute(NutrientSource.EDAMAM, request)
+
+    return app
+
+
+def load_recordings(path: str | None) -> Dict[str, Dict[str, Any]]:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_recordings(path: str, recordings: Dict[str, Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(recordings, file, indent=2, sort_keys=True)
+
+
+def parse_upstream(value: str) -> Tuple[NutrientSource, str]:
+    source, _, url = value.partition("=")
+    return NutrientSource(source), url.rstrip("/")
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve local provider stand-ins")
+    parser.add_argument("recordings", nargs="?", help="JSON file of recordings")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument(
+        "--record", action="store_true", help="Record the real providers' answers"
+    )
+    parser.add_argument(
+        "--upstream",
+        action="append",
+        type=parse_upstream,
+        default=[],
+        help="Real provider to record, as PROVIDER=URL",
+    )
+    parser.add_argument(
+        "--miss-unknown",
+        action="store_true",
+        help="Leave ingredients without a recording unmatched",
+    )
+    parser.add_argument("--seed", type=int, help="Seed of latencies and faults")
+    for prefix in ["", *(f"{source.value}-" for source in PROVIDERS)]:
+        parser.add_argument(f"--{prefix}latency", type=parse_latency)
+        parser.add_argument(f"--{prefix}error-rate", type=float)
+        parser.add_argument(f"--{prefix}throttle-rate", type=float)
+        parser.add_argument(f"--{prefix}rate-limit", type=float)
+    args = vars(parser.parse_args())
+    if args["record"] and not args["recordings"]:
+        parser.error("--record needs a recordings file")
+
+    def option(source: NutrientSource, name: str) -> Any:
+        value = args[f"{source.value}_{name}"]
+        return args[name] if value is None else value
+
+    configs = {
+        source: StandInConfig(
+            latency=option(source, "latency") or Latency(),
+            error_rate=option(source, "error_rate") or 0,
+            throttle_rate=option(source, "throttle_rate") or 0,
+            rate_limit=option(source, "rate_limit"),
+        )
+        for source in PROVIDERS
+    }
+    stand_in = ProviderStandIn(
+        recordings=load_recordings(args["recordings"]),
+        configs=configs,
+        synthesize=not args["miss_unknown"],
+        http_client=AsyncClient(timeout=30) if args["record"] else None,
+        upstreams={**UPSTREAMS, **dict(args["upstream"])},
+        random=Random(args["seed"]),
+    )
+    uvicorn.run(
+        create_app(stand_in, recordings_path=args["recordings"]),
+        host=args["host"],
+        port=args["port"],
+    )
+
+
+if __name__ == "__main__":
+    main()
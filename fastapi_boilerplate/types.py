@@ -1,6 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Protocol
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Protocol, Tuple
+
+from httpx import Response, Timeout
 from pymongo.database import Database
 
 
@@ -12,6 +14,9 @@ class Language(str, Enum):
 
 class Collection(str, Enum):
     FOODS = "foods"
+    NUTRIENTS_CACHE = "nutrients_cache"
+    QUERY_LOG = "query_log"
+    PROVIDER_CALLS = "provider_calls"
 
 
 # Config
@@ -23,17 +28,59 @@ class DatabaseConfig:
     name: str
 
 
+@dataclass(kw_only=True, slots=True)
+class HttpClientConfig:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 5
+    connect_timeout_seconds: float = 5
+    read_timeout_seconds: float = 5
+    pool_timeout_seconds: float = 5
+    http2: bool = False
+
+
+@dataclass(kw_only=True, slots=True)
+class QuotaConfig:
+    rate_per_second: float | None = None
+    burst: int | None = None
+    max_concurrency: int | None = None
+    daily_quota: int = 0
+    max_wait_seconds: float = 0.5
+
+
+@dataclass(kw_only=True, slots=True)
+class HedgeConfig:
+    enabled: bool = False
+    percentile: float = 0.95
+    max_load: float = 0.5
+    min_remaining_quota: float = 0.2
+
+
+@dataclass(kw_only=True, slots=True)
+class ProviderScoreConfig:
+    weight: float = 1
+    cost_per_call: float = 1
+
+
 @dataclass(kw_only=True, slots=True)
 class NutritionixConfig:
     base_url: str
     app_id: str
     app_key: str
+    http_client: HttpClientConfig = field(default_factory=HttpClientConfig)
+    quota: QuotaConfig = field(default_factory=QuotaConfig)
+    score: ProviderScoreConfig = field(default_factory=ProviderScoreConfig)
+    hedge: HedgeConfig = field(default_factory=HedgeConfig)
 
 
 @dataclass(kw_only=True, slots=True)
 class SpoonacularConfig:
     base_url: str
     api_key: str
+    http_client: HttpClientConfig = field(default_factory=HttpClientConfig)
+    quota: QuotaConfig = field(default_factory=QuotaConfig)
+    score: ProviderScoreConfig = field(default_factory=ProviderScoreConfig)
+    hedge: HedgeConfig = field(default_factory=HedgeConfig)
 
 
 @dataclass(kw_only=True, slots=True)
@@ -41,6 +88,87 @@ class EdamamConfig:
     base_url: str
     app_id: str
     app_key: str
+    http_client: HttpClientConfig = field(default_factory=HttpClientConfig)
+    quota: QuotaConfig = field(default_factory=QuotaConfig)
+    score: ProviderScoreConfig = field(default_factory=ProviderScoreConfig)
+    hedge: HedgeConfig = field(default_factory=HedgeConfig)
+
+
+@dataclass(kw_only=True, slots=True)
+class ProviderRankingConfig:
+    pinned_order: List[str] = field(default_factory=list)
+    ewma_alpha: float = 0.2
+    recovery_half_life_seconds: float = 300
+
+
+@dataclass(kw_only=True, slots=True)
+class NutrientsConfig:
+    hedge_delay_seconds: float | None = None
+    batch_max_ingredients: int = 20
+    micro_batch_window_seconds: float | None = None
+    fast_decoding: bool = False
+    fuzzy_match_threshold: float | None = None
+
+
+@dataclass(kw_only=True, slots=True)
+class CacheConfig:
+    memory_max_size: int = 10000
+    memory_ttl_seconds: float = 3600
+    db_ttl_seconds: float = 86400
+    soft_ttl_seconds: float | None = None
+    refresh_concurrency: int = 4
+    refresh_max_pending: int = 1000
+    negative_ttl_seconds: float | None = None
+    negative_max_size: int = 10000
+    negative_false_positive_rate: float = 0.01
+
+
+@dataclass(kw_only=True, slots=True)
+class LocalNutrientsConfig:
+    index_path: str = ""
+    record: bool = False
+    flush_interval_seconds: float = 300
+
+
+@dataclass(kw_only=True, slots=True)
+class WarmUpConfig:
+    queries: int = 0
+    provider_budget: int = 500
+    timeout_seconds: float = 60
+    concurrency: int = 4
+    query_log_max_entries: int = 100000
+    query_log_size_bytes: int = 16 * 1024 * 1024
+    query_log_max_pending: int = 1000
+
+
+@dataclass(kw_only=True, slots=True)
+class CircuitBreakerConfig:
+    window_size: int = 20
+    minimum_calls: int = 10
+    failure_rate_threshold: float = 0.5
+    consecutive_timeouts_threshold: int = 3
+    open_seconds: float = 30
+    half_open_max_calls: int = 2
+
+
+@dataclass(kw_only=True, slots=True)
+class RetryConfig:
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.05
+    max_delay_seconds: float = 1
+    time_budget_seconds: float = 3
+    budget_ratio: float = 0.1
+    budget_capacity: float = 10
+
+
+@dataclass(kw_only=True, slots=True)
+class AdaptiveTimeoutConfig:
+    window_size: int = 200
+    min_samples: int = 20
+    percentile: float = 0.99
+    margin_seconds: float = 0.1
+    floor_seconds: float = 0.25
+    ceiling_seconds: float = 5
 
 
 @dataclass(kw_only=True, slots=True)
@@ -50,6 +178,14 @@ class Config:
     nutritionix: NutritionixConfig
     spoonacular: SpoonacularConfig
     edamam: EdamamConfig
+    nutrients: NutrientsConfig
+    cache: CacheConfig
+    circuit_breaker: CircuitBreakerConfig
+    adaptive_timeout: AdaptiveTimeoutConfig
+    retry: RetryConfig
+    provider_ranking: ProviderRankingConfig
+    local_nutrients: LocalNutrientsConfig
+    warm_up: WarmUpConfig
 
 
 # Logger
@@ -72,6 +208,26 @@ class Logger(Protocol):
         ...
 
 
+# Metrics
+
+
+class Metrics(Protocol):
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        ...
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        ...
+
+    def register_collector(self, collector: Callable[["Metrics"], None]) -> None:
+        ...
+
+    def get(self, name: str, **labels: str) -> float:
+        ...
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        ...
+
+
 # Database
 
 
@@ -90,11 +246,28 @@ class Db(Protocol):
 
 
 class NutrientSource(str, Enum):
+    LOCAL = "local"
     NUTRITIONIX = "nutritionix"
     SPOONACULAR = "spoonacular"
     EDAMAM = "edamam"
 
 
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class SendProviderRequest(Protocol):
+    def is_available(self) -> bool:
+        ...
+
+    async def execute(
+        self, *, send: Callable[[Timeout], Awaitable[Response]]
+    ) -> Response:
+        ...
+
+
 @dataclass(kw_only=True, slots=True)
 class Nutrients:
     name: str
@@ -115,7 +288,39 @@ class Nutrients:
     source: NutrientSource
 
 
+@dataclass(kw_only=True, frozen=True, slots=True)
+class NutrientField:
+    """Where a provider keeps the value and unit of a Nutrients field."""
+
+    target: str
+    path: Tuple[str, ...]
+    unit: str | Tuple[str, ...]
+
+
+@dataclass(kw_only=True, slots=True)
+class BaseNutrients:
+    """Nutrients of an ingredient per gram, and the grams in one unit of it."""
+
+    name: str
+    brand_name: str | None = None
+    unit: str
+    quantity_per_unit: float
+    grams_per_unit: float
+    per_gram: Dict[str, float]
+    source: NutrientSource
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class CanonicalIngredient:
+    quantity: float | None = None
+    unit: str | None = None
+    food: str
+
+
 class FetchNutritionixNutrients(Protocol):
+    def is_available(self) -> bool:
+        ...
+
     def execute(
         self, *, query: str, language: Language | None
     ) -> List[Nutrients] | None:
@@ -123,15 +328,123 @@ class FetchNutritionixNutrients(Protocol):
 
 
 class FetchSpoonacularNutrients(Protocol):
+    def is_available(self) -> bool:
+        ...
+
     def execute(self, *, query: str) -> List[Nutrients] | None:
         ...
 
 
 class FetchEdamamNutrients(Protocol):
+    def is_available(self) -> bool:
+        ...
+
     def execute(self, *, query: str) -> List[Nutrients] | None:
         ...
 
 
+@dataclass(kw_only=True, slots=True)
+class NutrientsResult:
+    nutrients: List[Nutrients]
+    source: NutrientSource
+
+
+@dataclass(kw_only=True, slots=True)
+class IngredientNutrients:
+    index: int
+    ingredient: str
+    nutrients: List[Nutrients]
+    source: NutrientSource | None
+
+
+class NutrientsCache(Protocol):
+    async def get(
+        self,
+        *,
+        source: NutrientSource,
+        query: str,
+        language: Language,
+        refresh: Callable[[], Awaitable[None]] | None = None,
+    ) -> List[Nutrients] | None:
+        ...
+
+    async def set(
+        self,
+        *,
+        source: NutrientSource,
+        query: str,
+        language: Language,
+        nutrients: List[Nutrients],
+    ) -> None:
+        ...
+
+    def get_base(
+        self, *, source: NutrientSource, food: str, unit: str | None, language: Language
+    ) -> BaseNutrients | None:
+        ...
+
+    def set_base(
+        self,
+        *,
+        source: NutrientSource,
+        food: str,
+        unit: str | None,
+        language: Language,
+        base_nutrients: BaseNutrients,
+    ) -> None:
+        ...
+
+
+class LocalNutrients(Protocol):
+    def get(self, *, ingredient: str) -> Nutrients | None:
+        ...
+
+    def record(self, *, ingredient: str, nutrients: Nutrients) -> None:
+        ...
+
+
+class NegativeCache(Protocol):
+    def contains(self, *, query: str, language: Language) -> bool:
+        ...
+
+    def add(self, *, query: str, language: Language) -> None:
+        ...
+
+
+class KnownIngredients(Protocol):
+    def resolve(self, *, ingredient: str) -> str:
+        ...
+
+    def add(self, *, names: List[str]) -> None:
+        ...
+
+
+class QueryLog(Protocol):
+    def record(self, *, query: str, language: Language) -> None:
+        ...
+
+
+class FetchNutrients(Protocol):
+    async def execute(
+        self, *, query: str, language: Language
+    ) -> NutrientsResult | None:
+        ...
+
+
+class StreamNutrients(Protocol):
+    def execute(
+        self, *, query: str, language: Language
+    ) -> AsyncIterator[IngredientNutrients]:
+        ...
+
+
+class FetchNutrientsBatch(Protocol):
+    async def execute(
+        self, *, queries: List[str], language: Language
+    ) -> List[NutrientsResult | None]:
+        ...
+
+
 # Repositories
 
 
@@ -158,3 +471,48 @@ class UpdateFood(Protocol):
 class RemoveFood(Protocol):
     def execute(self) -> None:
         ...
+
+
+class FindCachedNutrients(Protocol):
+    def execute(self, *, key: str) -> dict | None:
+        ...
+
+
+class UpsertCachedNutrients(Protocol):
+    def execute(self, *, key: str, nutrients: List[dict]) -> None:
+        ...
+
+
+class FindKnownIngredientNames(Protocol):
+    def execute(self) -> List[str]:
+        ...
+
+
+class CreateCachedNutrientsIndex(Protocol):
+    def execute(self) -> None:
+        ...
+
+
+class CreateQueryLogCollection(Protocol):
+    def execute(self) -> None:
+        ...
+
+
+class InsertQueryLogEntries(Protocol):
+    def execute(self, *, entries: List[dict]) -> None:
+        ...
+
+
+class FindTopLoggedQueries(Protocol):
+    def execute(self, *, limit: int) -> List[Tuple[str, Language]]:
+        ...
+
+
+class IncrementProviderCalls(Protocol):
+    def execute(self, *, key: str) -> int:
+        ...
+
+
+class CreateProviderCallsIndex(Protocol):
+    def execute(self) -> None:
+        ...
@@ -0,0 +1,48 @@
+import math
+from collections import deque
+from typing import Deque
+
+
+class AdaptiveTimeout:
+    """Request timeout from a percentile of recent latencies, plus a margin."""
+
+    def __init__(
+        self,
+        *,
+        window_size: int,
+        min_samples: int,
+        percentile: float,
+        margin_seconds: float,
+        floor_seconds: float,
+        ceiling_seconds: float,
+    ):
+        self.min_samples = min_samples
+        self.percentile = percentile
+        self.margin_seconds = margin_seconds
+        self.floor_seconds = floor_seconds
+        self.ceiling_seconds = ceiling_seconds
+        self.latencies: Deque[float] = deque(maxlen=window_size)
+
+    def record(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+
+    def record_timeout(self, timeout_seconds: float) -> None:
+        # The real latency is unknown, so assume twice the timeout to let the
+        # timeout grow quickly when the provider slows down.
+        self.record(timeout_seconds * 2)
+
+    def latency(self, percentile: float) -> float | None:
+        if len(self.latencies) < self.min_samples:
+            return None
+        latencies = sorted(self.latencies)
+        rank = max(1, math.ceil(percentile * len(latencies)))
+        return latencies[rank - 1]
+
+    def timeout(self) -> float:
+        latency = self.latency(self.percentile)
+        if latency is None:
+            return self.ceiling_seconds
+        return min(
+            self.ceiling_seconds,
+            max(self.floor_seconds, latency + self.margin_seconds),
+        )
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable
+
+from .provider_calls import current_provider_calls
+
+
+class BackgroundRefresh:
+    """Runs refreshes in background tasks, dropping them beyond `max_pending`."""
+
+    def __init__(self, *, max_concurrency: int, max_pending: int):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.semaphore: asyncio.Semaphore | None = None
+        self.tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.tasks
+
+    def schedule(self, key: Hashable, refresh: Callable[[], Awaitable[None]]) -> bool:
+        """Returns whether the refresh was started."""
+        if key in self.tasks or len(self.tasks) >= self.max_pending:
+            return False
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        task = asyncio.create_task(self.run(refresh))
+        task.add_done_callback(lambda _: self.tasks.pop(key, None))
+        self.tasks[key] = task
+        return True
+
+    async def run(self, refresh: Callable[[], Awaitable[None]]) -> None:
+        # Refreshes serve every caller, not the task that happened to schedule them
+        current_provider_calls.set(None)
+        async with self.semaphore:
+            await refresh()
+
+    async def close(self) -> None:
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,41 @@
+from hashlib import blake2b
+from math import ceil, log
+from typing import Iterator
+
+
+class BloomFilter:
+    """Compact set membership test with no false negatives."""
+
+    def __init__(self, *, capacity: int, false_positive_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(
+            ceil(-self.capacity * log(false_positive_rate) / log(2) ** 2), 8
+        )
+        self.hash_count = max(round(self.size / self.capacity * log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def positions(self, key: str) -> Iterator[int]:
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+    def clear(self) -> None:
+        self.bits = bytearray(len(self.bits))
+        self.count = 0
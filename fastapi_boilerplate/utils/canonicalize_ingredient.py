@@ -0,0 +1,180 @@
+import re
+from fractions import Fraction
+from typing import Dict, List, Tuple
+
+from ..types import CanonicalIngredient
+from .normalize_query import normalize_query
+
+UNITS: Dict[str, str] = {
+    **dict.fromkeys(["tbsp", "tbsps", "tbs", "tablespoon", "tablespoons"], "tbsp"),
+    **dict.fromkeys(["tsp", "tsps", "teaspoon", "teaspoons"], "tsp"),
+    **dict.fromkeys(["cup", "cups"], "cup"),
+    **dict.fromkeys(["g", "gr", "gram", "grams", "gramme", "grammes"], "g"),
+    **dict.fromkeys(["kg", "kgs", "kilogram", "kilograms"], "kg"),
+    **dict.fromkeys(["mg", "milligram", "milligrams"], "mg"),
+    **dict.fromkeys(["oz", "ounce", "ounces"], "oz"),
+    **dict.fromkeys(["lb", "lbs", "pound", "pounds"], "lb"),
+    **dict.fromkeys(
+        ["ml", "milliliter", "milliliters", "millilitre", "millilitres"], "ml"
+    ),
+    **dict.fromkeys(["l", "liter", "liters", "litre", "litres"], "l"),
+    **dict.fromkeys(["pinch", "pinches"], "pinch"),
+    **dict.fromkeys(["slice", "slices"], "slice"),
+    **dict.fromkeys(["piece", "pieces", "pc", "pcs"], "piece"),
+    **dict.fromkeys(["clove", "cloves"], "clove"),
+    **dict.fromkeys(["can", "cans"], "can"),
+    **dict.fromkeys(["serving", "servings"], "serving"),
+}
+
+VULGAR_FRACTIONS: Dict[str, str] = {
+    "½": "1/2",
+    "⅓": "1/3",
+    "⅔": "2/3",
+    "¼": "1/4",
+    "¾": "3/4",
+    "⅛": "1/8",
+}
+
+IRREGULAR_PLURALS: Dict[str, str] = {
+    "leaves": "leaf",
+    "loaves": "loaf",
+    "halves": "half",
+    "knives": "knife",
+    "potatoes": "potato",
+    "tomatoes": "tomato",
+    "mangoes": "mango",
+    "avocadoes": "avocado",
+    "cookies": "cookie",
+    "brownies": "brownie",
+    "smoothies": "smoothie",
+    "veggies": "veggie",
+    "geese": "goose",
+    "mice": "mouse",
+    "quiches": "quiche",
+    "brioches": "brioche",
+    "ganaches": "ganache",
+    "pastiches": "pastiche",
+}
+
+UNCOUNTABLE = {
+    "asparagus",
+    "brussels",
+    "citrus",
+    "couscous",
+    "fries",
+    "grits",
+    "hummus",
+    "molasses",
+    "oats",
+    "swiss",
+}
+
+NUMBER = re.compile(r"^(\d+(\.\d+)?|\d+/\d+|\.\d+)$")
+NUMBER_WITH_WORD = re.compile(r"\b(\d+(?:\.\d+)?)([a-z]+)\b")
+
+
+def singularize(word: str) -> str:
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if len(word) <= 3 or word in UNCOUNTABLE or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def split_unit(match: re.Match) -> str:
+    """Splits "2tbsp" but leaves "7up" and "b12" alone."""
+    if match[2] in UNITS:
+        return f"{match[1]} {match[2]}"
+    return match[0]
+
+
+def fits_float(number: Fraction) -> bool:
+    try:
+        float(number)
+    except OverflowError:
+        return False
+    return True
+
+
+def parse_number(token: str) -> Fraction | None:
+    if not NUMBER.match(token):
+        return None
+    try:
+        number = Fraction(token)
+    except (ZeroDivisionError, ValueError):
+        return None
+    return number if fits_float(number) else None
+
+
+def parse_quantity(tokens: List[str]) -> Tuple[Fraction | None, List[str]]:
+    """Parses a leading quantity such as "2", "1.5", "1/2" or "1 1/2"."""
+    if len(tokens) > 1 and tokens[0] in ("a", "an"):
+        return Fraction(1), tokens[1:]
+    quantity, rest = None, tokens
+    while rest:
+        number = parse_number(rest[0])
+        if number is None:
+            break
+        if quantity is not None:
+            number += quantity
+        if not fits_float(number):
+            return None, tokens
+        quantity = number
+        rest = rest[1:]
+    return quantity, rest
+
+
+def canonicalize_ingredient(ingredient: str) -> CanonicalIngredient:
+    """Parses an English ingredient into quantity, unit and singular food."""
+    for fraction, text in VULGAR_FRACTIONS.items():
+        ingredient = ingredient.replace(fraction, f" {text}")
+    tokens = NUMBER_WITH_WORD.sub(split_unit, ingredient.lower()).split()
+    quantity, rest = parse_quantity(tokens)
+    unit = None
+    if quantity is not None and len(rest) > 1 and rest[0].rstrip(".") in UNITS:
+        unit = UNITS[rest[0].rstrip(".")]
+        rest = rest[2:] if rest[1] == "of" and len(rest) > 2 else rest[1:]
+    if quantity is None and len(rest) > 2 and rest[-1].rstrip(".") in UNITS:
+        quantity = parse_number(rest[-2])
+        if quantity is not None:
+            unit, rest = UNITS[rest[-1].rstrip(".")], rest[:-2]
+    if not rest:
+        return CanonicalIngredient(food=" ".join(tokens))
+    return CanonicalIngredient(
+        quantity=None if quantity is None else float(quantity),
+        unit=unit,
+        food=" ".join(singularize(word) for word in rest),
+    )
+
+
+def format_quantity(quantity: float) -> str:
+    """Writes thirds and the like as "1 1/3" rather than "1.33333"."""
+    text = f"{quantity:.6g}"
+    if len(text.partition(".")[2]) <= 3:
+        return text
+    fraction = Fraction(quantity).limit_denominator(64)
+    if abs(fraction - Fraction(quantity)) > 1e-9:
+        return text
+    whole, rest = divmod(fraction, 1)
+    return " ".join(term for term in [str(whole) if whole else "", str(rest)] if term)
+
+
+def format_ingredient(ingredient: CanonicalIngredient) -> str:
+    """Writes the ingredient in its canonical order: quantity, unit, food."""
+    terms = [
+        None if ingredient.quantity is None else format_quantity(ingredient.quantity),
+        ingredient.unit,
+        ingredient.food,
+    ]
+    return " ".join(term for term in terms if term)
+
+
+def ingredient_key(ingredient: str) -> str:
+    """Canonical form of the ingredient, as looked up by FetchNutrients."""
+    return format_ingredient(canonicalize_ingredient(normalize_query(ingredient)))
@@ -0,0 +1,134 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Dict
+
+from ..types import CircuitState
+
+
+class CircuitBreaker:
+    """Failure-rate and consecutive-timeout circuit breaker."""
+
+    def __init__(
+        self,
+        *,
+        window_size: int,
+        minimum_calls: int,
+        failure_rate_threshold: float,
+        consecutive_timeouts_threshold: int,
+        open_seconds: float,
+        half_open_max_calls: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.consecutive_timeouts_threshold = consecutive_timeouts_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures: Deque[bool] = deque(maxlen=window_size)
+        self.consecutive_timeouts = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+        self.half_open_successes = 0
+        self.generation = 0
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.failures:
+            return 0.0
+        return sum(self.failures) / len(self.failures)
+
+    def current_state(self) -> CircuitState:
+        if (
+            self.state == CircuitState.OPEN
+            and self.clock() - self.opened_at >= self.open_seconds
+        ):
+            self.state = CircuitState.HALF_OPEN
+            self.generation += 1
+            self.half_open_calls = 0
+            self.half_open_successes = 0
+        return self.state
+
+    def is_available(self) -> bool:
+        match self.current_state():
+            case CircuitState.OPEN:
+                return False
+            case CircuitState.HALF_OPEN:
+                return self.half_open_calls < self.half_open_max_calls
+            case _:
+                return True
+
+    def allow_request(self) -> bool:
+        if not self.is_available():
+            return False
+        if self.state == CircuitState.HALF_OPEN:
+            self.half_open_calls += 1
+        return True
+
+    def open(self) -> None:
+        self.state = CircuitState.OPEN
+        self.generation += 1
+        self.opened_at = self.clock()
+
+    def close(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.generation += 1
+        self.failures.clear()
+        self.consecutive_timeouts = 0
+
+    def is_stale(self, generation: int | None) -> bool:
+        return generation is not None and generation != self.generation
+
+    def record_success(self, *, generation: int | None = None) -> None:
+        if self.state == CircuitState.OPEN:
+            return
+        if self.state == CircuitState.HALF_OPEN:
+            if self.is_stale(generation):
+                return
+            self.half_open_successes += 1
+            if self.half_open_successes >= self.half_open_max_calls:
+                self.close()
+            return
+        self.failures.append(False)
+        self.consecutive_timeouts = 0
+
+    def record_failure(
+        self, *, timeout: bool = False, generation: int | None = None
+    ) -> None:
+        if self.state == CircuitState.OPEN:
+            return
+        if self.state == CircuitState.HALF_OPEN:
+            if not self.is_stale(generation):
+                self.open()
+            return
+        self.failures.append(True)
+        self.consecutive_timeouts = self.consecutive_timeouts + 1 if timeout else 0
+        if self.consecutive_timeouts >= self.consecutive_timeouts_threshold or (
+            len(self.failures) >= self.minimum_calls
+            and self.failure_rate >= self.failure_rate_threshold
+        ):
+            self.open()
+
+    def record_ignored(self, *, generation: int | None = None) -> None:
+        """Frees the probe slot of a call that ended without an outcome."""
+        if (
+            self.state == CircuitState.HALF_OPEN
+            and not self.is_stale(generation)
+            and self.half_open_calls > 0
+        ):
+            self.half_open_calls -= 1
+
+    def snapshot(self) -> Dict[str, str | float | int]:
+        state = self.current_state()
+        return {
+            "state": state.value,
+            "failure_rate": round(self.failure_rate, 4),
+            "calls": len(self.failures),
+            "consecutive_timeouts": self.consecutive_timeouts,
+            "open_seconds_remaining": round(
+                max(0.0, self.opened_at + self.open_seconds - self.clock()), 3
+            )
+            if state == CircuitState.OPEN
+            else 0,
+        }
@@ -0,0 +1,24 @@
+from importlib.util import find_spec
+
+from httpx import AsyncClient, Limits
+
+from ..types import HttpClientConfig, Logger
+from .http_timeout import http_timeout
+
+
+def create_http_client(
+    http_client_config: HttpClientConfig, logger: Logger
+) -> AsyncClient:
+    http2 = http_client_config.http2
+    if http2 and find_spec("h2") is None:
+        logger.warning("HTTP/2 requires the httpx[http2] extra, using HTTP/1.1")
+        http2 = False
+    return AsyncClient(
+        http2=http2,
+        limits=Limits(
+            max_connections=http_client_config.max_connections,
+            max_keepalive_connections=http_client_config.max_keepalive_connections,
+            keepalive_expiry=http_client_config.keepalive_expiry_seconds,
+        ),
+        timeout=http_timeout(http_client_config),
+    )
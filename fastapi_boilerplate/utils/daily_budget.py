@@ -0,0 +1,77 @@
+from datetime import date, datetime, timezone
+from functools import partial
+from typing import Callable
+
+from anyio import to_thread
+
+from ..types import IncrementProviderCalls
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class DailyBudget:
+    """Calls left for the UTC day, shared through MongoDB if given; 0 is unlimited."""
+
+    def __init__(
+        self,
+        *,
+        limit: int,
+        name: str = "",
+        increment_provider_calls: IncrementProviderCalls | None = None,
+        today: Callable[[], date] = utc_today,
+    ):
+        self.limit = limit
+        self.name = name
+        self.increment_provider_calls = increment_provider_calls
+        self.today = today
+        self.day = today()
+        self.used = 0
+
+    def roll_over(self) -> None:
+        today = self.today()
+        if today != self.day:
+            self.day = today
+            self.used = 0
+
+    @property
+    def remaining(self) -> int | None:
+        if not self.limit:
+            return None
+        self.roll_over()
+        return max(0, self.limit - self.used)
+
+    @property
+    def remaining_ratio(self) -> float | None:
+        remaining = self.remaining
+        if remaining is None:
+            return None
+        return remaining / self.limit
+
+    def has_budget(self) -> bool:
+        remaining = self.remaining
+        return remaining is None or remaining > 0
+
+    def try_consume(self) -> bool:
+        if not self.has_budget():
+            return False
+        self.used += 1
+        return True
+
+    async def consume(self) -> bool:
+        if not self.limit or self.increment_provider_calls is None:
+            return self.try_consume()
+        if not self.has_budget():
+            return False
+        try:
+            used = await to_thread.run_sync(
+                partial(
+                    self.increment_provider_calls.execute,
+                    key=f"{self.name}:{self.day.isoformat()}",
+                )
+            )
+        except Exception:
+            return self.try_consume()
+        self.used = max(self.used, used)
+        return used <= self.limit
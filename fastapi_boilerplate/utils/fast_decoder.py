@@ -0,0 +1,139 @@
+from collections import namedtuple
+from importlib.util import find_spec
+from types import NoneType, UnionType
+from typing import Any, Callable, List, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+if find_spec("orjson"):
+    from orjson import loads
+else:
+    from json import loads
+
+
+class MalformedPayloadError(ValueError):
+    def __init__(self, problem: str):
+        super().__init__(problem)
+        self.problem = problem
+        self.path: List[str] = []
+
+    def __str__(self) -> str:
+        return f"${''.join(reversed(self.path))} {self.problem}"
+
+
+Decode = Callable[[Any], Any]
+
+
+def decode_str(value: Any) -> str:
+    if value.__class__ is not str:
+        raise MalformedPayloadError("is not a string")
+    return value
+
+
+def decode_float(value: Any) -> float:
+    if value.__class__ is float:
+        return value
+    if value.__class__ is not int:
+        raise MalformedPayloadError("is not a number")
+    return float(value)
+
+
+def decode_int(value: Any) -> int:
+    if value.__class__ is int:
+        return value
+    if value.__class__ is not float:
+        raise MalformedPayloadError("is not a number")
+    if not value.is_integer():
+        raise MalformedPayloadError("is not an integer")
+    return int(value)
+
+
+def list_decoder(decode_item: Decode) -> Decode:
+    def decode(value: Any) -> List[Any]:
+        if value.__class__ is not list:
+            raise MalformedPayloadError("is not a list")
+        try:
+            return [decode_item(item) for item in value]
+        except MalformedPayloadError as e:
+            for i, item in enumerate(value):
+                try:
+                    decode_item(item)
+                except MalformedPayloadError:
+                    e.path.append(f"[{i}]")
+                    break
+            raise
+
+    return decode
+
+
+def optional_decoder(decode_value: Decode) -> Decode:
+    def decode(value: Any) -> Any:
+        if value is None:
+            return None
+        return decode_value(value)
+
+    return decode
+
+
+def model_decoder(model: type[BaseModel]) -> Decode:
+    fields = [
+        (name, compile_decoder(field.annotation), field.is_required(), field.default)
+        for name, field in model.model_fields.items()
+    ]
+    struct = namedtuple(model.__name__, [name for name, *_ in fields])
+    new = tuple.__new__
+
+    def decode(value: Any) -> Any:
+        if value.__class__ is not dict:
+            raise MalformedPayloadError("is not an object")
+        values = []
+        for name, decode_field, required, default in fields:
+            field_value = value.get(name, decode)
+            if field_value is decode:
+                if required:
+                    error = MalformedPayloadError("is missing")
+                    error.path.append(f".{name}")
+                    raise error
+                values.append(default)
+                continue
+            try:
+                values.append(decode_field(field_value))
+            except MalformedPayloadError as e:
+                e.path.append(f".{name}")
+                raise
+        return new(struct, values)
+
+    return decode
+
+
+def compile_decoder(annotation: Any) -> Decode:
+    if annotation is str:
+        return decode_str
+    if annotation is float:
+        return decode_float
+    if annotation is int:
+        return decode_int
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return model_decoder(annotation)
+    origin = get_origin(annotation)
+    if origin is list:
+        return list_decoder(compile_decoder(get_args(annotation)[0]))
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) == 1 and len(get_args(annotation)) == 2:
+            return optional_decoder(compile_decoder(args[0]))
+    raise TypeError(f"Unsupported annotation: {annotation}")
+
+
+def fast_decoder(annotation: Any) -> Callable[[bytes], Any]:
+    """Compiles a decoder of JSON payloads into named tuples, without pydantic."""
+    decode = compile_decoder(annotation)
+
+    def decoder(content: bytes) -> Any:
+        try:
+            data = loads(content)
+        except ValueError as e:
+            raise MalformedPayloadError(f"is not valid JSON: {str(e)}")
+        return decode(data)
+
+    return decoder
@@ -0,0 +1,22 @@
+from typing import Dict
+
+from httpx import AsyncClient
+
+
+def http_pool_stats(http_client: AsyncClient) -> Dict[str, int]:
+    # httpx doesn't expose pool usage, so this reads the httpcore pool behind
+    # the default transport and reports nothing for any other transport.
+    pool = getattr(http_client._transport, "_pool", None)
+    if pool is None:
+        return {}
+    connections = pool.connections
+    idle_connections = sum(1 for connection in connections if connection.is_idle())
+    waiting_requests = sum(
+        1 for request in getattr(pool, "_requests", []) if request.connection is None
+    )
+    return {
+        "connections": len(connections),
+        "idle_connections": idle_connections,
+        "active_connections": len(connections) - idle_connections,
+        "waiting_requests": waiting_requests,
+    }
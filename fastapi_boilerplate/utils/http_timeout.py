@@ -0,0 +1,15 @@
+from httpx import Timeout
+
+from ..types import HttpClientConfig
+
+
+def http_timeout(
+    http_client_config: HttpClientConfig, read_timeout_seconds: float | None = None
+) -> Timeout:
+    read = read_timeout_seconds or http_client_config.read_timeout_seconds
+    return Timeout(
+        connect=http_client_config.connect_timeout_seconds,
+        read=read,
+        write=read,
+        pool=http_client_config.pool_timeout_seconds,
+    )
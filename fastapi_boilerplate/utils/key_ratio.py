@@ -0,0 +1,26 @@
+from typing import Hashable, Set
+
+
+class KeyRatio:
+    """Measures how many distinct raw values map to each distinct key."""
+
+    def __init__(self, *, window_size: int):
+        self.window_size = window_size
+        self.raw_values: Set[Hashable] = set()
+        self.keys: Set[Hashable] = set()
+        self.last_ratio: float | None = None
+
+    def add(self, raw_value: Hashable, key: Hashable) -> None:
+        self.raw_values.add(raw_value)
+        self.keys.add(key)
+        if len(self.raw_values) >= self.window_size:
+            self.last_ratio = len(self.raw_values) / len(self.keys)
+            self.raw_values.clear()
+            self.keys.clear()
+
+    def ratio(self) -> float:
+        if self.last_ratio is not None:
+            return self.last_ratio
+        if not self.keys:
+            return 1.0
+        return len(self.raw_values) / len(self.keys)
@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, List, Tuple, TypeVar
+
+Value = TypeVar("Value")
+
+
+class LruCache(Generic[Value]):
+    """Size-bounded in-memory cache whose entries also expire after a TTL."""
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.entries: OrderedDict[Hashable, Tuple[float, float, Value]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> Value | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        _, expires_at, value = entry
+        if expires_at <= self.clock():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def age(self, key: Hashable) -> float | None:
+        """Returns the seconds since the live entry was stored, if any."""
+        entry = self.entries.get(key)
+        if entry is None or entry[1] <= self.clock():
+            return None
+        return self.clock() - entry[0]
+
+    def keys(self) -> List[Hashable]:
+        """Returns the keys of the live entries, least recently used first."""
+        now = self.clock()
+        return [
+            key for key, (_, expires_at, _) in self.entries.items() if expires_at > now
+        ]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Value,
+        *,
+        ttl_seconds: float | None = None,
+        age_seconds: float = 0,
+    ) -> int:
+        """Stores the value and returns how many entries had to be evicted."""
+        now = self.clock()
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.entries[key] = (now - age_seconds, now + ttl_seconds, value)
+        self.entries.move_to_end(key)
+        evicted = 0
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
@@ -0,0 +1,82 @@
+from typing import Any, Callable, Dict, List, Sequence
+
+from ..types import NutrientField, Nutrients, NutrientSource
+from .micrograms_to_grams import micrograms_to_grams
+from .milligrams_to_grams import milligrams_to_grams
+from .nutrient_to_int import nutrient_to_int
+
+TARGET_UNITS: Dict[str, str] = {
+    "calories_kcal": "kcal",
+    "weight_grams": "g",
+    "protein_grams": "g",
+    "total_fat_grams": "g",
+    "saturated_fat_grams": "g",
+    "total_carbohydrates_grams": "g",
+    "dietary_fiber_grams": "g",
+    "sugars_grams": "g",
+    "cholesterol_mg": "mg",
+    "sodium_mg": "mg",
+}
+
+CONVERSIONS: Dict[str, Dict[str, Callable[[float], float | None]]] = {
+    "kcal": {"kcal": lambda amount: amount},
+    "g": {
+        "µg": micrograms_to_grams,
+        "mg": milligrams_to_grams,
+        "g": lambda amount: amount,
+    },
+    "mg": {"mg": lambda amount: amount},
+}
+
+
+def resolve(item: Any, path: Sequence[str]) -> Any:
+    for key in path:
+        if item is None:
+            return None
+        item = item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+    return item
+
+
+def convert_column(
+    amounts: List[float | None], units: List[str | None], target_unit: str
+) -> List[float | None]:
+    conversions = CONVERSIONS[target_unit]
+    converted = []
+    for amount, unit in zip(amounts, units):
+        conversion = conversions.get(unit) if amount is not None else None
+        converted.append(conversion(amount) if conversion else None)
+    return converted
+
+
+def map_nutrients(
+    *,
+    items: Sequence[Any],
+    fields: Sequence[NutrientField],
+    columns: Dict[str, List[Any]],
+    source: NutrientSource,
+) -> List[Nutrients]:
+    """Maps the items of a provider response to Nutrients column by column."""
+    columns = dict(columns)
+    for field in fields:
+        amounts = [resolve(item, field.path) for item in items]
+        if isinstance(field.unit, str):
+            units = [field.unit] * len(items)
+        else:
+            units = [resolve(item, field.unit) for item in items]
+        columns[field.target] = convert_column(
+            amounts, units, TARGET_UNITS[field.target]
+        )
+    columns["calories_kcal_per_gram"] = [
+        calories / weight if calories and weight else None
+        for calories, weight in zip(
+            columns["calories_kcal"], columns.get("weight_grams", [None] * len(items))
+        )
+    ]
+    for target in [*TARGET_UNITS, "calories_kcal_per_gram"]:
+        if target in columns:
+            columns[target] = [nutrient_to_int(value) for value in columns[target]]
+    targets = list(columns)
+    return [
+        Nutrients(**dict(zip(targets, row)), source=source)
+        for row in zip(*columns.values())
+    ]
@@ -0,0 +1,32 @@
+import re
+from typing import Set
+
+from .canonicalize_ingredient import UNITS, singularize
+
+WORD = re.compile(r"[a-z]+")
+STOP_WORDS = {"a", "an", "and", "in", "of", "or", "the", "with"}
+
+
+def words(text: str) -> Set[str]:
+    return {
+        singularize(word)
+        for word in WORD.findall(text.lower())
+        if word not in STOP_WORDS and word not in UNITS
+    }
+
+
+def matches_ingredient(name: str, ingredient: str) -> bool:
+    """Whether the food a provider named can be the answer for the ingredient."""
+    ingredient_words = words(ingredient)
+    return any(
+        name_word == ingredient_word
+        or (
+            min(len(name_word), len(ingredient_word)) >= 3
+            and (
+                name_word.startswith(ingredient_word)
+                or ingredient_word.startswith(name_word)
+            )
+        )
+        for name_word in words(name)
+        for ingredient_word in ingredient_words
+    )
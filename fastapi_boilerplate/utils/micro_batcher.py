@@ -0,0 +1,66 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, TypeVar
+
+Item = TypeVar("Item", bound=Hashable)
+Value = TypeVar("Value")
+
+
+@dataclass(slots=True)
+class Batch(Generic[Item]):
+    items: List[Item] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+
+
+class MicroBatcher(Generic[Item, Value]):
+    """Resolves the items submitted under a key within a window in one call."""
+
+    def __init__(self, *, window_seconds: float, max_size: int):
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self.batches: Dict[Hashable, Batch[Item]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.batches
+
+    def close(self, key: Hashable, batch: Batch[Item]) -> None:
+        if self.batches.get(key) is batch:
+            del self.batches[key]
+        batch.full.set()
+
+    def forget(self, task: asyncio.Task) -> None:
+        if not task.cancelled():
+            task.exception()
+
+    async def run(
+        self,
+        key: Hashable,
+        batch: Batch[Item],
+        call: Callable[[List[Item]], Awaitable[Dict[Item, Value]]],
+    ) -> Dict[Item, Value]:
+        try:
+            await asyncio.wait_for(batch.full.wait(), timeout=self.window_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self.close(key, batch)
+        return await call(list(batch.items))
+
+    async def execute(
+        self,
+        key: Hashable,
+        item: Item,
+        call: Callable[[List[Item]], Awaitable[Dict[Item, Value]]],
+    ) -> Value:
+        batch = self.batches.get(key)
+        if batch is None:
+            batch = Batch()
+            batch.task = asyncio.create_task(self.run(key, batch, call))
+            batch.task.add_done_callback(self.forget)
+            self.batches[key] = batch
+        if item not in batch.items:
+            batch.items.append(item)
+            if len(batch.items) >= self.max_size:
+                self.close(key, batch)
+        values = await asyncio.shield(batch.task)
+        return values[item]
@@ -0,0 +1,3 @@
+def normalize_query(query: str) -> str:
+    ingredients = (" ".join(part.split()) for part in query.lower().split(","))
+    return ", ".join(ingredient for ingredient in ingredients if ingredient)
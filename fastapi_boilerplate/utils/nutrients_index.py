@@ -0,0 +1,146 @@
+import mmap
+import os
+import struct
+import tempfile
+from typing import Iterable, Iterator, List, Tuple
+
+from ..types import Nutrients, NutrientSource
+
+MAGIC = b"NUTRIDX2"
+HEADER = struct.Struct("<8sI")
+ENTRY = struct.Struct("<IH")
+STRING_FIELDS = ["name", "brand_name", "unit"]
+INT_FIELDS = [
+    "calories_kcal",
+    "weight_grams",
+    "calories_kcal_per_gram",
+    "protein_grams",
+    "total_fat_grams",
+    "saturated_fat_grams",
+    "total_carbohydrates_grams",
+    "dietary_fiber_grams",
+    "sugars_grams",
+    "cholesterol_mg",
+    "sodium_mg",
+]
+RECORD = struct.Struct(
+    "<" + "IH" * (len(STRING_FIELDS) + 1) + "i" + "i" * len(INT_FIELDS)
+)
+NONE_LENGTH = 0xFFFF
+NONE_INT = -1
+
+
+class NutrientsIndexError(Exception):
+    pass
+
+
+def write_nutrients_index(path: str, entries: Iterable[Tuple[str, Nutrients]]) -> int:
+    """Writes the entries to a new index file atomically; later entries win."""
+    by_key = {key.encode(): nutrients for key, nutrients in entries}
+    keys = sorted(by_key)
+    strings = bytearray()
+    string_offset = HEADER.size + len(keys) * (ENTRY.size + RECORD.size)
+
+    def add_string(value: str | None) -> Tuple[int, int]:
+        if value is None:
+            return 0, NONE_LENGTH
+        encoded = value.encode()
+        if len(encoded) >= NONE_LENGTH:
+            raise NutrientsIndexError(f"String too long: {value[:32]}...")
+        offset = string_offset + len(strings)
+        strings.extend(encoded)
+        return offset, len(encoded)
+
+    directory = bytearray()
+    records = bytearray()
+    for key in keys:
+        nutrients = by_key[key]
+        directory.extend(ENTRY.pack(*add_string(key.decode())))
+        values: List[int] = []
+        for field in STRING_FIELDS:
+            values.extend(add_string(getattr(nutrients, field)))
+        values.extend(add_string(nutrients.source.value))
+        values.append(nutrients.quantity)
+        for field in INT_FIELDS:
+            value = getattr(nutrients, field)
+            values.append(NONE_INT if value is None else value)
+        records.extend(RECORD.pack(*values))
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(keys)))
+            file.write(directory)
+            file.write(records)
+            file.write(strings)
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+    return len(keys)
+
+
+class NutrientsIndex:
+    """Memory-mapped, read-only view of an index file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.mm.close()
+            raise NutrientsIndexError(f"{path} is not a nutrients index")
+        self.records_offset = HEADER.size + self.count * ENTRY.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def key(self, position: int) -> bytes:
+        offset, length = ENTRY.unpack_from(self.mm, HEADER.size + position * ENTRY.size)
+        return self.mm[offset : offset + length]
+
+    def string(self, offset: int, length: int) -> str | None:
+        if length == NONE_LENGTH:
+            return None
+        return self.mm[offset : offset + length].decode()
+
+    def record(self, position: int) -> Nutrients:
+        values = RECORD.unpack_from(
+            self.mm, self.records_offset + position * RECORD.size
+        )
+        strings = [
+            self.string(values[i], values[i + 1])
+            for i in range(0, 2 * (len(STRING_FIELDS) + 1), 2)
+        ]
+        quantity, *ints = values[2 * (len(STRING_FIELDS) + 1) :]
+        return Nutrients(
+            **dict(zip(STRING_FIELDS, strings)),
+            quantity=quantity,
+            **{
+                field: None if value == NONE_INT else value
+                for field, value in zip(INT_FIELDS, ints)
+            },
+            source=NutrientSource(strings[-1]),
+        )
+
+    def get(self, key: str) -> Nutrients | None:
+        encoded = key.encode()
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.key(low) == encoded:
+            return self.record(low)
+        return None
+
+    def items(self) -> Iterator[Tuple[str, Nutrients]]:
+        for position in range(self.count):
+            yield self.key(position).decode(), self.record(position)
+
+    def close(self) -> None:
+        self.mm.close()
@@ -0,0 +1,19 @@
+from contextvars import ContextVar
+
+
+class ProviderCalls:
+    """Counts the provider calls of the task that set it and of its child tasks."""
+
+    def __init__(self):
+        self.calls = 0
+
+
+current_provider_calls: ContextVar[ProviderCalls | None] = ContextVar(
+    "current_provider_calls", default=None
+)
+
+
+def count_provider_call() -> None:
+    provider_calls = current_provider_calls.get()
+    if provider_calls is not None:
+        provider_calls.calls += 1
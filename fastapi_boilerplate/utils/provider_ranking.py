@@ -0,0 +1,90 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from ..types import NutrientSource
+
+
+@dataclass(kw_only=True, slots=True)
+class ProviderHealth:
+    success_rate: float = 1.0
+    empty_rate: float = 0.0
+    latency_seconds: float | None = None
+    updated_at: float = 0.0
+
+
+class ProviderRanking:
+    """Orders the providers by a live score of their recent health."""
+
+    def __init__(
+        self,
+        *,
+        pinned_order: List[NutrientSource],
+        weights: Dict[NutrientSource, float],
+        costs_per_call: Dict[NutrientSource, float],
+        ewma_alpha: float,
+        recovery_half_life_seconds: float,
+        min_latency_seconds: float = 0.05,
+        unmeasured_latency_seconds: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.pinned_order = pinned_order
+        self.weights = weights
+        self.costs_per_call = costs_per_call
+        self.ewma_alpha = ewma_alpha
+        self.recovery_half_life_seconds = recovery_half_life_seconds
+        self.min_latency_seconds = min_latency_seconds
+        self.unmeasured_latency_seconds = unmeasured_latency_seconds
+        self.clock = clock
+        self.health: Dict[NutrientSource, ProviderHealth] = {}
+
+    def recovered(self, source: NutrientSource) -> ProviderHealth:
+        health = self.health.get(source)
+        if health is None:
+            return ProviderHealth(updated_at=self.clock())
+        now = self.clock()
+        decay = 0.5 ** ((now - health.updated_at) / self.recovery_half_life_seconds)
+        return ProviderHealth(
+            success_rate=1 - (1 - health.success_rate) * decay,
+            empty_rate=health.empty_rate * decay,
+            latency_seconds=health.latency_seconds,
+            updated_at=now,
+        )
+
+    def record(
+        self, source: NutrientSource, *, seconds: float, failed: bool, empty: bool
+    ) -> None:
+        health = self.recovered(source)
+        alpha = self.ewma_alpha
+        health.success_rate += alpha * ((not failed) - health.success_rate)
+        # Failures often return at once, so only answers measure the latency.
+        if not failed:
+            health.empty_rate += alpha * (empty - health.empty_rate)
+            health.latency_seconds = (
+                seconds
+                if health.latency_seconds is None
+                else health.latency_seconds + alpha * (seconds - health.latency_seconds)
+            )
+        self.health[source] = health
+
+    def score(self, source: NutrientSource) -> float:
+        health = self.recovered(source)
+        latency = health.latency_seconds
+        if latency is None:
+            latency = self.unmeasured_latency_seconds
+        return (
+            self.weights.get(source, 1.0)
+            * health.success_rate
+            * (1 - health.empty_rate)
+            / (
+                max(latency, self.min_latency_seconds)
+                * self.costs_per_call.get(source, 1.0)
+            )
+        )
+
+    def order(self, sources: List[NutrientSource]) -> List[NutrientSource]:
+        if self.pinned_order:
+            pinned = [source for source in self.pinned_order if source in sources]
+            return pinned + [source for source in sources if source not in pinned]
+        scores = {source: self.score(source) for source in sources}
+        return sorted(sources, key=lambda source: -scores[source])
@@ -0,0 +1,87 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from .daily_budget import DailyBudget
+from .token_bucket import TokenBucket
+
+
+class ProviderThrottledError(Exception):
+    def __init__(self, reason: str):
+        super().__init__(f"provider throttled: {reason}")
+        self.reason = reason
+
+
+class ProviderScheduler:
+    """Keeps the calls to a provider within its rate, concurrency and daily limits."""
+
+    def __init__(
+        self,
+        *,
+        token_bucket: TokenBucket | None,
+        daily_budget: DailyBudget,
+        max_concurrency: int | None,
+        max_wait_seconds: float,
+    ):
+        self.token_bucket = token_bucket
+        self.daily_budget = daily_budget
+        self.semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        )
+        self.max_concurrency = max_concurrency
+        self.max_wait_seconds = max_wait_seconds
+        self.active = 0
+
+    def has_budget(self) -> bool:
+        return self.daily_budget.has_budget()
+
+    def remaining_quota(self) -> float | None:
+        """Share of the daily quota left, None without a quota."""
+        return self.daily_budget.remaining_ratio
+
+    def load(self) -> float:
+        """Share of the concurrency limit in use, 0 without a limit."""
+        if self.max_concurrency is None:
+            return 0.0
+        return self.active / self.max_concurrency
+
+    def throttled(self) -> None:
+        """Called when the provider answered 429 despite the scheduler."""
+        if self.token_bucket is not None:
+            self.token_bucket.drain()
+
+    async def acquire(self) -> None:
+        if self.token_bucket is not None:
+            wait_seconds = self.token_bucket.reserve(
+                max_wait_seconds=self.max_wait_seconds
+            )
+            if wait_seconds is None:
+                raise ProviderThrottledError("rate")
+            if wait_seconds:
+                await asyncio.sleep(wait_seconds)
+        if self.semaphore is None:
+            return
+        if self.semaphore.locked():
+            try:
+                await asyncio.wait_for(
+                    self.semaphore.acquire(), timeout=self.max_wait_seconds
+                )
+            except asyncio.TimeoutError:
+                raise ProviderThrottledError("concurrency")
+        else:
+            await self.semaphore.acquire()
+
+    @asynccontextmanager
+    async def schedule(self) -> AsyncIterator[None]:
+        if not self.daily_budget.has_budget():
+            raise ProviderThrottledError("daily_quota")
+        await self.acquire()
+        self.active += 1
+        try:
+            if not await self.daily_budget.consume():
+                raise ProviderThrottledError("daily_quota")
+            yield
+        finally:
+            self.active -= 1
+            if self.semaphore is not None:
+                self.semaphore.release()
@@ -0,0 +1,17 @@
+class RetryBudget:
+    """Token budget that keeps retries to a share of the calls."""
+
+    def __init__(self, *, ratio: float, capacity: float):
+        self.ratio = ratio
+        self.capacity = capacity
+        self.tokens = capacity
+
+    def deposit(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        # Tolerates the rounding of the deposits, e.g. 10 deposits of 0.1
+        if self.tokens < 1 - 1e-9:
+            return False
+        self.tokens -= 1
+        return True
@@ -0,0 +1,42 @@
+import random
+from typing import Callable
+
+from .retry_budget import RetryBudget
+
+
+class RetryPolicy:
+    """Decides whether and when a failed call is tried again."""
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int,
+        base_delay_seconds: float,
+        max_delay_seconds: float,
+        time_budget_seconds: float,
+        retry_budget: RetryBudget,
+        random: Callable[[], float] = random.random,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.time_budget_seconds = time_budget_seconds
+        self.retry_budget = retry_budget
+        self.random = random
+
+    def start(self) -> None:
+        """Called once per call, before its first attempt."""
+        self.retry_budget.deposit()
+
+    def backoff(self, *, attempt: int, elapsed_seconds: float) -> float | None:
+        """Returns the delay before the next attempt, or None to give up."""
+        if attempt >= self.max_attempts:
+            return None
+        delay = self.random() * min(
+            self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)
+        )
+        if elapsed_seconds + delay >= self.time_budget_seconds:
+            return None
+        if not self.retry_budget.try_withdraw():
+            return None
+        return delay
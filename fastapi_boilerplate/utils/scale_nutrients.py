@@ -0,0 +1,58 @@
+from typing import List
+
+from ..types import BaseNutrients, Nutrients
+from .nutrient_to_int import nutrient_to_int
+
+SCALED_FIELDS: List[str] = [
+    "calories_kcal",
+    "protein_grams",
+    "total_fat_grams",
+    "saturated_fat_grams",
+    "total_carbohydrates_grams",
+    "dietary_fiber_grams",
+    "sugars_grams",
+    "cholesterol_mg",
+    "sodium_mg",
+]
+
+
+def to_base_nutrients(nutrients: Nutrients, quantity: float) -> BaseNutrients | None:
+    """Divides an answer into nutrients per gram; None without a weight."""
+    if not nutrients.weight_grams or quantity <= 0:
+        return None
+    grams = nutrients.weight_grams / 100
+    return BaseNutrients(
+        name=nutrients.name,
+        brand_name=nutrients.brand_name,
+        unit=nutrients.unit,
+        quantity_per_unit=nutrients.quantity / quantity,
+        grams_per_unit=grams / quantity,
+        per_gram={
+            field: getattr(nutrients, field) / 100 / grams
+            for field in SCALED_FIELDS
+            if getattr(nutrients, field) is not None
+        },
+        source=nutrients.source,
+    )
+
+
+def scale_nutrients(base_nutrients: BaseNutrients, quantity: float) -> Nutrients:
+    """Computes the nutrients of `quantity` units of the ingredient."""
+    grams = base_nutrients.grams_per_unit * quantity
+    values = {
+        field: nutrient_to_int(amount * grams)
+        for field, amount in base_nutrients.per_gram.items()
+    }
+    return Nutrients(
+        name=base_nutrients.name,
+        brand_name=base_nutrients.brand_name,
+        quantity=round(base_nutrients.quantity_per_unit * quantity),
+        unit=base_nutrients.unit,
+        calories_kcal=values.pop("calories_kcal", None),
+        weight_grams=nutrient_to_int(grams),
+        calories_kcal_per_gram=nutrient_to_int(
+            base_nutrients.per_gram.get("calories_kcal")
+        ),
+        **values,
+        source=base_nutrients.source,
+    )
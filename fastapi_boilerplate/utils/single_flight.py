@@ -0,0 +1,30 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+Value = TypeVar("Value")
+
+
+class SingleFlight(Generic[Value]):
+    """Shares one in-flight call between every caller asking for the same key."""
+
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.calls
+
+    def forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def execute(
+        self, key: Hashable, call: Callable[[], Awaitable[Value]]
+    ) -> Value:
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.create_task(call())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self.forget(key, done))
+        return await asyncio.shield(task)
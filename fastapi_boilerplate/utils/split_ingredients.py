@@ -0,0 +1,10 @@
+from typing import List
+
+from .normalize_query import normalize_query
+
+
+def split_ingredients(query: str) -> List[str]:
+    normalized_query = normalize_query(query)
+    if normalized_query:
+        return normalized_query.split(", ")
+    return []
@@ -0,0 +1,39 @@
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations."""
+
+    def __init__(
+        self,
+        *,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated_at = clock()
+
+    def refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second
+        )
+        self.updated_at = now
+
+    def reserve(self, *, max_wait_seconds: float) -> float | None:
+        """Reserves a token, or returns None if it would take too long."""
+        self.refill()
+        wait_seconds = max(0.0, (1 - self.tokens) / self.rate_per_second)
+        if wait_seconds > max_wait_seconds:
+            return None
+        self.tokens -= 1
+        return wait_seconds
+
+    def drain(self) -> None:
+        self.refill()
+        self.tokens = min(self.tokens, 0.0)
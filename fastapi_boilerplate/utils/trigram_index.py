@@ -0,0 +1,124 @@
+from collections import Counter
+from math import ceil
+from typing import Dict, FrozenSet, List, Tuple
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def trigrams(name: str) -> FrozenSet[str]:
+    padded = f"  {name} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """In-memory fuzzy index of names, matched by trigram Jaccard similarity."""
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.name_trigrams: List[FrozenSet[str]] = []
+        self.counts: Counter[str] = Counter()
+        self.ranks: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self.rebuild_size = 1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self.ids
+
+    def prefix(
+        self, name_trigrams: FrozenSet[str], ranks: Dict[str, int] | None = None
+    ) -> List[str]:
+        ranks = self.ranks if ranks is None else ranks
+        size = len(name_trigrams)
+        ordered = sorted(name_trigrams, key=lambda trigram: ranks.get(trigram, 0))
+        return ordered[: size - ceil(self.threshold * size) + 1]
+
+    def index(
+        self, name_id: int, ranks: Dict[str, int], postings: Dict[str, List[int]]
+    ) -> None:
+        for trigram in self.prefix(self.name_trigrams[name_id], ranks):
+            name_ids = postings.get(trigram)
+            if name_ids is None:
+                postings[trigram] = [name_id]
+            else:
+                name_ids.append(name_id)
+
+    def needs_rebuild(self) -> bool:
+        return len(self.names) >= self.rebuild_size
+
+    def build(
+        self, counts: Counter[str], size: int
+    ) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+        """Ranks and postings of the first `size` names, safe to run in a thread."""
+        ranks = {
+            trigram: rank
+            for rank, (trigram, _) in enumerate(reversed(counts.most_common()))
+        }
+        postings: Dict[str, List[int]] = {}
+        for name_id in range(size):
+            self.index(name_id, ranks, postings)
+        return ranks, postings
+
+    def swap(
+        self, ranks: Dict[str, int], postings: Dict[str, List[int]], size: int
+    ) -> None:
+        for name_id in range(size, len(self.names)):
+            self.index(name_id, ranks, postings)
+        self.ranks = ranks
+        self.postings = postings
+        self.rebuild_size = 2 * len(self.names)
+
+    def rebuild(self) -> None:
+        size = len(self.names)
+        self.swap(*self.build(self.counts, size), size)
+
+    def add(self, name: str, *, rebuild: bool = True) -> bool:
+        """Returns whether the name was added, i.e. not already indexed."""
+        name = normalize_name(name)
+        if not name or name in self.ids:
+            return False
+        name_id = len(self.names)
+        name_trigrams = trigrams(name)
+        self.names.append(name)
+        self.ids[name] = name_id
+        self.name_trigrams.append(name_trigrams)
+        self.counts.update(name_trigrams)
+        if rebuild and self.needs_rebuild():
+            self.rebuild()
+        else:
+            self.index(name_id, self.ranks, self.postings)
+        return True
+
+    def match(self, query: str) -> Tuple[str, float] | None:
+        """Returns the most similar name and its similarity, if above the threshold."""
+        query = normalize_name(query)
+        if query in self.ids:
+            return query, 1.0
+        if not query:
+            return None
+        query_trigrams = trigrams(query)
+        size = len(query_trigrams)
+        min_size, max_size = self.threshold * size, size / self.threshold
+        best: Tuple[str, float] | None = None
+        seen = set()
+        for trigram in self.prefix(query_trigrams):
+            for name_id in self.postings.get(trigram, ()):
+                if name_id in seen:
+                    continue
+                seen.add(name_id)
+                name_trigrams = self.name_trigrams[name_id]
+                if not min_size <= len(name_trigrams) <= max_size:
+                    continue
+                shared = len(query_trigrams & name_trigrams)
+                similarity = shared / (size + len(name_trigrams) - shared)
+                if similarity >= self.threshold and (
+                    best is None or similarity > best[1]
+                ):
+                    best = self.names[name_id], similarity
+        return best
@@ -1,15 +1,33 @@
+import json
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from httpx import AsyncClient, Response
+from httpx import AsyncClient, Response, Timeout
 
+from fastapi_boilerplate.metrics import Metrics
 from fastapi_boilerplate.services.fetch_edamam_nutrients import FetchEdamamNutrients
-from fastapi_boilerplate.types import Config, Logger, Nutrients, NutrientSource
+from fastapi_boilerplate.services.send_provider_request import SendProviderRequest
+from fastapi_boilerplate.types import (
+    Config,
+    HedgeConfig,
+    HttpClientConfig,
+    Logger,
+    Nutrients,
+    NutrientSource,
+)
+from fastapi_boilerplate.utils.adaptive_timeout import AdaptiveTimeout
+from fastapi_boilerplate.utils.circuit_breaker import CircuitBreaker
+from fastapi_boilerplate.utils.daily_budget import DailyBudget
+from fastapi_boilerplate.utils.provider_scheduler import ProviderScheduler
+from fastapi_boilerplate.utils.retry_budget import RetryBudget
+from fastapi_boilerplate.utils.retry_policy import RetryPolicy
+from fastapi_boilerplate.utils.token_bucket import TokenBucket
 
 
 @pytest.fixture
 def config():
     config = MagicMock(spec_set=Config)
+    config.nutrients.fast_decoding = False
     config.edamam.base_url = "https://api.edamam.com"
     config.edamam.app_id = "test_app_id"
     config.edamam.app_key = "test_app_key"
@@ -107,8 +125,52 @@ def http_client():
 
 
 @pytest.fixture
-def fetch_edamam_nutrients(config, logger, http_client):
-    fetch_edamam_nutrients = FetchEdamamNutrients(config, logger, http_client)
+def send_provider_request(config, logger):
+    send_provider_request = SendProviderRequest(
+        config,
+        logger,
+        Metrics(),
+        NutrientSource.EDAMAM,
+        HttpClientConfig(),
+        HedgeConfig(),
+        CircuitBreaker(
+            window_size=10,
+            minimum_calls=5,
+            failure_rate_threshold=0.5,
+            consecutive_timeouts_threshold=3,
+            open_seconds=30,
+            half_open_max_calls=1,
+        ),
+        AdaptiveTimeout(
+            window_size=10,
+            min_samples=5,
+            percentile=0.99,
+            margin_seconds=0.1,
+            floor_seconds=0.25,
+            ceiling_seconds=5,
+        ),
+        ProviderScheduler(
+            token_bucket=TokenBucket(rate_per_second=10, capacity=10),
+            daily_budget=DailyBudget(limit=0),
+            max_concurrency=10,
+            max_wait_seconds=0.5,
+        ),
+        RetryPolicy(
+            max_attempts=1,
+            base_delay_seconds=0,
+            max_delay_seconds=0,
+            time_budget_seconds=0,
+            retry_budget=RetryBudget(ratio=0, capacity=0),
+        ),
+    )
+    return send_provider_request
+
+
+@pytest.fixture
+def fetch_edamam_nutrients(config, logger, http_client, send_provider_request):
+    fetch_edamam_nutrients = FetchEdamamNutrients(
+        config, logger, http_client, send_provider_request
+    )
     return fetch_edamam_nutrients
 
 
@@ -154,7 +216,7 @@ async def test_execute(logger, http_client, fetch_edamam_nutrients):
             "app_key": "test_app_key",
             "nutrition-type": "cooking",
         },
-        timeout=5,
+        timeout=Timeout(5),
     )
     http_client.get.return_value.raise_for_status.assert_called_once()
 
@@ -282,6 +344,33 @@ async def test_execute_with_empty_calories_response(
     logger.error.assert_called_once()
 
 
+@pytest.mark.anyio
+async def test_execute_with_fast_decoding(
+    config, logger, http_client, fetch_edamam_nutrients
+):
+    http_client_response = http_client.get.return_value
+    http_client_response.content = json.dumps(
+        http_client_response.json.return_value
+    ).encode()
+    expected = await fetch_edamam_nutrients.execute(query="test_query")
+    config.nutrients.fast_decoding = True
+    result = await fetch_edamam_nutrients.execute(query="test_query")
+    assert result is not None
+    assert result == expected
+    logger.error.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_with_fast_decoding_and_malformed_response(
+    config, logger, http_client, fetch_edamam_nutrients
+):
+    config.nutrients.fast_decoding = True
+    http_client.get.return_value.content = b'{"ingredients": [{"parsed": {}}]}'
+    result = await fetch_edamam_nutrients.execute(query="test_query")
+    assert result is None
+    logger.error.assert_called_once()
+
+
 @pytest.mark.anyio
 async def test_execute_with_exception(logger, http_client, fetch_edamam_nutrients):
     http_client.get.side_effect = Exception("test_error")
@@ -0,0 +1,869 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.fetch_nutrients import FetchNutrients
+from fastapi_boilerplate.services.local_nutrients import (
+    LocalNutrients as LocalNutrientsService,
+)
+from fastapi_boilerplate.tools.import_local_nutrients import import_local_nutrients
+from fastapi_boilerplate.types import (
+    BaseNutrients,
+    Config,
+    KnownIngredients,
+    Language,
+    LocalNutrients,
+    Logger,
+    NegativeCache,
+    Nutrients,
+    NutrientsCache,
+    NutrientSource,
+    NutrientsResult,
+    QueryLog,
+)
+from fastapi_boilerplate.utils.key_ratio import KeyRatio
+from fastapi_boilerplate.utils.micro_batcher import MicroBatcher
+from fastapi_boilerplate.utils.provider_calls import (
+    ProviderCalls,
+    current_provider_calls,
+)
+from fastapi_boilerplate.utils.provider_ranking import ProviderRanking
+from fastapi_boilerplate.utils.single_flight import SingleFlight
+
+
+def nutrients(source: NutrientSource):
+    return [
+        Nutrients(
+            name="food",
+            quantity=1,
+            unit="unit",
+            calories_kcal=100,
+            source=source,
+        )
+    ]
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    config.nutrients.hedge_delay_seconds = None
+    config.nutrients.micro_batch_window_seconds = None
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def fetch_nutritionix_nutrients():
+    fetch_nutritionix_nutrients = AsyncMock()
+    fetch_nutritionix_nutrients.is_available = MagicMock(return_value=True)
+    fetch_nutritionix_nutrients.execute.return_value = nutrients(
+        NutrientSource.NUTRITIONIX
+    )
+    return fetch_nutritionix_nutrients
+
+
+@pytest.fixture
+def fetch_spoonacular_nutrients():
+    fetch_spoonacular_nutrients = AsyncMock()
+    fetch_spoonacular_nutrients.is_available = MagicMock(return_value=True)
+    fetch_spoonacular_nutrients.execute.return_value = nutrients(
+        NutrientSource.SPOONACULAR
+    )
+    return fetch_spoonacular_nutrients
+
+
+@pytest.fixture
+def fetch_edamam_nutrients():
+    fetch_edamam_nutrients = AsyncMock()
+    fetch_edamam_nutrients.is_available = MagicMock(return_value=True)
+    fetch_edamam_nutrients.execute.return_value = nutrients(NutrientSource.EDAMAM)
+    return fetch_edamam_nutrients
+
+
+@pytest.fixture
+def nutrients_cache():
+    nutrients_cache = AsyncMock(spec_set=NutrientsCache)
+    nutrients_cache.get.return_value = None
+    nutrients_cache.get_base.return_value = None
+    return nutrients_cache
+
+
+@pytest.fixture
+def local_nutrients():
+    local_nutrients = MagicMock(spec_set=LocalNutrients)
+    local_nutrients.get.return_value = None
+    return local_nutrients
+
+
+@pytest.fixture
+def known_ingredients():
+    known_ingredients = MagicMock(spec_set=KnownIngredients)
+    known_ingredients.resolve.side_effect = lambda *, ingredient: ingredient
+    return known_ingredients
+
+
+@pytest.fixture
+def query_log():
+    query_log = MagicMock(spec_set=QueryLog)
+    return query_log
+
+
+@pytest.fixture
+def negative_cache():
+    negative_cache = MagicMock(spec_set=NegativeCache)
+    negative_cache.contains.return_value = False
+    return negative_cache
+
+
+@pytest.fixture
+def provider_ranking():
+    provider_ranking = ProviderRanking(
+        pinned_order=[
+            NutrientSource.NUTRITIONIX,
+            NutrientSource.SPOONACULAR,
+            NutrientSource.EDAMAM,
+        ],
+        weights={},
+        costs_per_call={},
+        ewma_alpha=0.5,
+        recovery_half_life_seconds=300,
+    )
+    return provider_ranking
+
+
+@pytest.fixture
+def micro_batcher():
+    micro_batcher = MicroBatcher(window_seconds=0.01, max_size=3)
+    return micro_batcher
+
+
+@pytest.fixture
+def fetch_nutrients(
+    config,
+    logger,
+    metrics,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    nutrients_cache,
+    local_nutrients,
+    known_ingredients,
+    query_log,
+    negative_cache,
+    provider_ranking,
+    micro_batcher,
+):
+    fetch_nutrients = FetchNutrients(
+        config,
+        logger,
+        metrics,
+        fetch_nutritionix_nutrients,
+        fetch_spoonacular_nutrients,
+        fetch_edamam_nutrients,
+        nutrients_cache,
+        local_nutrients,
+        known_ingredients,
+        query_log,
+        negative_cache,
+        SingleFlight(),
+        KeyRatio(window_size=10000),
+        provider_ranking,
+        micro_batcher,
+    )
+    return fetch_nutrients
+
+
+def slow(result, delay: float, cancelled: list | None = None):
+    async def execute(**kwargs):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(True)
+            raise
+        return result
+
+    return execute
+
+
+@pytest.mark.anyio
+async def test_execute(
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result == NutrientsResult(
+        nutrients=nutrients(NutrientSource.NUTRITIONIX),
+        source=NutrientSource.NUTRITIONIX,
+    )
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="test_query", language=Language.EN_US
+    )
+    fetch_spoonacular_nutrients.execute.assert_not_called()
+    fetch_edamam_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_falls_back_in_order(
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    fetch_nutritionix_nutrients.execute.return_value = None
+    fetch_spoonacular_nutrients.execute.return_value = []
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.EDAMAM
+    fetch_spoonacular_nutrients.execute.assert_called_once_with(query="test_query")
+    fetch_edamam_nutrients.execute.assert_called_once_with(query="test_query")
+
+
+@pytest.mark.anyio
+async def test_execute_without_nutrients(
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    fetch_nutritionix_nutrients.execute.return_value = None
+    fetch_spoonacular_nutrients.execute.return_value = None
+    fetch_edamam_nutrients.execute.return_value = []
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result is None
+
+
+@pytest.mark.anyio
+async def test_execute_without_nutrients_remembers_empty_answers(
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    negative_cache,
+    fetch_nutrients,
+):
+    fetch_nutritionix_nutrients.execute.return_value = []
+    fetch_spoonacular_nutrients.execute.return_value = []
+    fetch_edamam_nutrients.execute.return_value = None
+    await fetch_nutrients.execute(query="test_query")
+    negative_cache.add.assert_not_called()
+    fetch_edamam_nutrients.execute.return_value = []
+    await fetch_nutrients.execute(query="test_query")
+    negative_cache.add.assert_called_once_with(
+        query="test_query", language=Language.EN_US
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_skips_unresolvable_queries(
+    metrics, fetch_nutritionix_nutrients, query_log, negative_cache, fetch_nutrients
+):
+    negative_cache.contains.return_value = True
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result is None
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+    query_log.record.assert_not_called()
+    assert metrics.get("nutrients_unresolvable_lookups") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_orders_providers_by_health(
+    fetch_nutritionix_nutrients, provider_ranking, fetch_nutrients
+):
+    provider_ranking.pinned_order = []
+    fetch_nutritionix_nutrients.execute.return_value = None
+    result = await fetch_nutrients.execute(query="apple")
+    assert result.source == NutrientSource.SPOONACULAR
+    assert fetch_nutrients.ordered_sources()[-1] == NutrientSource.NUTRITIONIX
+    fetch_nutritionix_nutrients.execute.reset_mock()
+    result = await fetch_nutrients.execute(query="milk")
+    assert result.source == NutrientSource.SPOONACULAR
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_with_fan_out_keeps_priority(
+    config,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    config.nutrients.hedge_delay_seconds = 0
+    fetch_nutritionix_nutrients.execute.side_effect = slow(
+        nutrients(NutrientSource.NUTRITIONIX), 0.05
+    )
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.NUTRITIONIX
+    fetch_spoonacular_nutrients.execute.assert_called_once()
+    fetch_edamam_nutrients.execute.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_execute_with_fan_out_cancels_pending_calls(
+    config,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    config.nutrients.hedge_delay_seconds = 0
+    cancelled = []
+    fetch_nutritionix_nutrients.execute.return_value = None
+    fetch_edamam_nutrients.execute.side_effect = slow(
+        nutrients(NutrientSource.EDAMAM), 10, cancelled
+    )
+    result = await fetch_nutrients.execute(query="test_query")
+    await asyncio.sleep(0)
+    assert result.source == NutrientSource.SPOONACULAR
+    assert cancelled == [True]
+
+
+@pytest.mark.anyio
+async def test_execute_with_hedge_delay(
+    config,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    config.nutrients.hedge_delay_seconds = 0.01
+    fetch_nutritionix_nutrients.execute.side_effect = slow(None, 0.2)
+    fetch_spoonacular_nutrients.execute.side_effect = slow([], 0.1)
+    result = await asyncio.wait_for(
+        fetch_nutrients.execute(query="test_query"), timeout=0.25
+    )
+    assert result.source == NutrientSource.EDAMAM
+
+
+@pytest.mark.anyio
+async def test_execute_with_hedge_delay_stops_hedging_once_answered(
+    config,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    config.nutrients.hedge_delay_seconds = 0.01
+    fetch_nutritionix_nutrients.execute.side_effect = slow(
+        nutrients(NutrientSource.NUTRITIONIX), 0.1
+    )
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.NUTRITIONIX
+    fetch_spoonacular_nutrients.execute.assert_called_once()
+    fetch_edamam_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_with_hedge_delay_waits_for_fast_provider(
+    config,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    config.nutrients.hedge_delay_seconds = 1
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.NUTRITIONIX
+    fetch_spoonacular_nutrients.execute.assert_not_called()
+    fetch_edamam_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_from_cache(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    nutrients_cache.get.return_value = nutrients(NutrientSource.NUTRITIONIX)
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.NUTRITIONIX
+    nutrients_cache.get.assert_called_once()
+    kwargs = nutrients_cache.get.call_args.kwargs
+    assert (kwargs["source"], kwargs["query"], kwargs["language"]) == (
+        NutrientSource.NUTRITIONIX,
+        "test_query",
+        Language.EN_US,
+    )
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+    nutrients_cache.set.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_caches_provider_nutrients(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    fetch_nutritionix_nutrients.execute.return_value = []
+    await fetch_nutrients.execute(query="test_query")
+    nutrients_cache.set.assert_called_once_with(
+        source=NutrientSource.SPOONACULAR,
+        query="test_query",
+        language=Language.EN_US,
+        nutrients=nutrients(NutrientSource.SPOONACULAR),
+    )
+
+
+def named_nutrients(*names: str):
+    return [
+        Nutrients(
+            name=name,
+            quantity=1,
+            unit="unit",
+            calories_kcal=100,
+            source=NutrientSource.NUTRITIONIX,
+        )
+        for name in names
+    ]
+
+
+@pytest.mark.anyio
+async def test_execute_only_fetches_missing_ingredients(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    cached = {"banana": named_nutrients("banana")}
+    nutrients_cache.get.side_effect = lambda **kwargs: cached.get(kwargs["query"])
+    fetch_nutritionix_nutrients.execute.return_value = named_nutrients("apple", "milk")
+    result = await fetch_nutrients.execute(query="Apple, banana,  milk")
+    assert [item.name for item in result.nutrients] == ["apple", "banana", "milk"]
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="apple, milk", language=Language.EN_US
+    )
+    assert nutrients_cache.set.call_count == 2
+    nutrients_cache.set.assert_any_call(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        nutrients=named_nutrients("apple"),
+    )
+    nutrients_cache.set.assert_any_call(
+        source=NutrientSource.NUTRITIONIX,
+        query="milk",
+        language=Language.EN_US,
+        nutrients=named_nutrients("milk"),
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_from_cached_ingredients(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    cached = {
+        "apple": named_nutrients("apple"),
+        "banana": named_nutrients("banana"),
+    }
+    nutrients_cache.get.side_effect = lambda **kwargs: cached.get(kwargs["query"])
+    result = await fetch_nutrients.execute(query="banana, apple, banana")
+    assert [item.name for item in result.nutrients] == ["banana", "apple", "banana"]
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_keeps_unaligned_answers_together(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    cached = {"banana": named_nutrients("banana")}
+    nutrients_cache.get.side_effect = lambda **kwargs: cached.get(kwargs["query"])
+    fetch_nutritionix_nutrients.execute.return_value = named_nutrients(
+        "toast", "butter", "milk"
+    )
+    result = await fetch_nutrients.execute(query="toast with butter, banana, milk")
+    assert [item.name for item in result.nutrients] == [
+        "toast",
+        "butter",
+        "milk",
+        "banana",
+    ]
+    nutrients_cache.set.assert_called_once_with(
+        source=NutrientSource.NUTRITIONIX,
+        query="toast with butter, milk",
+        language=Language.EN_US,
+        nutrients=named_nutrients("toast", "butter", "milk"),
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_keeps_mismatched_answers_together(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    fetch_nutritionix_nutrients.execute.return_value = named_nutrients(
+        "macaroni", "cheese"
+    )
+    result = await fetch_nutrients.execute(query="mac and cheese, xyzgarbage")
+    assert [item.name for item in result.nutrients] == ["macaroni", "cheese"]
+    nutrients_cache.set.assert_called_once_with(
+        source=NutrientSource.NUTRITIONIX,
+        query="mac and cheese, xyzgarbage",
+        language=Language.EN_US,
+        nutrients=named_nutrients("macaroni", "cheese"),
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_with_failed_missing_ingredients(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    cached = {"banana": named_nutrients("banana")}
+    nutrients_cache.get.side_effect = lambda **kwargs: cached.get(kwargs["query"])
+    fetch_nutritionix_nutrients.execute.return_value = None
+    result = await fetch_nutrients.execute(query="apple, banana")
+    assert result.source == NutrientSource.SPOONACULAR
+
+
+@pytest.mark.anyio
+async def test_execute_coalesces_identical_lookups(
+    metrics, fetch_nutritionix_nutrients, fetch_nutrients
+):
+    fetch_nutritionix_nutrients.execute.side_effect = slow(
+        nutrients(NutrientSource.NUTRITIONIX), 0.01
+    )
+    results = await asyncio.gather(
+        fetch_nutrients.execute(query="Apple"),
+        fetch_nutrients.execute(query="apple "),
+        fetch_nutrients.execute(query="apple", language=Language.PT_BR),
+    )
+    assert [result.source for result in results] == [NutrientSource.NUTRITIONIX] * 3
+    assert fetch_nutritionix_nutrients.execute.call_count == 2
+    assert metrics.get("nutrients_lookups") == 3
+    assert metrics.get("nutrients_coalesced_lookups") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_micro_batches_single_ingredients(
+    config, metrics, fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    config.nutrients.micro_batch_window_seconds = 0.01
+
+    async def execute(*, query: str, **kwargs):
+        return named_nutrients(*query.split(", "))
+
+    fetch_nutritionix_nutrients.execute.side_effect = execute
+    results = await asyncio.gather(
+        fetch_nutrients.execute(query="apple"),
+        fetch_nutrients.execute(query="banana"),
+    )
+    assert [[item.name for item in result.nutrients] for result in results] == [
+        ["apple"],
+        ["banana"],
+    ]
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="apple, banana", language=Language.EN_US
+    )
+    assert nutrients_cache.set.call_count == 2
+    assert (
+        metrics.get("nutrients_micro_batched_ingredients", provider="nutritionix") == 2
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_micro_batches_fall_back_per_ingredient(
+    config, metrics, fetch_nutritionix_nutrients, fetch_nutrients
+):
+    config.nutrients.micro_batch_window_seconds = 0.01
+
+    async def execute(*, query: str, **kwargs):
+        if ", " in query:
+            return named_nutrients("apple and banana")
+        return named_nutrients(query)
+
+    fetch_nutritionix_nutrients.execute.side_effect = execute
+    results = await asyncio.gather(
+        fetch_nutrients.execute(query="apple"),
+        fetch_nutrients.execute(query="banana"),
+    )
+    assert [[item.name for item in result.nutrients] for result in results] == [
+        ["apple"],
+        ["banana"],
+    ]
+    assert fetch_nutritionix_nutrients.execute.call_count == 3
+    assert metrics.get("nutrients_micro_batch_fallbacks", provider="nutritionix") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_micro_batches_fall_back_on_mismatched_items(
+    config, metrics, fetch_nutritionix_nutrients, fetch_nutrients
+):
+    config.nutrients.micro_batch_window_seconds = 0.01
+
+    async def execute(*, query: str, **kwargs):
+        return named_nutrients(*reversed(query.split(", ")))
+
+    fetch_nutritionix_nutrients.execute.side_effect = execute
+    results = await asyncio.gather(
+        fetch_nutrients.execute(query="apple"),
+        fetch_nutrients.execute(query="banana"),
+    )
+    assert [[item.name for item in result.nutrients] for result in results] == [
+        ["apple"],
+        ["banana"],
+    ]
+    assert fetch_nutritionix_nutrients.execute.call_count == 3
+    assert metrics.get("nutrients_micro_batch_fallbacks", provider="nutritionix") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_does_not_micro_batch_warm_up_lookups(
+    config, fetch_nutritionix_nutrients, fetch_nutrients
+):
+    config.nutrients.micro_batch_window_seconds = 0.01
+
+    async def execute(*, query: str, **kwargs):
+        return named_nutrients(*query.split(", "))
+
+    fetch_nutritionix_nutrients.execute.side_effect = execute
+    provider_calls = ProviderCalls()
+    token = current_provider_calls.set(provider_calls)
+    try:
+        await asyncio.gather(
+            fetch_nutrients.execute(query="apple"),
+            fetch_nutrients.execute(query="banana"),
+        )
+    finally:
+        current_provider_calls.reset(token)
+    assert sorted(
+        call.kwargs["query"]
+        for call in fetch_nutritionix_nutrients.execute.call_args_list
+    ) == ["apple", "banana"]
+
+
+@pytest.mark.anyio
+async def test_execute_does_not_micro_batch_edamam(
+    config,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients,
+):
+    config.nutrients.micro_batch_window_seconds = 0.01
+    fetch_nutritionix_nutrients.is_available.return_value = False
+    fetch_spoonacular_nutrients.is_available.return_value = False
+
+    async def execute(*, query: str, **kwargs):
+        return named_nutrients(query)
+
+    fetch_edamam_nutrients.execute.side_effect = execute
+    await asyncio.gather(
+        fetch_nutrients.execute(query="apple"),
+        fetch_nutrients.execute(query="banana"),
+    )
+    assert sorted(
+        call.kwargs["query"] for call in fetch_edamam_nutrients.execute.call_args_list
+    ) == ["apple", "banana"]
+
+
+@pytest.mark.anyio
+async def test_execute_skips_unavailable_providers(
+    metrics,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_nutrients,
+):
+    fetch_nutritionix_nutrients.is_available.return_value = False
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.SPOONACULAR
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+    assert (
+        metrics.get("nutrients_skipped_providers", provider=NutrientSource.NUTRITIONIX)
+        == 1
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_serves_cache_of_unavailable_providers(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    fetch_nutritionix_nutrients.is_available.return_value = False
+    nutrients_cache.get.return_value = nutrients(NutrientSource.NUTRITIONIX)
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.NUTRITIONIX
+
+
+@pytest.mark.anyio
+async def test_execute_serves_local_nutrients(
+    metrics, fetch_nutritionix_nutrients, local_nutrients, fetch_nutrients
+):
+    local_nutrients.get.side_effect = lambda *, ingredient: Nutrients(
+        name=ingredient,
+        quantity=1,
+        unit="unit",
+        calories_kcal=100,
+        source=NutrientSource.LOCAL,
+    )
+    result = await fetch_nutrients.execute(query="apple, milk")
+    assert result.source == NutrientSource.LOCAL
+    assert [item.name for item in result.nutrients] == ["apple", "milk"]
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+    assert metrics.get("nutrients_local_hits") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_serves_imported_local_nutrients(
+    tmp_path, config, logger, metrics, fetch_nutritionix_nutrients, fetch_nutrients
+):
+    csv_path = tmp_path / "foods.csv"
+    csv_path.write_text(
+        "ingredient,name,calories_kcal\n2 Tablespoons Sugars,sugar,97\n"
+    )
+    config.local_nutrients.index_path = str(tmp_path / "nutrients.idx")
+    import_local_nutrients([str(csv_path)], config.local_nutrients.index_path, False)
+    fetch_nutrients.local_nutrients = LocalNutrientsService(config, logger, metrics)
+    fetch_nutrients.local_nutrients.load()
+    result = await fetch_nutrients.execute(query="sugar 2 tbsp")
+    assert result.source == NutrientSource.LOCAL
+    assert [item.name for item in result.nutrients] == ["sugar"]
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_records_provider_answers_locally(
+    metrics, local_nutrients, fetch_nutrients
+):
+    result = await fetch_nutrients.execute(query="test_query")
+    assert result.source == NutrientSource.NUTRITIONIX
+    local_nutrients.record.assert_called_once_with(
+        ingredient="test_query", nutrients=nutrients(NutrientSource.NUTRITIONIX)[0]
+    )
+    assert metrics.get("nutrients_local_misses") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_skips_local_nutrients_for_other_languages(
+    local_nutrients, fetch_nutrients
+):
+    await fetch_nutrients.execute(query="test_query", language=Language.PT_BR)
+    local_nutrients.get.assert_not_called()
+    local_nutrients.record.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_logs_canonical_queries(
+    local_nutrients, query_log, fetch_nutrients
+):
+    await fetch_nutrients.execute(query="sugar 2 tbsp")
+    query_log.record.assert_called_once_with(
+        query="2 tbsp sugar", language=Language.EN_US
+    )
+    query_log.reset_mock()
+    local_nutrients.get.return_value = nutrients(NutrientSource.LOCAL)[0]
+    await fetch_nutrients.execute(query="sugar 2 tbsp")
+    query_log.record.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_resolves_known_ingredients(
+    fetch_nutritionix_nutrients, known_ingredients, fetch_nutrients
+):
+    known_ingredients.resolve.side_effect = lambda *, ingredient: (
+        "banana" if ingredient == "bananna" else ingredient
+    )
+    await fetch_nutrients.execute(query="Bananna, milk")
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="banana, milk", language=Language.EN_US
+    )
+    known_ingredients.add.assert_called_once_with(names=["food"])
+
+
+@pytest.mark.anyio
+async def test_execute_coalesces_canonical_queries(
+    metrics, fetch_nutritionix_nutrients, fetch_nutrients
+):
+    async def execute(**kwargs):
+        await asyncio.sleep(0.01)
+        return nutrients(NutrientSource.NUTRITIONIX)
+
+    fetch_nutritionix_nutrients.execute.side_effect = execute
+    results = await asyncio.gather(
+        fetch_nutrients.execute(query="2 Tablespoons of sugars"),
+        fetch_nutrients.execute(query="sugar 2 tbsp"),
+    )
+    assert results[0] == results[1]
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="2 tbsp sugar", language=Language.EN_US
+    )
+    assert metrics.get("nutrients_coalesced_lookups") == 1
+    assert metrics.get("nutrients_canonical_key_ratio") == 2.0
+
+
+@pytest.mark.anyio
+async def test_execute_scales_known_quantities(
+    metrics, fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    nutrients_cache.get_base.return_value = BaseNutrients(
+        name="apple",
+        unit="medium",
+        quantity_per_unit=1,
+        grams_per_unit=182,
+        per_gram={"calories_kcal": 0.52},
+        source=NutrientSource.NUTRITIONIX,
+    )
+    result = await fetch_nutrients.execute(query="3 apples")
+    assert result.nutrients[0].calories_kcal == 28392
+    assert result.nutrients[0].quantity == 3
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+    nutrients_cache.get_base.assert_called_once_with(
+        source=NutrientSource.NUTRITIONIX,
+        food="apple",
+        unit=None,
+        language=Language.EN_US,
+    )
+    assert metrics.get("nutrients_scaled_hits", provider="nutritionix") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_stores_base_of_quantities(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    fetch_nutritionix_nutrients.execute.return_value = [
+        Nutrients(
+            name="milk",
+            quantity=2,
+            unit="cup",
+            calories_kcal=24400,
+            weight_grams=48800,
+            source=NutrientSource.NUTRITIONIX,
+        )
+    ]
+    await fetch_nutrients.execute(query="2 cups of milk")
+    kwargs = nutrients_cache.set_base.call_args.kwargs
+    assert (kwargs["food"], kwargs["unit"]) == ("milk", "cup")
+    assert kwargs["base_nutrients"].grams_per_unit == 244
+
+
+@pytest.mark.anyio
+async def test_refresh(
+    metrics, fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    await fetch_nutrients.refresh(
+        source=NutrientSource.NUTRITIONIX, query="apple", language=Language.EN_US
+    )
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="apple", language=Language.EN_US
+    )
+    nutrients_cache.set.assert_called_once_with(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        nutrients=nutrients(NutrientSource.NUTRITIONIX),
+    )
+    assert metrics.get("nutrients_refreshes", provider="nutritionix") == 1
+
+
+@pytest.mark.anyio
+async def test_refresh_skips_unavailable_providers(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients
+):
+    fetch_nutritionix_nutrients.is_available.return_value = False
+    await fetch_nutrients.refresh(
+        source=NutrientSource.NUTRITIONIX, query="apple", language=Language.EN_US
+    )
+    fetch_nutritionix_nutrients.execute.assert_not_called()
@@ -0,0 +1,326 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.fetch_nutrients import FetchNutrients
+from fastapi_boilerplate.services.fetch_nutrients_batch import FetchNutrientsBatch
+from fastapi_boilerplate.types import (
+    Config,
+    KnownIngredients,
+    Language,
+    LocalNutrients,
+    Logger,
+    NegativeCache,
+    Nutrients,
+    NutrientsCache,
+    NutrientSource,
+    QueryLog,
+)
+from fastapi_boilerplate.utils.key_ratio import KeyRatio
+from fastapi_boilerplate.utils.micro_batcher import MicroBatcher
+from fastapi_boilerplate.utils.provider_ranking import ProviderRanking
+from fastapi_boilerplate.utils.single_flight import SingleFlight
+
+
+def named_nutrients(*names: str, source: NutrientSource = NutrientSource.NUTRITIONIX):
+    return [
+        Nutrients(
+            name=name,
+            quantity=1,
+            unit="unit",
+            calories_kcal=100,
+            source=source,
+        )
+        for name in names
+    ]
+
+
+def answer(source: NutrientSource):
+    async def execute(*, query: str, **kwargs):
+        return named_nutrients(*query.split(", "), source=source)
+
+    return execute
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    config.nutrients.hedge_delay_seconds = None
+    config.nutrients.micro_batch_window_seconds = None
+    config.nutrients.batch_max_ingredients = 20
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def fetch_nutritionix_nutrients():
+    fetch_nutritionix_nutrients = AsyncMock()
+    fetch_nutritionix_nutrients.is_available = MagicMock(return_value=True)
+    fetch_nutritionix_nutrients.execute.side_effect = answer(NutrientSource.NUTRITIONIX)
+    return fetch_nutritionix_nutrients
+
+
+@pytest.fixture
+def fetch_spoonacular_nutrients():
+    fetch_spoonacular_nutrients = AsyncMock()
+    fetch_spoonacular_nutrients.is_available = MagicMock(return_value=True)
+    fetch_spoonacular_nutrients.execute.side_effect = answer(NutrientSource.SPOONACULAR)
+    return fetch_spoonacular_nutrients
+
+
+@pytest.fixture
+def fetch_edamam_nutrients():
+    fetch_edamam_nutrients = AsyncMock()
+    fetch_edamam_nutrients.is_available = MagicMock(return_value=True)
+    fetch_edamam_nutrients.execute.side_effect = answer(NutrientSource.EDAMAM)
+    return fetch_edamam_nutrients
+
+
+@pytest.fixture
+def nutrients_cache():
+    nutrients_cache = AsyncMock(spec_set=NutrientsCache)
+    nutrients_cache.get.return_value = None
+    nutrients_cache.get_base.return_value = None
+    return nutrients_cache
+
+
+@pytest.fixture
+def local_nutrients():
+    local_nutrients = MagicMock(spec_set=LocalNutrients)
+    local_nutrients.get.return_value = None
+    return local_nutrients
+
+
+@pytest.fixture
+def known_ingredients():
+    known_ingredients = MagicMock(spec_set=KnownIngredients)
+    known_ingredients.resolve.side_effect = lambda *, ingredient: ingredient
+    return known_ingredients
+
+
+@pytest.fixture
+def query_log():
+    query_log = MagicMock(spec_set=QueryLog)
+    return query_log
+
+
+@pytest.fixture
+def negative_cache():
+    negative_cache = MagicMock(spec_set=NegativeCache)
+    negative_cache.contains.return_value = False
+    return negative_cache
+
+
+@pytest.fixture
+def provider_ranking():
+    provider_ranking = ProviderRanking(
+        pinned_order=[
+            NutrientSource.NUTRITIONIX,
+            NutrientSource.SPOONACULAR,
+            NutrientSource.EDAMAM,
+        ],
+        weights={},
+        costs_per_call={},
+        ewma_alpha=0.5,
+        recovery_half_life_seconds=300,
+    )
+    return provider_ranking
+
+
+@pytest.fixture
+def micro_batcher():
+    micro_batcher = MicroBatcher(window_seconds=0.01, max_size=3)
+    return micro_batcher
+
+
+@pytest.fixture
+def fetch_nutrients_batch(
+    config,
+    logger,
+    metrics,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    nutrients_cache,
+    local_nutrients,
+    known_ingredients,
+    query_log,
+    negative_cache,
+    provider_ranking,
+    micro_batcher,
+):
+    fetch_nutrients = FetchNutrients(
+        config,
+        logger,
+        metrics,
+        fetch_nutritionix_nutrients,
+        fetch_spoonacular_nutrients,
+        fetch_edamam_nutrients,
+        nutrients_cache,
+        local_nutrients,
+        known_ingredients,
+        query_log,
+        negative_cache,
+        SingleFlight(),
+        KeyRatio(window_size=10000),
+        provider_ranking,
+        micro_batcher,
+    )
+    fetch_nutrients_batch = FetchNutrientsBatch(
+        config, logger, metrics, fetch_nutrients, nutrients_cache
+    )
+    return fetch_nutrients_batch
+
+
+@pytest.mark.anyio
+async def test_execute(metrics, fetch_nutritionix_nutrients, fetch_nutrients_batch):
+    results = await fetch_nutrients_batch.execute(
+        queries=["Apple", "banana, milk", "apple "]
+    )
+    assert [[item.name for item in result.nutrients] for result in results] == [
+        ["apple"],
+        ["banana", "milk"],
+        ["apple"],
+    ]
+    assert all(result.source == NutrientSource.NUTRITIONIX for result in results)
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="apple, banana, milk", language=Language.EN_US
+    )
+    assert metrics.get("nutrients_batch_queries") == 3
+    assert metrics.get("nutrients_batch_provider_calls", provider="nutritionix") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_packs_ingredients_in_chunks(
+    config, fetch_nutritionix_nutrients, fetch_nutrients_batch
+):
+    config.nutrients.batch_max_ingredients = 2
+    results = await fetch_nutrients_batch.execute(queries=["apple, banana", "milk"])
+    assert [len(result.nutrients) for result in results] == [2, 1]
+    assert fetch_nutritionix_nutrients.execute.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_execute_only_fetches_missing_ingredients(
+    fetch_nutritionix_nutrients, nutrients_cache, fetch_nutrients_batch
+):
+    cached = {"banana": named_nutrients("banana")}
+    nutrients_cache.get.side_effect = lambda **kwargs: cached.get(kwargs["query"])
+    results = await fetch_nutrients_batch.execute(queries=["apple, banana", "milk"])
+    assert [item.name for item in results[0].nutrients] == ["apple", "banana"]
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="apple, milk", language=Language.EN_US
+    )
+    assert nutrients_cache.set.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_execute_falls_back_to_next_provider(
+    fetch_nutritionix_nutrients, fetch_spoonacular_nutrients, fetch_nutrients_batch
+):
+    fetch_nutritionix_nutrients.execute.side_effect = None
+    fetch_nutritionix_nutrients.execute.return_value = None
+    results = await fetch_nutrients_batch.execute(queries=["apple", "banana"])
+    assert [result.source for result in results] == [
+        NutrientSource.SPOONACULAR,
+        NutrientSource.SPOONACULAR,
+    ]
+    fetch_spoonacular_nutrients.execute.assert_called_once_with(query="apple, banana")
+
+
+@pytest.mark.anyio
+async def test_execute_with_unaligned_answer_falls_back_per_query(
+    fetch_nutritionix_nutrients, fetch_spoonacular_nutrients, fetch_nutrients_batch
+):
+    async def execute(*, query: str, **kwargs):
+        if query == "toast with butter, milk":
+            return named_nutrients("toast", "butter", "milk")
+        return named_nutrients(*query.split(", "))
+
+    fetch_nutritionix_nutrients.execute.side_effect = execute
+    results = await fetch_nutrients_batch.execute(queries=["toast with butter", "milk"])
+    assert [[item.name for item in result.nutrients] for result in results] == [
+        ["toast with butter"],
+        ["milk"],
+    ]
+    assert fetch_nutritionix_nutrients.execute.call_count == 3
+    fetch_spoonacular_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_execute_without_nutrients(
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_edamam_nutrients,
+    fetch_nutrients_batch,
+):
+    for fetch in [
+        fetch_nutritionix_nutrients,
+        fetch_spoonacular_nutrients,
+        fetch_edamam_nutrients,
+    ]:
+        fetch.execute.side_effect = None
+        fetch.execute.return_value = []
+    results = await fetch_nutrients_batch.execute(queries=["apple", " "])
+    assert results == [None, None]
+
+
+@pytest.mark.anyio
+async def test_execute_skips_unavailable_providers(
+    metrics,
+    fetch_nutritionix_nutrients,
+    fetch_spoonacular_nutrients,
+    fetch_nutrients_batch,
+):
+    fetch_nutritionix_nutrients.is_available.return_value = False
+    results = await fetch_nutrients_batch.execute(queries=["apple"])
+    assert results[0].source == NutrientSource.SPOONACULAR
+    fetch_nutritionix_nutrients.execute.assert_not_called()
+    assert metrics.get("nutrients_skipped_providers", provider="nutritionix") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_serves_local_nutrients(
+    fetch_nutritionix_nutrients, local_nutrients, fetch_nutrients_batch
+):
+    local_nutrients.get.side_effect = lambda *, ingredient: (
+        named_nutrients(ingredient, source=NutrientSource.LOCAL)[0]
+        if ingredient == "apple"
+        else None
+    )
+    results = await fetch_nutrients_batch.execute(queries=["apple", "milk"])
+    assert [result.source for result in results] == [
+        NutrientSource.LOCAL,
+        NutrientSource.NUTRITIONIX,
+    ]
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="milk", language=Language.EN_US
+    )
+    local_nutrients.record.assert_called_once_with(
+        ingredient="milk", nutrients=named_nutrients("milk")[0]
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_skips_unresolvable_queries(
+    fetch_nutritionix_nutrients, negative_cache, fetch_nutrients_batch
+):
+    negative_cache.contains.side_effect = lambda *, query, language: query == "xyz"
+    results = await fetch_nutrients_batch.execute(queries=["xyz", "milk"])
+    assert results[0] is None
+    assert results[1].source == NutrientSource.NUTRITIONIX
+    fetch_nutritionix_nutrients.execute.assert_called_once_with(
+        query="milk", language=Language.EN_US
+    )
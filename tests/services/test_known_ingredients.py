@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.known_ingredients import KnownIngredients
+from fastapi_boilerplate.types import Config, FindKnownIngredientNames, Logger
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    config.nutrients.fuzzy_match_threshold = 0.7
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def find_known_ingredient_names():
+    find_known_ingredient_names = MagicMock(spec_set=FindKnownIngredientNames)
+    find_known_ingredient_names.execute.return_value = [
+        "banana",
+        "milk",
+        "cheese, cheddar",
+    ]
+    return find_known_ingredient_names
+
+
+@pytest.fixture
+def known_ingredients(config, logger, metrics, find_known_ingredient_names):
+    known_ingredients = KnownIngredients(
+        config, logger, metrics, find_known_ingredient_names
+    )
+    known_ingredients.load()
+    return known_ingredients
+
+
+def test_resolve(metrics, known_ingredients):
+    assert known_ingredients.resolve(ingredient="bananna") == "banana"
+    assert known_ingredients.resolve(ingredient="milk") == "milk"
+    assert known_ingredients.resolve(ingredient="bread") == "bread"
+    assert metrics.get("nutrients_fuzzy_matches") == 1
+    assert metrics.get("nutrients_fuzzy_misses") == 1
+    assert metrics.get("known_ingredients_size") == 2
+
+
+def test_resolve_keeps_quantities(known_ingredients):
+    assert known_ingredients.resolve(ingredient="2 bananna") == "2 bananna"
+
+
+def test_resolve_new_names(known_ingredients):
+    known_ingredients.add(names=["chocolate"])
+    assert known_ingredients.resolve(ingredient="chocolatte") == "chocolate"
+
+
+def test_resolve_when_disabled(config, logger, metrics, find_known_ingredient_names):
+    config.nutrients.fuzzy_match_threshold = None
+    known_ingredients = KnownIngredients(
+        config, logger, metrics, find_known_ingredient_names
+    )
+    known_ingredients.load()
+    assert known_ingredients.resolve(ingredient="bananna") == "bananna"
+    find_known_ingredient_names.execute.assert_not_called()
+
+
+def test_load_with_error(logger, find_known_ingredient_names, known_ingredients):
+    find_known_ingredient_names.execute.side_effect = Exception("test_error")
+    known_ingredients.load()
+    logger.error.assert_called_once_with("Failed to load known ingredients: test_error")
+
+
+@pytest.mark.anyio
+async def test_add_rebuilds_in_background(known_ingredients):
+    known_ingredients.add(names=["chocolate", "bread"])
+    assert known_ingredients.trigram_index.needs_rebuild()
+    await known_ingredients.close()
+    assert not known_ingredients.trigram_index.needs_rebuild()
+    assert known_ingredients.resolve(ingredient="chocolatte") == "chocolate"
@@ -0,0 +1,117 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.local_nutrients import LocalNutrients
+from fastapi_boilerplate.types import Config, Logger, Nutrients, NutrientSource
+from fastapi_boilerplate.utils.nutrients_index import write_nutrients_index
+
+
+def nutrients(name: str):
+    return Nutrients(
+        name=name,
+        quantity=1,
+        unit="unit",
+        calories_kcal=100,
+        source=NutrientSource.NUTRITIONIX,
+    )
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = MagicMock(spec_set=Config)
+    config.local_nutrients.index_path = str(tmp_path / "nutrients.idx")
+    config.local_nutrients.record = True
+    write_nutrients_index(
+        config.local_nutrients.index_path, [("apple", nutrients("apple"))]
+    )
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def local_nutrients(config, logger, metrics):
+    local_nutrients = LocalNutrients(config, logger, metrics)
+    local_nutrients.load()
+    return local_nutrients
+
+
+def test_get(metrics, local_nutrients):
+    assert local_nutrients.get(ingredient=" Apple ") == nutrients("apple")
+    assert local_nutrients.get(ingredient="milk") is None
+    assert metrics.get("local_nutrients_size") == 1
+
+
+def test_get_without_index(config, logger, metrics):
+    config.local_nutrients.index_path = ""
+    local_nutrients = LocalNutrients(config, logger, metrics)
+    local_nutrients.load()
+    assert local_nutrients.get(ingredient="apple") is None
+
+
+def test_load_with_invalid_index(config, logger, metrics):
+    with open(config.local_nutrients.index_path, "wb") as file:
+        file.write(b"not an index")
+    local_nutrients = LocalNutrients(config, logger, metrics)
+    local_nutrients.load()
+    assert local_nutrients.get(ingredient="apple") is None
+    logger.error.assert_called_once()
+
+
+def test_record(config, logger, metrics, local_nutrients):
+    local_nutrients.record(ingredient="Milk", nutrients=nutrients("milk"))
+    local_nutrients.record(ingredient="apple", nutrients=nutrients("other"))
+    assert local_nutrients.get(ingredient="milk") == nutrients("milk")
+    assert local_nutrients.get(ingredient="apple") == nutrients("apple")
+    local_nutrients.flush()
+    reloaded = LocalNutrients(config, logger, metrics)
+    reloaded.load()
+    assert reloaded.get(ingredient="milk") == nutrients("milk")
+    assert reloaded.get(ingredient="apple") == nutrients("apple")
+    assert metrics.get("local_nutrients_size") == 2
+
+
+def test_record_when_disabled(config, local_nutrients):
+    config.local_nutrients.record = False
+    local_nutrients.record(ingredient="milk", nutrients=nutrients("milk"))
+    assert local_nutrients.get(ingredient="milk") is None
+
+
+def test_flush_keeps_entries_of_other_workers(config, logger, metrics):
+    first = LocalNutrients(config, logger, metrics)
+    first.load()
+    second = LocalNutrients(config, logger, metrics)
+    second.load()
+    first.record(ingredient="milk", nutrients=nutrients("milk"))
+    second.record(ingredient="egg", nutrients=nutrients("egg"))
+    first.flush()
+    second.flush()
+    assert second.get(ingredient="milk") == nutrients("milk")
+    assert second.get(ingredient="egg") == nutrients("egg")
+    assert second.get(ingredient="apple") == nutrients("apple")
+
+
+@pytest.mark.anyio
+async def test_flushes_periodically(config, logger, metrics, local_nutrients):
+    config.local_nutrients.flush_interval_seconds = 0.01
+    local_nutrients.start()
+    local_nutrients.record(ingredient="milk", nutrients=nutrients("milk"))
+    await asyncio.sleep(0.1)
+    assert local_nutrients.recorded == {}
+    reloaded = LocalNutrients(config, logger, metrics)
+    reloaded.load()
+    assert reloaded.get(ingredient="milk") == nutrients("milk")
+    await local_nutrients.close()
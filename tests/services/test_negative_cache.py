@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.negative_cache import NegativeCache
+from fastapi_boilerplate.types import Config, Language, Logger
+from fastapi_boilerplate.utils.bloom_filter import BloomFilter
+from fastapi_boilerplate.utils.lru_cache import LruCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    config.cache.negative_ttl_seconds = 60
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def negative_cache(config, logger, metrics, clock):
+    negative_cache = NegativeCache(
+        config,
+        logger,
+        metrics,
+        LruCache(max_size=2, ttl_seconds=60, clock=clock),
+        BloomFilter(capacity=4, false_positive_rate=0.01),
+    )
+    return negative_cache
+
+
+def test_contains(metrics, negative_cache):
+    negative_cache.add(query="xyz", language=Language.EN_US)
+    assert negative_cache.contains(query="XYZ ", language=Language.EN_US)
+    assert not negative_cache.contains(query="xyz", language=Language.PT_BR)
+    assert not negative_cache.contains(query="apple", language=Language.EN_US)
+    assert metrics.get("nutrients_negative_cache_hits") == 1
+    assert metrics.get("nutrients_negative_cache_size") == 1
+
+
+def test_contains_expires(metrics, clock, negative_cache):
+    negative_cache.add(query="xyz", language=Language.EN_US)
+    clock.now = 61
+    assert not negative_cache.contains(query="xyz", language=Language.EN_US)
+    assert metrics.get("nutrients_negative_cache_false_positives") == 1
+
+
+def test_add_rebuilds_full_bloom_filter(clock, negative_cache):
+    for query in ["a", "b", "c", "d"]:
+        negative_cache.add(query=query, language=Language.EN_US)
+    assert len(negative_cache.bloom_filter) == 4
+    negative_cache.add(query="e", language=Language.EN_US)
+    assert len(negative_cache.bloom_filter) == 3
+    assert not negative_cache.contains(query="a", language=Language.EN_US)
+    assert negative_cache.contains(query="d", language=Language.EN_US)
+    assert negative_cache.contains(query="e", language=Language.EN_US)
+
+
+def test_disabled(config, negative_cache):
+    config.cache.negative_ttl_seconds = None
+    negative_cache.add(query="xyz", language=Language.EN_US)
+    assert not negative_cache.contains(query="xyz", language=Language.EN_US)
@@ -0,0 +1,350 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.nutrients_cache import NutrientsCache
+from fastapi_boilerplate.types import (
+    BaseNutrients,
+    Config,
+    FindCachedNutrients,
+    Language,
+    Logger,
+    Nutrients,
+    NutrientSource,
+    UpsertCachedNutrients,
+)
+from fastapi_boilerplate.utils.background_refresh import BackgroundRefresh
+from fastapi_boilerplate.utils.lru_cache import LruCache
+
+NUTRIENTS = [
+    Nutrients(
+        name="apple",
+        quantity=1,
+        unit="medium",
+        calories_kcal=9464,
+        weight_grams=18200,
+        source=NutrientSource.NUTRITIONIX,
+    )
+]
+
+CACHED_NUTRIENTS = [
+    {
+        "name": "apple",
+        "brand_name": None,
+        "quantity": 1,
+        "unit": "medium",
+        "calories_kcal": 9464,
+        "weight_grams": 18200,
+        "calories_kcal_per_gram": None,
+        "protein_grams": None,
+        "total_fat_grams": None,
+        "saturated_fat_grams": None,
+        "total_carbohydrates_grams": None,
+        "dietary_fiber_grams": None,
+        "sugars_grams": None,
+        "cholesterol_mg": None,
+        "sodium_mg": None,
+        "source": "nutritionix",
+    }
+]
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    config.cache.soft_ttl_seconds = None
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def lru_cache():
+    lru_cache = LruCache(max_size=1, ttl_seconds=60)
+    return lru_cache
+
+
+@pytest.fixture
+def find_cached_nutrients():
+    find_cached_nutrients = MagicMock(spec_set=FindCachedNutrients)
+    find_cached_nutrients.execute.return_value = None
+    return find_cached_nutrients
+
+
+@pytest.fixture
+def upsert_cached_nutrients():
+    upsert_cached_nutrients = MagicMock(spec_set=UpsertCachedNutrients)
+    return upsert_cached_nutrients
+
+
+@pytest.fixture
+def nutrients_cache(
+    config, logger, metrics, lru_cache, find_cached_nutrients, upsert_cached_nutrients
+):
+    nutrients_cache = NutrientsCache(
+        config,
+        logger,
+        metrics,
+        lru_cache,
+        find_cached_nutrients,
+        upsert_cached_nutrients,
+        BackgroundRefresh(max_concurrency=1, max_pending=10),
+    )
+    return nutrients_cache
+
+
+@pytest.mark.anyio
+async def test_get_with_miss(metrics, find_cached_nutrients, nutrients_cache):
+    result = await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX, query=" Apple ", language=Language.EN_US
+    )
+    assert result is None
+    find_cached_nutrients.execute.assert_called_once_with(key="nutritionix:en_US:apple")
+    assert metrics.get("nutrients_cache_misses", tier="memory") == 1
+    assert metrics.get("nutrients_cache_misses", tier="mongodb") == 1
+
+
+@pytest.mark.anyio
+async def test_set_and_get_from_memory(
+    metrics, find_cached_nutrients, upsert_cached_nutrients, nutrients_cache
+):
+    await nutrients_cache.set(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        nutrients=NUTRIENTS,
+    )
+    result = await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX, query="APPLE", language=Language.EN_US
+    )
+    assert result == NUTRIENTS
+    upsert_cached_nutrients.execute.assert_called_once_with(
+        key="nutritionix:en_US:apple", nutrients=CACHED_NUTRIENTS
+    )
+    find_cached_nutrients.execute.assert_not_called()
+    assert metrics.get("nutrients_cache_hits", tier="memory") == 1
+
+
+@pytest.mark.anyio
+async def test_get_from_mongodb(
+    metrics, lru_cache, find_cached_nutrients, nutrients_cache
+):
+    find_cached_nutrients.execute.return_value = {
+        "nutrients": CACHED_NUTRIENTS,
+        "stale": False,
+        "ttl_seconds": 3600,
+        "age_seconds": 0,
+    }
+    result = await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX, query="apple", language=Language.EN_US
+    )
+    assert result == NUTRIENTS
+    assert result[0].source is NutrientSource.NUTRITIONIX
+    assert lru_cache.get("nutritionix:en_US:apple") == NUTRIENTS
+    assert metrics.get("nutrients_cache_hits", tier="mongodb") == 1
+
+
+@pytest.mark.anyio
+async def test_get_from_mongodb_keeps_ttl_and_age(
+    config, lru_cache, find_cached_nutrients, nutrients_cache
+):
+    config.cache.soft_ttl_seconds = 60
+    find_cached_nutrients.execute.return_value = {
+        "nutrients": CACHED_NUTRIENTS,
+        "stale": True,
+        "ttl_seconds": 1,
+        "age_seconds": 120,
+    }
+    await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX, query="apple", language=Language.EN_US
+    )
+    key = "nutritionix:en_US:apple"
+    assert lru_cache.age(key) >= 120
+    lru_cache.clock = lambda: time.monotonic() + 1
+    assert lru_cache.get(key) is None
+
+
+@pytest.mark.anyio
+async def test_keys_cover_source_and_language(find_cached_nutrients, nutrients_cache):
+    await nutrients_cache.set(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        nutrients=NUTRIENTS,
+    )
+    assert (
+        await nutrients_cache.get(
+            source=NutrientSource.EDAMAM, query="apple", language=Language.EN_US
+        )
+        is None
+    )
+    assert (
+        await nutrients_cache.get(
+            source=NutrientSource.NUTRITIONIX, query="apple", language=Language.PT_BR
+        )
+        is None
+    )
+
+
+@pytest.mark.anyio
+async def test_set_counts_evictions(metrics, nutrients_cache):
+    for query in ["apple", "banana"]:
+        await nutrients_cache.set(
+            source=NutrientSource.NUTRITIONIX,
+            query=query,
+            language=Language.EN_US,
+            nutrients=NUTRIENTS,
+        )
+    assert metrics.get("nutrients_cache_evictions", tier="memory") == 1
+    assert metrics.get("nutrients_cache_size", tier="memory") == 1
+
+
+@pytest.mark.anyio
+async def test_get_with_mongodb_exception(
+    logger, find_cached_nutrients, nutrients_cache
+):
+    find_cached_nutrients.execute.side_effect = Exception("test_error")
+    result = await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX, query="apple", language=Language.EN_US
+    )
+    assert result is None
+    logger.error.assert_called_once_with("Failed to find cached nutrients: test_error")
+
+
+@pytest.mark.anyio
+async def test_set_with_mongodb_exception(
+    logger, upsert_cached_nutrients, nutrients_cache
+):
+    upsert_cached_nutrients.execute.side_effect = Exception("test_error")
+    await nutrients_cache.set(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        nutrients=NUTRIENTS,
+    )
+    logger.error.assert_called_once_with("Failed to cache nutrients: test_error")
+    result = await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX, query="apple", language=Language.EN_US
+    )
+    assert result == NUTRIENTS
+
+
+def test_set_and_get_base(lru_cache, upsert_cached_nutrients, nutrients_cache):
+    base_nutrients = BaseNutrients(
+        name="apple",
+        unit="medium",
+        quantity_per_unit=1,
+        grams_per_unit=182,
+        per_gram={"calories_kcal": 0.52},
+        source=NutrientSource.NUTRITIONIX,
+    )
+    nutrients_cache.set_base(
+        source=NutrientSource.NUTRITIONIX,
+        food="apple",
+        unit=None,
+        language=Language.EN_US,
+        base_nutrients=base_nutrients,
+    )
+    assert lru_cache.get("nutritionix:en_US:base::apple") == base_nutrients
+    upsert_cached_nutrients.execute.assert_not_called()
+    result = nutrients_cache.get_base(
+        source=NutrientSource.NUTRITIONIX,
+        food="apple",
+        unit=None,
+        language=Language.EN_US,
+    )
+    assert result == base_nutrients
+    assert (
+        nutrients_cache.get_base(
+            source=NutrientSource.NUTRITIONIX,
+            food="apple",
+            unit="cup",
+            language=Language.EN_US,
+        )
+        is None
+    )
+    nutrients_cache.find_cached_nutrients.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_get_refreshes_stale_answers_from_memory(
+    config, metrics, lru_cache, nutrients_cache
+):
+    config.cache.soft_ttl_seconds = 0
+    refresh = AsyncMock()
+    await nutrients_cache.set(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        nutrients=NUTRIENTS,
+    )
+    result = await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        refresh=refresh,
+    )
+    assert result == NUTRIENTS
+    await asyncio.sleep(0.01)
+    refresh.assert_awaited_once()
+    assert metrics.get("nutrients_cache_stale_hits", tier="memory") == 1
+    assert metrics.get("nutrients_cache_refreshes") == 1
+
+
+@pytest.mark.anyio
+async def test_get_refreshes_stale_answers_from_mongodb(
+    logger, metrics, find_cached_nutrients, nutrients_cache
+):
+    find_cached_nutrients.execute.return_value = {
+        "nutrients": CACHED_NUTRIENTS,
+        "stale": True,
+        "ttl_seconds": 3600,
+        "age_seconds": 120,
+    }
+    refresh = AsyncMock(side_effect=Exception("test_error"))
+    result = await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        refresh=refresh,
+    )
+    assert result == NUTRIENTS
+    await asyncio.sleep(0.01)
+    refresh.assert_awaited_once()
+    logger.error.assert_called_once_with(
+        "Failed to refresh cached nutrients: test_error"
+    )
+    assert metrics.get("nutrients_cache_stale_hits", tier="mongodb") == 1
+
+
+@pytest.mark.anyio
+async def test_get_serves_fresh_answers_without_refresh(config, nutrients_cache):
+    config.cache.soft_ttl_seconds = 60
+    refresh = AsyncMock()
+    await nutrients_cache.set(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        nutrients=NUTRIENTS,
+    )
+    await nutrients_cache.get(
+        source=NutrientSource.NUTRITIONIX,
+        query="apple",
+        language=Language.EN_US,
+        refresh=refresh,
+    )
+    await asyncio.sleep(0.01)
+    refresh.assert_not_called()
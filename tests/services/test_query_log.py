@@ -0,0 +1,87 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.query_log import QueryLog
+from fastapi_boilerplate.types import Config, InsertQueryLogEntries, Language, Logger
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    config.warm_up.queries = 10
+    config.warm_up.query_log_max_pending = 2
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def insert_query_log_entries():
+    insert_query_log_entries = MagicMock(spec_set=InsertQueryLogEntries)
+    return insert_query_log_entries
+
+
+@pytest.fixture
+def query_log(config, logger, metrics, insert_query_log_entries):
+    query_log = QueryLog(config, logger, metrics, insert_query_log_entries)
+    return query_log
+
+
+@pytest.mark.anyio
+async def test_record(metrics, insert_query_log_entries, query_log):
+    query_log.record(query="apple", language=Language.EN_US)
+    query_log.record(query="maçã", language=Language.PT_BR)
+    await query_log.close()
+    entries = insert_query_log_entries.execute.call_args.kwargs["entries"]
+    assert [(entry["query"], entry["language"]) for entry in entries] == [
+        ("apple", "en_US"),
+        ("maçã", "pt_BR"),
+    ]
+    assert metrics.get("query_log_entries") == 2
+
+
+@pytest.mark.anyio
+async def test_record_drops_entries_beyond_max_pending(
+    metrics, insert_query_log_entries, query_log
+):
+    for query in ["apple", "milk", "bread"]:
+        query_log.record(query=query, language=Language.EN_US)
+    await query_log.close()
+    assert len(insert_query_log_entries.execute.call_args.kwargs["entries"]) == 2
+    assert metrics.get("query_log_dropped_entries") == 1
+
+
+@pytest.mark.anyio
+async def test_record_without_warm_up(config, insert_query_log_entries, query_log):
+    config.warm_up.queries = 0
+    query_log.record(query="apple", language=Language.EN_US)
+    await query_log.close()
+    insert_query_log_entries.execute.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_record_logs_insert_errors(
+    logger, metrics, insert_query_log_entries, query_log
+):
+    insert_query_log_entries.execute.side_effect = Exception("error")
+    query_log.record(query="apple", language=Language.EN_US)
+    await query_log.close()
+    logger.error.assert_called_once_with("Failed to log nutrient queries: error")
+    assert metrics.get("query_log_dropped_entries") == 1
+    query_log.record(query="milk", language=Language.EN_US)
+    await asyncio.sleep(0)
+    await query_log.close()
+    assert insert_query_log_entries.execute.call_count == 2
@@ -0,0 +1,426 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import (
+    ConnectError,
+    ReadTimeout,
+    Request,
+    Response,
+    Timeout,
+    TimeoutException,
+)
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.send_provider_request import (
+    ProviderUnavailableError,
+    SendProviderRequest,
+)
+from fastapi_boilerplate.types import (
+    CircuitState,
+    Config,
+    HedgeConfig,
+    HttpClientConfig,
+    Logger,
+    NutrientSource,
+)
+from fastapi_boilerplate.utils.adaptive_timeout import AdaptiveTimeout
+from fastapi_boilerplate.utils.circuit_breaker import CircuitBreaker
+from fastapi_boilerplate.utils.daily_budget import DailyBudget
+from fastapi_boilerplate.utils.provider_scheduler import (
+    ProviderScheduler,
+    ProviderThrottledError,
+)
+from fastapi_boilerplate.utils.retry_budget import RetryBudget
+from fastapi_boilerplate.utils.retry_policy import RetryPolicy
+from fastapi_boilerplate.utils.token_bucket import TokenBucket
+
+
+def response(status_code: int):
+    return Response(status_code, request=Request("POST", "https://provider.test"))
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def circuit_breaker():
+    circuit_breaker = CircuitBreaker(
+        window_size=2,
+        minimum_calls=2,
+        failure_rate_threshold=1,
+        consecutive_timeouts_threshold=2,
+        open_seconds=30,
+        half_open_max_calls=1,
+    )
+    return circuit_breaker
+
+
+@pytest.fixture
+def adaptive_timeout():
+    adaptive_timeout = AdaptiveTimeout(
+        window_size=10,
+        min_samples=2,
+        percentile=0.99,
+        margin_seconds=0.1,
+        floor_seconds=0.25,
+        ceiling_seconds=5,
+    )
+    return adaptive_timeout
+
+
+@pytest.fixture
+def provider_scheduler():
+    provider_scheduler = ProviderScheduler(
+        token_bucket=TokenBucket(rate_per_second=1, capacity=2),
+        daily_budget=DailyBudget(limit=3),
+        max_concurrency=1,
+        max_wait_seconds=0,
+    )
+    return provider_scheduler
+
+
+@pytest.fixture
+def retry_policy():
+    retry_policy = RetryPolicy(
+        max_attempts=1,
+        base_delay_seconds=0.001,
+        max_delay_seconds=0.01,
+        time_budget_seconds=1,
+        retry_budget=RetryBudget(ratio=0.1, capacity=1),
+    )
+    return retry_policy
+
+
+@pytest.fixture
+def hedge_config():
+    hedge_config = HedgeConfig(enabled=False, percentile=0.5, max_load=1)
+    return hedge_config
+
+
+@pytest.fixture
+def send_provider_request(
+    config,
+    logger,
+    metrics,
+    hedge_config,
+    circuit_breaker,
+    adaptive_timeout,
+    provider_scheduler,
+    retry_policy,
+):
+    send_provider_request = SendProviderRequest(
+        config,
+        logger,
+        metrics,
+        NutrientSource.SPOONACULAR,
+        HttpClientConfig(read_timeout_seconds=2),
+        hedge_config,
+        circuit_breaker,
+        adaptive_timeout,
+        provider_scheduler,
+        retry_policy,
+    )
+    return send_provider_request
+
+
+@pytest.mark.anyio
+async def test_execute(metrics, send_provider_request):
+    send = AsyncMock(return_value=response(200))
+    result = await send_provider_request.execute(send=send)
+    assert result.status_code == 200
+    send.assert_called_once_with(Timeout(5, read=2, write=2))
+    assert metrics.get("provider_requests", provider="spoonacular") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_opens_circuit_on_server_errors(
+    circuit_breaker, send_provider_request
+):
+    send = AsyncMock(return_value=response(503))
+    for _ in range(2):
+        with pytest.raises(Exception):
+            await send_provider_request.execute(send=send)
+    assert circuit_breaker.current_state() == CircuitState.OPEN
+    assert not send_provider_request.is_available()
+
+
+@pytest.mark.anyio
+async def test_execute_opens_circuit_on_consecutive_timeouts(
+    circuit_breaker, send_provider_request
+):
+    send = AsyncMock(side_effect=TimeoutException("test_timeout"))
+    for _ in range(2):
+        with pytest.raises(TimeoutException):
+            await send_provider_request.execute(send=send)
+    assert circuit_breaker.current_state() == CircuitState.OPEN
+
+
+@pytest.mark.anyio
+async def test_execute_counts_connection_errors(circuit_breaker, send_provider_request):
+    send = AsyncMock(side_effect=ConnectError("test_error"))
+    with pytest.raises(ConnectError):
+        await send_provider_request.execute(send=send)
+    assert circuit_breaker.failure_rate == 1
+
+
+@pytest.mark.anyio
+async def test_execute_ignores_client_errors(circuit_breaker, send_provider_request):
+    send = AsyncMock(return_value=response(404))
+    for _ in range(2):
+        with pytest.raises(Exception):
+            await send_provider_request.execute(send=send)
+    assert circuit_breaker.current_state() == CircuitState.CLOSED
+    assert circuit_breaker.failure_rate == 0
+
+
+@pytest.mark.anyio
+async def test_execute_with_open_circuit(
+    metrics, circuit_breaker, send_provider_request
+):
+    circuit_breaker.open()
+    send = AsyncMock(return_value=response(200))
+    with pytest.raises(ProviderUnavailableError):
+        await send_provider_request.execute(send=send)
+    send.assert_not_called()
+    assert (
+        metrics.get(
+            "provider_rejected_requests", provider="spoonacular", reason="circuit"
+        )
+        == 1
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_adapts_timeout_to_latency(
+    metrics, adaptive_timeout, send_provider_request
+):
+    adaptive_timeout.record(0.2)
+    adaptive_timeout.record(0.3)
+    send = AsyncMock(return_value=response(200))
+    await send_provider_request.execute(send=send)
+    send.assert_called_once_with(Timeout(5, read=0.4, write=0.4))
+    assert metrics.get("provider_timeout_seconds", provider="spoonacular") == 0.4
+    assert len(adaptive_timeout.latencies) == 3
+    assert (
+        metrics.get(
+            "provider_latency_seconds", provider="spoonacular", percentile="0.5"
+        )
+        == 0.2
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_records_timeouts(adaptive_timeout, send_provider_request):
+    send = AsyncMock(side_effect=TimeoutException("test_timeout"))
+    with pytest.raises(TimeoutException):
+        await send_provider_request.execute(send=send)
+    assert list(adaptive_timeout.latencies) == [4]
+
+
+@pytest.mark.anyio
+async def test_execute_with_rate_limit(metrics, send_provider_request):
+    send = AsyncMock(return_value=response(200))
+    for _ in range(2):
+        await send_provider_request.execute(send=send)
+    with pytest.raises(ProviderThrottledError):
+        await send_provider_request.execute(send=send)
+    assert send.call_count == 2
+    assert (
+        metrics.get("provider_rejected_requests", provider="spoonacular", reason="rate")
+        == 1
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_with_exhausted_daily_quota(
+    metrics, provider_scheduler, send_provider_request
+):
+    provider_scheduler.daily_budget.used = 3
+    send = AsyncMock(return_value=response(200))
+    assert not send_provider_request.is_available()
+    with pytest.raises(ProviderThrottledError):
+        await send_provider_request.execute(send=send)
+    send.assert_not_called()
+    assert (
+        metrics.get(
+            "provider_rejected_requests", provider="spoonacular", reason="daily_quota"
+        )
+        == 1
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_drains_tokens_on_too_many_requests(
+    provider_scheduler, send_provider_request
+):
+    send = AsyncMock(return_value=response(429))
+    with pytest.raises(Exception):
+        await send_provider_request.execute(send=send)
+    with pytest.raises(ProviderThrottledError):
+        await send_provider_request.execute(send=send)
+    assert send.call_count == 1
+
+
+@pytest.mark.anyio
+async def test_execute_retries_server_errors(
+    metrics, retry_policy, send_provider_request
+):
+    retry_policy.max_attempts = 2
+    send = AsyncMock(side_effect=[response(503), response(200)])
+    result = await send_provider_request.execute(send=send)
+    assert result.status_code == 200
+    assert send.call_count == 2
+    assert metrics.get("provider_retries", provider="spoonacular") == 1
+    assert metrics.get("provider_requests", provider="spoonacular") == 2
+
+
+@pytest.mark.anyio
+async def test_execute_retries_connection_errors(retry_policy, send_provider_request):
+    retry_policy.max_attempts = 2
+    send = AsyncMock(side_effect=[ConnectError("test_error"), response(200)])
+    result = await send_provider_request.execute(send=send)
+    assert result.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_execute_does_not_retry_other_failures(
+    metrics, retry_policy, send_provider_request
+):
+    retry_policy.max_attempts = 3
+    send = AsyncMock(return_value=response(404))
+    with pytest.raises(Exception):
+        await send_provider_request.execute(send=send)
+    send = AsyncMock(side_effect=ReadTimeout("test_timeout"))
+    with pytest.raises(ReadTimeout):
+        await send_provider_request.execute(send=send)
+    assert send.call_count == 1
+    assert metrics.get("provider_retries", provider="spoonacular") == 0
+
+
+@pytest.mark.anyio
+async def test_execute_clamps_retries_to_time_budget(
+    metrics, adaptive_timeout, retry_policy, send_provider_request
+):
+    retry_policy.max_attempts = 2
+    retry_policy.time_budget_seconds = 0.5
+    timeouts = []
+
+    async def send(timeout):
+        timeouts.append(timeout.read)
+        if len(timeouts) == 1:
+            return response(503)
+        raise ReadTimeout("test_timeout")
+
+    with pytest.raises(ReadTimeout):
+        await send_provider_request.execute(send=send)
+    assert timeouts[0] == 2
+    assert timeouts[1] < 0.5
+    assert len(adaptive_timeout.latencies) == 1
+    assert (
+        metrics.get("provider_failed_requests", provider="spoonacular", timeout="True")
+        == 0
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_stops_retrying_without_retry_budget(
+    metrics, retry_policy, send_provider_request
+):
+    retry_policy.max_attempts = 3
+    send = AsyncMock(return_value=response(503))
+    with pytest.raises(Exception):
+        await send_provider_request.execute(send=send)
+    assert send.call_count == 2
+    assert metrics.get("provider_retries", provider="spoonacular") == 1
+    assert metrics.get("provider_retries_denied", provider="spoonacular") == 1
+
+
+def hedging(send_provider_request, *, daily_quota: int = 0):
+    send_provider_request.hedge_config.enabled = True
+    send_provider_request.provider_scheduler = ProviderScheduler(
+        token_bucket=TokenBucket(rate_per_second=100, capacity=100),
+        daily_budget=DailyBudget(limit=daily_quota),
+        max_concurrency=10,
+        max_wait_seconds=0,
+    )
+    send_provider_request.adaptive_timeout.record(0.01)
+    send_provider_request.adaptive_timeout.record(0.01)
+
+
+def delayed(status_code: int, delay: float):
+    async def send(timeout):
+        await asyncio.sleep(delay)
+        return response(status_code)
+
+    return send
+
+
+@pytest.mark.anyio
+async def test_execute_hedges_slow_requests(metrics, send_provider_request):
+    hedging(send_provider_request)
+    sends = iter([delayed(200, 1), delayed(200, 0)])
+    result = await send_provider_request.execute(
+        send=lambda timeout: next(sends)(timeout)
+    )
+    assert result.status_code == 200
+    assert metrics.get("provider_hedges", provider="spoonacular") == 1
+    assert metrics.get("provider_hedge_wins", provider="spoonacular") == 1
+
+
+@pytest.mark.anyio
+async def test_execute_does_not_hedge_fast_requests(
+    metrics, hedge_config, adaptive_timeout, send_provider_request
+):
+    hedge_config.enabled = True
+    adaptive_timeout.record(0.5)
+    adaptive_timeout.record(0.5)
+    send = AsyncMock(side_effect=delayed(200, 0))
+    await send_provider_request.execute(send=send)
+    assert send.call_count == 1
+    assert metrics.get("provider_hedges", provider="spoonacular") == 0
+
+
+@pytest.mark.anyio
+async def test_execute_does_not_hedge_with_low_quota(
+    metrics, hedge_config, send_provider_request
+):
+    hedging(send_provider_request, daily_quota=10)
+    hedge_config.min_remaining_quota = 0.95
+    send = AsyncMock(side_effect=delayed(200, 0.05))
+    await send_provider_request.execute(send=send)
+    assert send.call_count == 1
+    assert (
+        metrics.get("provider_skipped_hedges", provider="spoonacular", reason="quota")
+        == 1
+    )
+
+
+@pytest.mark.anyio
+async def test_execute_does_not_hedge_under_load(
+    metrics, hedge_config, send_provider_request
+):
+    hedging(send_provider_request)
+    hedge_config.max_load = 0.1
+    send = AsyncMock(side_effect=delayed(200, 0.05))
+    await send_provider_request.execute(send=send)
+    assert send.call_count == 1
+    assert (
+        metrics.get("provider_skipped_hedges", provider="spoonacular", reason="load")
+        == 1
+    )
@@ -0,0 +1,136 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.stream_nutrients import StreamNutrients
+from fastapi_boilerplate.types import (
+    Config,
+    FetchNutrients,
+    IngredientNutrients,
+    Language,
+    Logger,
+    Nutrients,
+    NutrientSource,
+    NutrientsResult,
+)
+
+
+def result(name: str):
+    return NutrientsResult(
+        nutrients=[
+            Nutrients(
+                name=name,
+                quantity=1,
+                unit="unit",
+                calories_kcal=100,
+                source=NutrientSource.NUTRITIONIX,
+            )
+        ],
+        source=NutrientSource.NUTRITIONIX,
+    )
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def fetch_nutrients():
+    fetch_nutrients = AsyncMock(spec_set=FetchNutrients)
+    fetch_nutrients.execute.side_effect = lambda *, query, language: result(query)
+    return fetch_nutrients
+
+
+@pytest.fixture
+def stream_nutrients(config, logger, metrics, fetch_nutrients):
+    stream_nutrients = StreamNutrients(config, logger, metrics, fetch_nutrients)
+    return stream_nutrients
+
+
+@pytest.mark.anyio
+async def test_execute(metrics, fetch_nutrients, stream_nutrients):
+    items = [item async for item in stream_nutrients.execute(query="Apple, milk")]
+    assert items == [
+        IngredientNutrients(
+            index=0,
+            ingredient="apple",
+            nutrients=result("apple").nutrients,
+            source=NutrientSource.NUTRITIONIX,
+        ),
+        IngredientNutrients(
+            index=1,
+            ingredient="milk",
+            nutrients=result("milk").nutrients,
+            source=NutrientSource.NUTRITIONIX,
+        ),
+    ]
+    fetch_nutrients.execute.assert_any_call(query="apple", language=Language.EN_US)
+    assert metrics.get("nutrients_streamed_ingredients") == 2
+
+
+@pytest.mark.anyio
+async def test_execute_yields_fast_ingredients_first(fetch_nutrients, stream_nutrients):
+    async def execute(*, query, language):
+        if query == "apple":
+            await asyncio.sleep(0.05)
+        return result(query)
+
+    fetch_nutrients.execute.side_effect = execute
+    items = [item async for item in stream_nutrients.execute(query="apple, milk")]
+    assert [item.ingredient for item in items] == ["milk", "apple"]
+
+
+@pytest.mark.anyio
+async def test_execute_with_repeated_ingredients(fetch_nutrients, stream_nutrients):
+    items = [item async for item in stream_nutrients.execute(query="milk, milk")]
+    assert [item.index for item in items] == [0, 1]
+    fetch_nutrients.execute.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_execute_without_nutrients(logger, fetch_nutrients, stream_nutrients):
+    fetch_nutrients.execute.side_effect = [None, Exception("test_error")]
+    items = [item async for item in stream_nutrients.execute(query="apple, milk")]
+    assert [(item.nutrients, item.source) for item in items] == [
+        ([], None),
+        ([], None),
+    ]
+    logger.error.assert_called_once_with("Failed to fetch milk nutrients: test_error")
+
+
+@pytest.mark.anyio
+async def test_execute_cancels_pending_lookups(fetch_nutrients, stream_nutrients):
+    cancelled = []
+
+    async def execute(*, query, language):
+        if query == "apple":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(query)
+                raise
+        return result(query)
+
+    fetch_nutrients.execute.side_effect = execute
+    items = stream_nutrients.execute(query="apple, milk")
+    item = await items.__anext__()
+    assert item.ingredient == "milk"
+    await items.aclose()
+    await asyncio.sleep(0)
+    assert cancelled == ["apple"]
@@ -0,0 +1,175 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from fastapi_boilerplate.metrics import Metrics
+from fastapi_boilerplate.services.fetch_nutrients import FetchNutrients
+from fastapi_boilerplate.services.warm_up_nutrients import WarmUpNutrients
+from fastapi_boilerplate.types import (
+    Config,
+    FindTopLoggedQueries,
+    Language,
+    Logger,
+    NutrientSource,
+)
+from fastapi_boilerplate.utils.provider_calls import count_provider_call
+
+
+@pytest.fixture
+def config():
+    config = MagicMock(spec_set=Config)
+    config.warm_up.queries = 3
+    config.warm_up.provider_budget = 10
+    config.warm_up.timeout_seconds = 1
+    config.warm_up.concurrency = 1
+    return config
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    return metrics
+
+
+@pytest.fixture
+def find_top_logged_queries():
+    find_top_logged_queries = MagicMock(spec_set=FindTopLoggedQueries)
+    find_top_logged_queries.execute.return_value = [
+        ("apple", Language.EN_US),
+        ("milk", Language.EN_US),
+        ("maçã", Language.PT_BR),
+    ]
+    return find_top_logged_queries
+
+
+@pytest.fixture
+def fetch_nutrients():
+    async def fetch(**kwargs):
+        count_provider_call()
+
+    fetch_nutrients = MagicMock(spec_set=FetchNutrients)
+    fetch_nutrients.fetch = AsyncMock(side_effect=fetch)
+    fetch_nutrients.available_sources.return_value = [NutrientSource.NUTRITIONIX]
+    return fetch_nutrients
+
+
+@pytest.fixture
+def warm_up_nutrients(
+    config, logger, metrics, find_top_logged_queries, fetch_nutrients
+):
+    warm_up_nutrients = WarmUpNutrients(
+        config, logger, metrics, find_top_logged_queries, fetch_nutrients
+    )
+    return warm_up_nutrients
+
+
+@pytest.mark.anyio
+async def test_execute(
+    metrics, find_top_logged_queries, fetch_nutrients, warm_up_nutrients
+):
+    assert warm_up_nutrients.status == "warming"
+    await warm_up_nutrients.execute()
+    assert warm_up_nutrients.status == "ready"
+    find_top_logged_queries.execute.assert_called_once_with(limit=3)
+    assert [call.kwargs for call in fetch_nutrients.fetch.call_args_list] == [
+        {"query": "apple", "language": Language.EN_US},
+        {"query": "milk", "language": Language.EN_US},
+        {"query": "maçã", "language": Language.PT_BR},
+    ]
+    assert metrics.get("cache_warm_up_queries") == 3
+
+
+@pytest.mark.anyio
+async def test_execute_stops_at_provider_budget(
+    config, fetch_nutrients, warm_up_nutrients
+):
+    config.warm_up.provider_budget = 2
+    await warm_up_nutrients.execute()
+    assert fetch_nutrients.fetch.call_count == 2
+    assert warm_up_nutrients.status == "ready"
+
+
+@pytest.mark.anyio
+async def test_execute_reserves_provider_budget(
+    config, fetch_nutrients, warm_up_nutrients
+):
+    async def fetch(**kwargs):
+        await asyncio.sleep(0.01)
+        count_provider_call()
+
+    config.warm_up.provider_budget = 2
+    config.warm_up.concurrency = 3
+    fetch_nutrients.fetch.side_effect = fetch
+    await warm_up_nutrients.execute()
+    assert fetch_nutrients.fetch.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_execute_reserves_every_available_provider(
+    config, fetch_nutrients, warm_up_nutrients
+):
+    async def fetch(**kwargs):
+        await asyncio.sleep(0.01)
+        count_provider_call()
+
+    config.warm_up.provider_budget = 5
+    config.warm_up.concurrency = 3
+    fetch_nutrients.fetch.side_effect = fetch
+    fetch_nutrients.available_sources.return_value = [
+        NutrientSource.NUTRITIONIX,
+        NutrientSource.SPOONACULAR,
+        NutrientSource.EDAMAM,
+    ]
+    await warm_up_nutrients.execute()
+    assert fetch_nutrients.fetch.call_count == 1
+
+
+@pytest.mark.anyio
+async def test_execute_ignores_other_provider_requests(
+    config, metrics, fetch_nutrients, warm_up_nutrients
+):
+    async def fetch(**kwargs):
+        metrics.increment("provider_requests", 5, provider=NutrientSource.NUTRITIONIX)
+        count_provider_call()
+
+    config.warm_up.provider_budget = 3
+    fetch_nutrients.fetch.side_effect = fetch
+    await warm_up_nutrients.execute()
+    assert fetch_nutrients.fetch.call_count == 3
+
+
+@pytest.mark.anyio
+async def test_execute_times_out(config, logger, fetch_nutrients, warm_up_nutrients):
+    async def fetch(**kwargs):
+        await asyncio.sleep(1)
+
+    config.warm_up.timeout_seconds = 0.01
+    fetch_nutrients.fetch.side_effect = fetch
+    await warm_up_nutrients.execute()
+    assert warm_up_nutrients.status == "ready"
+    logger.warning.assert_called_once_with("Cache warm-up timed out")
+
+
+@pytest.mark.anyio
+async def test_execute_logs_errors(logger, find_top_logged_queries, warm_up_nutrients):
+    find_top_logged_queries.execute.side_effect = Exception("error")
+    await warm_up_nutrients.execute()
+    assert warm_up_nutrients.status == "ready"
+    logger.error.assert_called_once_with("Failed to warm up nutrients cache: error")
+
+
+def test_status_without_warm_up(
+    config, logger, metrics, find_top_logged_queries, fetch_nutrients
+):
+    config.warm_up.queries = 0
+    warm_up_nutrients = WarmUpNutrients(
+        config, logger, metrics, find_top_logged_queries, fetch_nutrients
+    )
+    assert warm_up_nutrients.status == "ready"
@@ -0,0 +1,49 @@
+import json
+
+from fastapi_boilerplate.tools.import_local_nutrients import (
+    import_local_nutrients,
+    row_to_nutrients,
+)
+from fastapi_boilerplate.types import Nutrients, NutrientSource
+from fastapi_boilerplate.utils.nutrients_index import NutrientsIndex
+
+
+def test_row_to_nutrients():
+    key, nutrients = row_to_nutrients(
+        {
+            "ingredient": "Green  Apples",
+            "name": "apple",
+            "quantity": "1",
+            "unit": "medium",
+            "calories_kcal": "95",
+            "weight_grams": "182",
+            "protein_grams": "0.47",
+            "sodium_mg": "",
+        }
+    )
+    assert key == "green apple"
+    assert nutrients == Nutrients(
+        name="apple",
+        quantity=1,
+        unit="medium",
+        calories_kcal=9500,
+        weight_grams=18200,
+        calories_kcal_per_gram=52,
+        protein_grams=47,
+        source=NutrientSource.LOCAL,
+    )
+    assert type(nutrients.quantity) is int
+
+
+def test_import_local_nutrients(tmp_path):
+    csv_path = tmp_path / "foods.csv"
+    csv_path.write_text("name,unit,calories_kcal\napple,medium,95\n")
+    json_path = tmp_path / "foods.json"
+    json_path.write_text(json.dumps([{"name": "milk", "calories_kcal": 122}]))
+    output = str(tmp_path / "nutrients.idx")
+    assert import_local_nutrients([str(csv_path)], output, merge=False) == 1
+    assert import_local_nutrients([str(json_path)], output, merge=True) == 2
+    index = NutrientsIndex(output)
+    assert index.get("apple").calories_kcal == 9500
+    assert index.get("milk").unit == "serving"
+    index.close()
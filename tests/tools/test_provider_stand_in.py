@@ -0,0 +1,178 @@
+from random import Random
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from fastapi_boilerplate.services.fetch_edamam_nutrients import EdamamResponse
+from fastapi_boilerplate.services.fetch_nutritionix_nutrients import NutritionixResponse
+from fastapi_boilerplate.services.fetch_spoonacular_nutrients import (
+    FetchSpoonacularNutrients,
+    SpoonacularIngredient,
+)
+from fastapi_boilerplate.tools.provider_stand_in import (
+    PROVIDERS,
+    Latency,
+    ProviderStandIn,
+    StandInConfig,
+    create_app,
+    parse_latency,
+    synthetic_payload,
+)
+from fastapi_boilerplate.types import Config, Logger, NutrientSource
+
+
+def stand_in(
+    *, recordings=None, synthesize=True, http_client=None, sleep=None, **kwargs
+):
+    return ProviderStandIn(
+        recordings=recordings or {},
+        configs={source: StandInConfig(**kwargs) for source in PROVIDERS},
+        synthesize=synthesize,
+        http_client=http_client,
+        random=Random(0),
+        sleep=sleep or AsyncMock(),
+    )
+
+
+def nutritionix(client: TestClient, query: str) -> httpx.Response:
+    return client.post("/nutritionix/v2/natural/nutrients", json={"query": query})
+
+
+def test_parse_latency():
+    assert parse_latency("fixed:50") == Latency(distribution="fixed", parameters=(50,))
+    assert parse_latency("lognormal:80:0.5").sample(Random(0)) > 0
+    with pytest.raises(ValueError):
+        parse_latency("uniform:10")
+
+
+def test_latency_sample():
+    assert Latency(distribution="fixed", parameters=(50,)).sample(Random(0)) == 0.05
+    assert (
+        0.01
+        <= Latency(distribution="uniform", parameters=(10, 20)).sample(Random(0))
+        <= 0.02
+    )
+
+
+def test_synthetic_payloads_decode():
+    NutritionixResponse(foods=[synthetic_payload(NutrientSource.NUTRITIONIX, "a")])
+    SpoonacularIngredient(**synthetic_payload(NutrientSource.SPOONACULAR, "a"))
+    EdamamResponse(ingredients=[synthetic_payload(NutrientSource.EDAMAM, "a")])
+    assert synthetic_payload(NutrientSource.NUTRITIONIX, "a") == synthetic_payload(
+        NutrientSource.NUTRITIONIX, "a"
+    )
+
+
+def test_synthetic_payloads_parse_the_ingredient():
+    one_cup = synthetic_payload(NutrientSource.NUTRITIONIX, "1 cup milk")
+    two_cups = synthetic_payload(NutrientSource.NUTRITIONIX, "2 cups milk")
+    assert (two_cups["food_name"], two_cups["serving_qty"]) == ("milk", 2)
+    assert two_cups["serving_unit"] == "cup"
+    assert two_cups["serving_weight_grams"] == 2 * one_cup["serving_weight_grams"]
+    spoonacular = synthetic_payload(NutrientSource.SPOONACULAR, "2 cups milk")
+    assert (spoonacular["name"], spoonacular["amount"]) == ("milk", 2)
+    assert spoonacular["nutrition"]["weightPerServing"]["amount"] == (
+        one_cup["serving_weight_grams"]
+    )
+    edamam = synthetic_payload(NutrientSource.EDAMAM, "100g chicken breasts")
+    assert edamam["parsed"][0]["food"] == "chicken breast"
+    assert edamam["parsed"][0]["weight"] == 100
+
+
+def test_replays_recorded_payloads():
+    recorded = {**synthetic_payload(NutrientSource.NUTRITIONIX, "x"), "food_name": "x"}
+    client = TestClient(
+        create_app(stand_in(recordings={"nutritionix": {"green apple": recorded}}))
+    )
+    response = nutritionix(client, "Green  Apple , milk")
+    assert response.status_code == 200
+    foods = NutritionixResponse(**response.json()).foods
+    assert [food.food_name for food in foods] == ["x", "milk"]
+
+
+def test_misses_unknown_ingredients():
+    client = TestClient(create_app(stand_in(synthesize=False)))
+    assert nutritionix(client, "apple").status_code == 404
+    response = client.get("/edamam/api/nutrition-data", params={"ingr": "apple"})
+    assert response.json() == {"ingredients": [{"text": "apple", "parsed": []}]}
+
+
+def test_injects_latency():
+    sleep = AsyncMock()
+    client = TestClient(
+        create_app(
+            stand_in(
+                sleep=sleep, latency=Latency(distribution="fixed", parameters=(80,))
+            )
+        )
+    )
+    nutritionix(client, "apple")
+    sleep.assert_awaited_once_with(0.08)
+
+
+def test_injects_errors():
+    client = TestClient(create_app(stand_in(error_rate=1)))
+    assert nutritionix(client, "apple").status_code == 503
+
+
+def test_injects_throttling():
+    client = TestClient(create_app(stand_in(throttle_rate=1)))
+    response = nutritionix(client, "apple")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_throttles_above_rate_limit():
+    client = TestClient(create_app(stand_in(rate_limit=1)))
+    assert nutritionix(client, "apple").status_code == 200
+    assert nutritionix(client, "apple").status_code == 429
+
+
+def test_records_upstream_payloads():
+    foods = [
+        synthetic_payload(NutrientSource.NUTRITIONIX, "apple"),
+        synthetic_payload(NutrientSource.NUTRITIONIX, "milk"),
+    ]
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"foods": foods})
+
+    provider_stand_in = stand_in(
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    client = TestClient(create_app(provider_stand_in))
+    response = nutritionix(client, "apple , milk")
+    assert response.json() == {"foods": foods}
+    assert str(requests[0].url) == (
+        "https://trackapi.nutritionix.com/v2/natural/nutrients"
+    )
+    assert provider_stand_in.recordings == {
+        "nutritionix": {"apple": foods[0], "milk": foods[1]}
+    }
+
+
+@pytest.mark.anyio
+async def test_serves_provider_services():
+    config = MagicMock(spec_set=Config)
+    config.spoonacular.base_url = "http://stand-in/spoonacular"
+    config.spoonacular.api_key = "key"
+    config.nutrients.fast_decoding = False
+    send_provider_request = AsyncMock()
+
+    async def execute(*, send):
+        response = await send(1)
+        response.raise_for_status()
+        return response
+
+    send_provider_request.execute.side_effect = execute
+    async with httpx.AsyncClient(app=create_app(stand_in())) as http_client:
+        fetch_spoonacular_nutrients = FetchSpoonacularNutrients(
+            config, MagicMock(spec_set=Logger), http_client, send_provider_request
+        )
+        result = await fetch_spoonacular_nutrients.execute(query="apple, milk")
+    assert [item.name for item in result] == ["apple", "milk"]
+    assert all(item.source == NutrientSource.SPOONACULAR for item in result)
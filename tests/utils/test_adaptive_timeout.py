@@ -0,0 +1,61 @@
+from fastapi_boilerplate.utils.adaptive_timeout import AdaptiveTimeout
+
+
+def adaptive_timeout(**kwargs):
+    return AdaptiveTimeout(
+        **{
+            "window_size": 10,
+            "min_samples": 3,
+            "percentile": 0.9,
+            "margin_seconds": 0.1,
+            "floor_seconds": 0.25,
+            "ceiling_seconds": 5,
+            **kwargs,
+        }
+    )
+
+
+def test_adaptive_timeout_without_enough_samples():
+    timeout = adaptive_timeout()
+    timeout.record(0.2)
+    timeout.record(0.2)
+    assert timeout.latency(0.5) is None
+    assert timeout.timeout() == 5
+
+
+def test_adaptive_timeout_uses_percentile_and_margin():
+    timeout = adaptive_timeout()
+    for latency in [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]:
+        timeout.record(latency)
+    assert timeout.latency(0.5) == 0.5
+    assert timeout.latency(0.9) == 0.9
+    assert timeout.timeout() == 1.0
+
+
+def test_adaptive_timeout_is_clamped_to_floor():
+    timeout = adaptive_timeout()
+    for _ in range(3):
+        timeout.record(0.01)
+    assert timeout.timeout() == 0.25
+
+
+def test_adaptive_timeout_is_clamped_to_ceiling():
+    timeout = adaptive_timeout()
+    for _ in range(3):
+        timeout.record(10)
+    assert timeout.timeout() == 5
+
+
+def test_adaptive_timeout_keeps_recent_samples():
+    timeout = adaptive_timeout(window_size=3)
+    for latency in [4, 4, 4, 0.5, 0.5, 0.5]:
+        timeout.record(latency)
+    assert timeout.timeout() == 0.6
+
+
+def test_adaptive_timeout_grows_after_timeouts():
+    timeout = adaptive_timeout()
+    for _ in range(3):
+        timeout.record(0.2)
+    timeout.record_timeout(0.3)
+    assert timeout.timeout() == 0.7
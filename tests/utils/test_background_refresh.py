@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from fastapi_boilerplate.utils.background_refresh import BackgroundRefresh
+from fastapi_boilerplate.utils.provider_calls import (
+    ProviderCalls,
+    count_provider_call,
+    current_provider_calls,
+)
+
+
+@pytest.mark.anyio
+async def test_schedule_limits_concurrency():
+    background_refresh = BackgroundRefresh(max_concurrency=2, max_pending=10)
+    running = []
+    peak = []
+
+    async def refresh():
+        running.append(True)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.pop()
+
+    for key in range(5):
+        assert background_refresh.schedule(key, refresh)
+    assert len(background_refresh) == 5
+    while len(background_refresh):
+        await asyncio.sleep(0.01)
+    assert len(peak) == 5
+    assert max(peak) == 2
+
+
+@pytest.mark.anyio
+async def test_schedule_skips_keys_being_refreshed():
+    background_refresh = BackgroundRefresh(max_concurrency=1, max_pending=10)
+    refreshed = []
+
+    async def refresh():
+        refreshed.append(True)
+
+    assert background_refresh.schedule("a", refresh)
+    assert not background_refresh.schedule("a", refresh)
+    assert "a" in background_refresh
+    await asyncio.sleep(0.01)
+    assert refreshed == [True]
+    assert "a" not in background_refresh
+
+
+@pytest.mark.anyio
+async def test_schedule_drops_refreshes_beyond_max_pending():
+    background_refresh = BackgroundRefresh(max_concurrency=1, max_pending=1)
+
+    async def refresh():
+        await asyncio.sleep(10)
+
+    assert background_refresh.schedule("a", refresh)
+    assert not background_refresh.schedule("b", refresh)
+    await background_refresh.close()
+    assert len(background_refresh) == 0
+
+
+@pytest.mark.anyio
+async def test_schedule_does_not_charge_the_scheduling_task():
+    background_refresh = BackgroundRefresh(max_concurrency=1, max_pending=10)
+    provider_calls = ProviderCalls()
+    token = current_provider_calls.set(provider_calls)
+    try:
+
+        async def refresh():
+            count_provider_call()
+
+        background_refresh.schedule("a", refresh)
+        await asyncio.sleep(0.01)
+    finally:
+        current_provider_calls.reset(token)
+    assert provider_calls.calls == 0
@@ -0,0 +1,33 @@
+from fastapi_boilerplate.utils.bloom_filter import BloomFilter
+
+
+def test_contains():
+    bloom_filter = BloomFilter(capacity=100, false_positive_rate=0.01)
+    bloom_filter.add("apple")
+    assert "apple" in bloom_filter
+    assert "milk" not in bloom_filter
+    assert len(bloom_filter) == 1
+
+
+def test_has_no_false_negatives():
+    bloom_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    keys = [f"food {i}" for i in range(1000)]
+    for key in keys:
+        bloom_filter.add(key)
+    assert all(key in bloom_filter for key in keys)
+
+
+def test_false_positive_rate():
+    bloom_filter = BloomFilter(capacity=1000, false_positive_rate=0.01)
+    for i in range(1000):
+        bloom_filter.add(f"food {i}")
+    false_positives = sum(f"other {i}" in bloom_filter for i in range(10000))
+    assert false_positives < 300
+
+
+def test_clear():
+    bloom_filter = BloomFilter(capacity=100, false_positive_rate=0.01)
+    bloom_filter.add("apple")
+    bloom_filter.clear()
+    assert "apple" not in bloom_filter
+    assert len(bloom_filter) == 0
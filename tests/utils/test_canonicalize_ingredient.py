@@ -0,0 +1,72 @@
+import pytest
+
+from fastapi_boilerplate.types import CanonicalIngredient
+from fastapi_boilerplate.utils.canonicalize_ingredient import (
+    canonicalize_ingredient,
+    format_ingredient,
+    ingredient_key,
+    singularize,
+)
+
+
+@pytest.mark.parametrize(
+    "ingredient, key",
+    [
+        ("2 tablespoons of sugars", "2 tbsp sugar"),
+        ("sugar 2 tbsp", "2 tbsp sugar"),
+        ("2tbsp sugar", "2 tbsp sugar"),
+        ("1 1/2 cups milk", "1.5 cup milk"),
+        ("½ cup blueberries", "0.5 cup blueberry"),
+        ("100g chicken breasts", "100 g chicken breast"),
+        ("a banana", "1 banana"),
+        ("milk 2", "milk 2"),
+        ("7up", "7up"),
+        ("chicken 65", "chicken 65"),
+        ("omega 3", "omega 3"),
+        ("quiches", "quiche"),
+        ("1/3 cup flour", "1/3 cup flour"),
+        ("1 1/3 cups flour", "1 1/3 cup flour"),
+        ("1 1/3 cup flour", "1 1/3 cup flour"),
+        ("0.333333 cup flour", "0.333333 cup flour"),
+        ("bananas", "banana"),
+        ("2 tbsp", "2 tbsp"),
+        ("1/0 apple", "1/0 apple"),
+        ("1" * 400 + " apple", "1" * 400 + " apple"),
+        ("1" * 5000 + " apple", "1" * 5000 + " apple"),
+        (
+            "9" * 308 + " " + "9" * 308 + " apple",
+            "9" * 308 + " " + "9" * 308 + " apple",
+        ),
+        ("vitamin b12", "vitamin b12"),
+    ],
+)
+def test_canonicalize_ingredient(ingredient, key):
+    assert format_ingredient(canonicalize_ingredient(ingredient)) == key
+
+
+def test_canonicalize_ingredient_parts():
+    assert canonicalize_ingredient("Milk 2 Cups") == CanonicalIngredient(
+        quantity=2, unit="cup", food="milk"
+    )
+
+
+def test_ingredient_key_ignores_overflowing_quantities():
+    assert ingredient_key("1" * 400 + " apple") == "1" * 400 + " apple"
+
+
+@pytest.mark.parametrize(
+    "word, singular",
+    [
+        ("tomatoes", "tomato"),
+        ("cherries", "cherry"),
+        ("cookies", "cookie"),
+        ("peaches", "peach"),
+        ("cheeses", "cheese"),
+        ("hummus", "hummus"),
+        ("swiss", "swiss"),
+        ("oats", "oats"),
+        ("egg", "egg"),
+    ],
+)
+def test_singularize(word, singular):
+    assert singularize(word) == singular
@@ -0,0 +1,138 @@
+from fastapi_boilerplate.types import CircuitState
+from fastapi_boilerplate.utils.circuit_breaker import CircuitBreaker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def circuit_breaker(clock=None):
+    return CircuitBreaker(
+        window_size=4,
+        minimum_calls=4,
+        failure_rate_threshold=0.5,
+        consecutive_timeouts_threshold=2,
+        open_seconds=10,
+        half_open_max_calls=2,
+        clock=clock or Clock(),
+    )
+
+
+def test_circuit_breaker_starts_closed():
+    breaker = circuit_breaker()
+    assert breaker.current_state() == CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_opens_on_failure_rate():
+    breaker = circuit_breaker()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.current_state() == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.current_state() == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_circuit_breaker_waits_for_minimum_calls():
+    breaker = circuit_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.current_state() == CircuitState.CLOSED
+
+
+def test_circuit_breaker_opens_on_consecutive_timeouts():
+    breaker = circuit_breaker()
+    breaker.record_failure(timeout=True)
+    breaker.record_success()
+    breaker.record_failure(timeout=True)
+    assert breaker.current_state() == CircuitState.CLOSED
+    breaker.record_failure(timeout=True)
+    assert breaker.current_state() == CircuitState.OPEN
+
+
+def test_circuit_breaker_lets_probes_through_when_half_open():
+    clock = Clock()
+    breaker = circuit_breaker(clock)
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    clock.now = 10
+    assert breaker.current_state() == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.current_state() == CircuitState.HALF_OPEN
+    breaker.record_success()
+    assert breaker.current_state() == CircuitState.CLOSED
+    assert breaker.failure_rate == 0
+
+
+def test_circuit_breaker_reopens_on_failed_probe():
+    clock = Clock()
+    breaker = circuit_breaker(clock)
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    clock.now = 10
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.current_state() == CircuitState.OPEN
+    assert breaker.snapshot()["open_seconds_remaining"] == 10
+
+
+def test_circuit_breaker_frees_ignored_probes():
+    clock = Clock()
+    breaker = circuit_breaker(clock)
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    clock.now = 10
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    breaker.record_ignored()
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_ignores_calls_started_before_half_open():
+    clock = Clock()
+    breaker = circuit_breaker(clock)
+    assert breaker.allow_request()
+    generation = breaker.generation
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    clock.now = 10
+    assert breaker.current_state() == CircuitState.HALF_OPEN
+    breaker.record_success(generation=generation)
+    breaker.record_success(generation=generation)
+    assert breaker.current_state() == CircuitState.HALF_OPEN
+    breaker.record_failure(generation=generation)
+    assert breaker.current_state() == CircuitState.HALF_OPEN
+
+
+def test_circuit_breaker_ignores_failures_while_open():
+    clock = Clock()
+    breaker = circuit_breaker(clock)
+    breaker.record_failure(timeout=True)
+    breaker.record_failure(timeout=True)
+    clock.now = 5
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.current_state() == CircuitState.HALF_OPEN
+
+
+def test_circuit_breaker_snapshot():
+    breaker = circuit_breaker()
+    breaker.record_success()
+    breaker.record_failure(timeout=True)
+    assert breaker.snapshot() == {
+        "state": "closed",
+        "failure_rate": 0.5,
+        "calls": 2,
+        "consecutive_timeouts": 1,
+        "open_seconds_remaining": 0,
+    }
@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fastapi_boilerplate.types import HttpClientConfig, Logger
+from fastapi_boilerplate.utils.create_http_client import create_http_client
+
+
+@pytest.fixture
+def logger():
+    logger = MagicMock(spec_set=Logger)
+    return logger
+
+
+@pytest.mark.anyio
+async def test_create_http_client(logger):
+    http_client = create_http_client(
+        HttpClientConfig(
+            max_connections=7,
+            max_keepalive_connections=3,
+            keepalive_expiry_seconds=2,
+            read_timeout_seconds=4,
+        ),
+        logger,
+    )
+    pool = http_client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 2
+    assert http_client.timeout.read == 4
+    logger.warning.assert_not_called()
+    await http_client.aclose()
+
+
+@pytest.mark.anyio
+async def test_create_http_client_without_h2(logger):
+    with patch(
+        "fastapi_boilerplate.utils.create_http_client.find_spec", return_value=None
+    ):
+        http_client = create_http_client(HttpClientConfig(http2=True), logger)
+    assert http_client._transport._pool._http2 is False
+    logger.warning.assert_called_once()
+    await http_client.aclose()
@@ -0,0 +1,72 @@
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+
+from fastapi_boilerplate.types import IncrementProviderCalls
+from fastapi_boilerplate.utils.daily_budget import DailyBudget
+
+
+class Today:
+    def __init__(self):
+        self.day = date(2024, 1, 1)
+
+    def __call__(self) -> date:
+        return self.day
+
+
+def test_daily_budget_without_limit():
+    daily_budget = DailyBudget(limit=0)
+    assert daily_budget.remaining is None
+    assert daily_budget.remaining_ratio is None
+    assert daily_budget.try_consume()
+    assert daily_budget.has_budget()
+
+
+def test_daily_budget_with_limit():
+    daily_budget = DailyBudget(limit=2, today=Today())
+    assert daily_budget.try_consume()
+    assert daily_budget.remaining == 1
+    assert daily_budget.remaining_ratio == 0.5
+    assert daily_budget.try_consume()
+    assert daily_budget.remaining == 0
+    assert not daily_budget.has_budget()
+    assert not daily_budget.try_consume()
+
+
+def test_daily_budget_resets_every_day():
+    today = Today()
+    daily_budget = DailyBudget(limit=1, today=today)
+    daily_budget.try_consume()
+    assert not daily_budget.has_budget()
+    today.day = date(2024, 1, 2)
+    assert daily_budget.remaining == 1
+
+
+@pytest.mark.anyio
+async def test_daily_budget_counts_in_mongo():
+    increment_provider_calls = MagicMock(spec_set=IncrementProviderCalls)
+    increment_provider_calls.execute.side_effect = [2, 3]
+    daily_budget = DailyBudget(
+        limit=2,
+        name="nutritionix",
+        increment_provider_calls=increment_provider_calls,
+        today=Today(),
+    )
+    assert await daily_budget.consume()
+    assert daily_budget.remaining == 0
+    assert not await daily_budget.consume()
+    increment_provider_calls.execute.assert_called_once_with(
+        key="nutritionix:2024-01-01"
+    )
+
+
+@pytest.mark.anyio
+async def test_daily_budget_counts_locally_when_mongo_fails():
+    increment_provider_calls = MagicMock(spec_set=IncrementProviderCalls)
+    increment_provider_calls.execute.side_effect = Exception("down")
+    daily_budget = DailyBudget(
+        limit=2, increment_provider_calls=increment_provider_calls
+    )
+    assert await daily_budget.consume()
+    assert daily_budget.remaining == 1
@@ -0,0 +1,69 @@
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from fastapi_boilerplate.utils.fast_decoder import MalformedPayloadError, fast_decoder
+
+
+class Item(BaseModel):
+    name: str
+    amount: float
+    count: int
+    unit: str | None = None
+
+
+class Payload(BaseModel):
+    items: List[Item]
+
+
+decode_payload = fast_decoder(Payload)
+
+
+def test_fast_decoder():
+    result = decode_payload(
+        b'{"items": [{"name": "apple", "amount": 1, "count": 2.0, "extra": [1]}]}'
+    )
+    assert result.items[0] == ("apple", 1.0, 2, None)
+    assert result.items[0].name == "apple"
+    assert isinstance(result.items[0].amount, float)
+    assert isinstance(result.items[0].count, int)
+
+
+def test_fast_decoder_with_optional_field():
+    result = decode_payload(
+        b'{"items": [{"name": "apple", "amount": 1, "count": 2, "unit": null}]}'
+    )
+    assert result.items[0].unit is None
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"not json",
+        b"[]",
+        b'{"items": {}}',
+        b'{"items": [{"amount": 1, "count": 2}]}',
+        b'{"items": [{"name": "apple", "amount": "1", "count": 2}]}',
+        b'{"items": [{"name": "apple", "amount": true, "count": 2}]}',
+        b'{"items": [{"name": "apple", "amount": 1, "count": 2.5}]}',
+        b'{"items": [{"name": null, "amount": 1, "count": 2}]}',
+    ],
+)
+def test_fast_decoder_with_malformed_payload(content):
+    with pytest.raises(MalformedPayloadError):
+        decode_payload(content)
+
+
+def test_fast_decoder_with_unsupported_annotation():
+    with pytest.raises(TypeError):
+        fast_decoder(dict)
+
+
+def test_fast_decoder_reports_path_of_malformed_field():
+    with pytest.raises(MalformedPayloadError) as e:
+        decode_payload(
+            b'{"items": [{"name": "apple", "amount": 1, "count": 2},'
+            b' {"name": "milk", "amount": "1", "count": 2}]}'
+        )
+    assert str(e.value) == "$.items[1].amount is not a number"
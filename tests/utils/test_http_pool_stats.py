@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock
+
+import pytest
+from httpx import AsyncClient
+
+from fastapi_boilerplate.utils.http_pool_stats import http_pool_stats
+
+
+@pytest.mark.anyio
+async def test_http_pool_stats_without_connections():
+    http_client = AsyncClient()
+    assert http_pool_stats(http_client) == {
+        "connections": 0,
+        "idle_connections": 0,
+        "active_connections": 0,
+        "waiting_requests": 0,
+    }
+    await http_client.aclose()
+
+
+def test_http_pool_stats_with_connections():
+    idle = MagicMock()
+    idle.is_idle.return_value = True
+    active = MagicMock()
+    active.is_idle.return_value = False
+    http_client = MagicMock()
+    http_client._transport._pool.connections = [idle, active]
+    http_client._transport._pool._requests = [
+        MagicMock(connection=active),
+        MagicMock(connection=None),
+    ]
+    assert http_pool_stats(http_client) == {
+        "connections": 2,
+        "idle_connections": 1,
+        "active_connections": 1,
+        "waiting_requests": 1,
+    }
+
+
+def test_http_pool_stats_without_pool():
+    http_client = MagicMock()
+    http_client._transport = object()
+    assert http_pool_stats(http_client) == {}
@@ -0,0 +1,22 @@
+from httpx import Timeout
+
+from fastapi_boilerplate.types import HttpClientConfig
+from fastapi_boilerplate.utils.http_timeout import http_timeout
+
+
+def test_http_timeout():
+    http_client_config = HttpClientConfig(
+        connect_timeout_seconds=1, read_timeout_seconds=2, pool_timeout_seconds=3
+    )
+    assert http_timeout(http_client_config) == Timeout(
+        connect=1, read=2, write=2, pool=3
+    )
+
+
+def test_http_timeout_with_read_timeout():
+    http_client_config = HttpClientConfig(
+        connect_timeout_seconds=1, read_timeout_seconds=2, pool_timeout_seconds=3
+    )
+    assert http_timeout(http_client_config, 0.5) == Timeout(
+        connect=1, read=0.5, write=0.5, pool=3
+    )
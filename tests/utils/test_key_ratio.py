@@ -0,0 +1,15 @@
+from fastapi_boilerplate.utils.key_ratio import KeyRatio
+
+
+def test_key_ratio():
+    key_ratio = KeyRatio(window_size=4)
+    assert key_ratio.ratio() == 1.0
+    key_ratio.add("Apple", "apple")
+    key_ratio.add("apples", "apple")
+    key_ratio.add("apples", "apple")
+    assert key_ratio.ratio() == 2.0
+    key_ratio.add("milk", "milk")
+    key_ratio.add("Milk ", "milk")
+    assert key_ratio.ratio() == 2.0
+    key_ratio.add("bread", "bread")
+    assert key_ratio.ratio() == 2.0
@@ -0,0 +1,94 @@
+from fastapi_boilerplate.utils.lru_cache import LruCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_get_with_missing_key():
+    lru_cache = LruCache(max_size=2, ttl_seconds=10)
+    assert lru_cache.get("a") is None
+
+
+def test_lru_cache_set_and_get():
+    lru_cache = LruCache(max_size=2, ttl_seconds=10)
+    assert lru_cache.set("a", 1) == 0
+    assert lru_cache.get("a") == 1
+    assert len(lru_cache) == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    lru_cache = LruCache(max_size=2, ttl_seconds=10)
+    lru_cache.set("a", 1)
+    lru_cache.set("b", 2)
+    lru_cache.get("a")
+    assert lru_cache.set("c", 3) == 1
+    assert lru_cache.get("a") == 1
+    assert lru_cache.get("b") is None
+    assert lru_cache.get("c") == 3
+
+
+def test_lru_cache_expires_entries():
+    clock = Clock()
+    lru_cache = LruCache(max_size=2, ttl_seconds=10, clock=clock)
+    lru_cache.set("a", 1)
+    clock.now = 9.9
+    assert lru_cache.get("a") == 1
+    clock.now = 10
+    assert lru_cache.get("a") is None
+    assert len(lru_cache) == 0
+
+
+def test_lru_cache_set_refreshes_ttl():
+    clock = Clock()
+    lru_cache = LruCache(max_size=2, ttl_seconds=10, clock=clock)
+    lru_cache.set("a", 1)
+    clock.now = 5
+    lru_cache.set("a", 2)
+    clock.now = 12
+    assert lru_cache.get("a") == 2
+
+
+def test_lru_cache_delete():
+    lru_cache = LruCache(max_size=2, ttl_seconds=10)
+    lru_cache.set("a", 1)
+    lru_cache.delete("a")
+    lru_cache.delete("b")
+    assert lru_cache.get("a") is None
+
+
+def test_lru_cache_age():
+    clock = Clock()
+    lru_cache = LruCache(max_size=2, ttl_seconds=10, clock=clock)
+    assert lru_cache.age("a") is None
+    lru_cache.set("a", 1)
+    clock.now = 4
+    assert lru_cache.age("a") == 4
+    clock.now = 10
+    assert lru_cache.age("a") is None
+
+
+def test_lru_cache_keys():
+    clock = Clock()
+    lru_cache = LruCache(max_size=3, ttl_seconds=10, clock=clock)
+    lru_cache.set("a", 1)
+    clock.now = 5
+    lru_cache.set("b", 2)
+    lru_cache.set("c", 3)
+    lru_cache.get("b")
+    assert lru_cache.keys() == ["a", "c", "b"]
+    clock.now = 10
+    assert lru_cache.keys() == ["c", "b"]
+
+
+def test_lru_cache_set_with_ttl_and_age():
+    clock = Clock()
+    lru_cache = LruCache(max_size=2, ttl_seconds=10, clock=clock)
+    lru_cache.set("a", 1, ttl_seconds=2, age_seconds=30)
+    assert lru_cache.age("a") == 30
+    clock.now = 2
+    assert lru_cache.get("a") is None
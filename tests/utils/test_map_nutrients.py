@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+from fastapi_boilerplate.types import NutrientField, Nutrients, NutrientSource
+from fastapi_boilerplate.utils.map_nutrients import (
+    convert_column,
+    map_nutrients,
+    resolve,
+)
+
+
+def test_resolve():
+    item = SimpleNamespace(nutrients={"PROCNT": SimpleNamespace(quantity=1.5)})
+    assert resolve(item, ("nutrients", "PROCNT", "quantity")) == 1.5
+    assert resolve(item, ("nutrients", "FAT", "quantity")) is None
+    assert resolve(item, ("missing",)) is None
+
+
+def test_convert_column():
+    assert convert_column(
+        [1000000, 1000, 1, None, 1], ["µg", "mg", "g", "g", "oz"], "g"
+    ) == [1, 1, 1, None, None]
+
+
+def test_convert_column_to_milligrams():
+    assert convert_column([5, 5], ["mg", "g"], "mg") == [5, None]
+
+
+def test_map_nutrients():
+    items = [
+        {"kcal": 100.111, "weight": 50, "protein": {"amount": 500, "unit": "mg"}},
+        {"kcal": 0, "weight": 10, "protein": None},
+    ]
+    fields = [
+        NutrientField(target="calories_kcal", path=("kcal",), unit="kcal"),
+        NutrientField(target="weight_grams", path=("weight",), unit="g"),
+        NutrientField(
+            target="protein_grams",
+            path=("protein", "amount"),
+            unit=("protein", "unit"),
+        ),
+    ]
+    result = map_nutrients(
+        items=items,
+        fields=fields,
+        columns={
+            "name": ["apple", "water"],
+            "quantity": [1, 2],
+            "unit": ["medium", "cup"],
+        },
+        source=NutrientSource.EDAMAM,
+    )
+    assert result == [
+        Nutrients(
+            name="apple",
+            quantity=1,
+            unit="medium",
+            calories_kcal=10011,
+            weight_grams=5000,
+            calories_kcal_per_gram=200,
+            protein_grams=50,
+            source=NutrientSource.EDAMAM,
+        ),
+        Nutrients(
+            name="water",
+            quantity=2,
+            unit="cup",
+            calories_kcal=None,
+            weight_grams=1000,
+            source=NutrientSource.EDAMAM,
+        ),
+    ]
+
+
+def test_map_nutrients_without_items():
+    result = map_nutrients(
+        items=[],
+        fields=[NutrientField(target="calories_kcal", path=("kcal",), unit="kcal")],
+        columns={"name": [], "quantity": [], "unit": []},
+        source=NutrientSource.EDAMAM,
+    )
+    assert result == []
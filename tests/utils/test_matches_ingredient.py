@@ -0,0 +1,16 @@
+from fastapi_boilerplate.utils.matches_ingredient import matches_ingredient
+
+
+def test_matches_ingredient_with_shared_word():
+    assert matches_ingredient("whole milk", "1 cup milk")
+    assert matches_ingredient("egg", "2 eggs")
+
+
+def test_matches_ingredient_with_abbreviated_word():
+    assert matches_ingredient("macaroni and cheese", "mac and cheese")
+    assert matches_ingredient("macaroni", "mac and cheese")
+
+
+def test_matches_ingredient_without_shared_word():
+    assert not matches_ingredient("cheese", "xyzgarbage")
+    assert not matches_ingredient("cup of tea", "1 cup flour")
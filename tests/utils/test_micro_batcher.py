@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from fastapi_boilerplate.utils.micro_batcher import MicroBatcher
+
+
+def counted(delay: float = 0.01):
+    calls = []
+
+    async def call(items):
+        calls.append(items)
+        await asyncio.sleep(delay)
+        return {item: item.upper() for item in items}
+
+    return call, calls
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_batches_concurrent_items():
+    micro_batcher = MicroBatcher(window_seconds=0.01, max_size=10)
+    call, calls = counted()
+    results = await asyncio.gather(
+        micro_batcher.execute("key", "a", call),
+        micro_batcher.execute("key", "b", call),
+        micro_batcher.execute("key", "a", call),
+    )
+    assert results == ["A", "B", "A"]
+    assert calls == [["a", "b"]]
+    assert "key" not in micro_batcher
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_does_not_batch_different_keys():
+    micro_batcher = MicroBatcher(window_seconds=0.01, max_size=10)
+    call, calls = counted()
+    await asyncio.gather(
+        micro_batcher.execute("key_1", "a", call),
+        micro_batcher.execute("key_2", "b", call),
+    )
+    assert calls == [["a"], ["b"]]
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_sends_full_batches_at_once():
+    micro_batcher = MicroBatcher(window_seconds=10, max_size=2)
+    call, calls = counted()
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            micro_batcher.execute("key", "a", call),
+            micro_batcher.execute("key", "b", call),
+        ),
+        timeout=1,
+    )
+    assert results == ["A", "B"]
+    assert calls == [["a", "b"]]
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_starts_new_batch_once_full():
+    micro_batcher = MicroBatcher(window_seconds=0.01, max_size=2)
+    call, calls = counted()
+    await asyncio.gather(
+        micro_batcher.execute("key", "a", call),
+        micro_batcher.execute("key", "b", call),
+        micro_batcher.execute("key", "c", call),
+    )
+    assert calls == [["a", "b"], ["c"]]
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_survives_cancelled_caller():
+    micro_batcher = MicroBatcher(window_seconds=0.01, max_size=10)
+    call, calls = counted()
+    first = asyncio.create_task(micro_batcher.execute("key", "a", call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(micro_batcher.execute("key", "b", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await follower == "B"
+    assert first.cancelled()
+    assert calls == [["a", "b"]]
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_shares_exceptions():
+    micro_batcher = MicroBatcher(window_seconds=0.01, max_size=10)
+
+    async def call(items):
+        raise ValueError("test_error")
+
+    results = await asyncio.gather(
+        micro_batcher.execute("key", "a", call),
+        micro_batcher.execute("key", "b", call),
+        return_exceptions=True,
+    )
+    assert [str(result) for result in results] == ["test_error", "test_error"]
@@ -0,0 +1,25 @@
+from fastapi_boilerplate.utils.normalize_query import normalize_query
+
+
+def test_normalize_query_with_single_ingredient():
+    assert normalize_query("apple") == "apple"
+
+
+def test_normalize_query_with_casing():
+    assert normalize_query("Green Apple") == "green apple"
+
+
+def test_normalize_query_with_whitespace():
+    assert normalize_query("  green \t apple  ") == "green apple"
+
+
+def test_normalize_query_with_commas():
+    assert normalize_query("apple,banana ,  milk") == "apple, banana, milk"
+
+
+def test_normalize_query_with_empty_ingredients():
+    assert normalize_query("apple,, ,banana,") == "apple, banana"
+
+
+def test_normalize_query_with_empty_query():
+    assert normalize_query(" ") == ""
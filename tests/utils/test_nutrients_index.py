@@ -0,0 +1,68 @@
+import pytest
+
+from fastapi_boilerplate.types import Nutrients, NutrientSource
+from fastapi_boilerplate.utils.nutrients_index import (
+    NutrientsIndex,
+    NutrientsIndexError,
+    write_nutrients_index,
+)
+
+
+def nutrients(name: str, calories_kcal: int = 100):
+    return Nutrients(
+        name=name,
+        quantity=2,
+        unit="cup",
+        calories_kcal=calories_kcal,
+        protein_grams=150,
+        source=NutrientSource.NUTRITIONIX,
+    )
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    index_path = str(tmp_path / "nutrients.idx")
+    return index_path
+
+
+def test_write_nutrients_index(index_path):
+    count = write_nutrients_index(
+        index_path,
+        [
+            ("milk", nutrients("milk")),
+            ("apple", nutrients("apple")),
+            ("crème brûlée", nutrients("crème brûlée")),
+            ("milk", nutrients("milk", calories_kcal=200)),
+        ],
+    )
+    assert count == 3
+    index = NutrientsIndex(index_path)
+    assert len(index) == 3
+    assert index.get("apple") == nutrients("apple")
+    assert type(index.get("apple").quantity) is int
+    assert index.get("milk") == nutrients("milk", calories_kcal=200)
+    assert index.get("crème brûlée") == nutrients("crème brûlée")
+    assert index.get("bread") is None
+    assert [key for key, _ in index.items()] == ["apple", "crème brûlée", "milk"]
+    index.close()
+
+
+def test_write_empty_nutrients_index(index_path):
+    assert write_nutrients_index(index_path, []) == 0
+    index = NutrientsIndex(index_path)
+    assert index.get("apple") is None
+    index.close()
+
+
+def test_write_nutrients_index_removes_temporary_file(tmp_path, index_path):
+    with pytest.raises(NutrientsIndexError):
+        write_nutrients_index(index_path, [("x" * 0xFFFF, nutrients("apple"))])
+    write_nutrients_index(index_path, [("apple", nutrients("apple"))])
+    assert [path.name for path in tmp_path.iterdir()] == ["nutrients.idx"]
+
+
+def test_nutrients_index_with_invalid_file(index_path):
+    with open(index_path, "wb") as file:
+        file.write(b"not an index")
+    with pytest.raises(NutrientsIndexError):
+        NutrientsIndex(index_path)
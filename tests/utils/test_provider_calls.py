@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from fastapi_boilerplate.utils.provider_calls import (
+    ProviderCalls,
+    count_provider_call,
+    current_provider_calls,
+)
+
+
+async def call() -> None:
+    count_provider_call()
+
+
+@pytest.mark.anyio
+async def test_count_provider_call():
+    async def count() -> int:
+        provider_calls = ProviderCalls()
+        current_provider_calls.set(provider_calls)
+        await call()
+        await asyncio.gather(call(), call())
+        return provider_calls.calls
+
+    await call()
+    assert await asyncio.create_task(count()) == 3
+    assert current_provider_calls.get() is None
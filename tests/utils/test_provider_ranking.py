@@ -0,0 +1,122 @@
+from fastapi_boilerplate.types import NutrientSource
+from fastapi_boilerplate.utils.provider_ranking import ProviderRanking
+
+SOURCES = [
+    NutrientSource.NUTRITIONIX,
+    NutrientSource.SPOONACULAR,
+    NutrientSource.EDAMAM,
+]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def provider_ranking(**kwargs):
+    return ProviderRanking(
+        **{
+            "pinned_order": [],
+            "weights": {},
+            "costs_per_call": {},
+            "ewma_alpha": 0.5,
+            "recovery_half_life_seconds": 60,
+            **kwargs,
+        }
+    )
+
+
+def test_order_keeps_usual_order_without_calls():
+    assert provider_ranking().order(SOURCES) == SOURCES
+
+
+def test_order_demotes_failing_providers():
+    ranking = provider_ranking()
+    ranking.record(NutrientSource.NUTRITIONIX, seconds=0.5, failed=True, empty=True)
+    assert ranking.order(SOURCES) == [
+        NutrientSource.SPOONACULAR,
+        NutrientSource.EDAMAM,
+        NutrientSource.NUTRITIONIX,
+    ]
+
+
+def test_order_demotes_providers_failing_fast():
+    ranking = provider_ranking(ewma_alpha=0.2)
+    for source in SOURCES:
+        ranking.record(source, seconds=0.3, failed=False, empty=False)
+    for _ in range(2):
+        ranking.record(
+            NutrientSource.NUTRITIONIX, seconds=0.02, failed=True, empty=True
+        )
+    assert ranking.order(SOURCES)[-1] == NutrientSource.NUTRITIONIX
+    assert ranking.score(NutrientSource.NUTRITIONIX) < 0.7 * ranking.score(
+        NutrientSource.SPOONACULAR
+    )
+
+
+def test_order_does_not_borrow_latency_of_failing_providers():
+    ranking = provider_ranking(ewma_alpha=0.2)
+    ranking.record(NutrientSource.NUTRITIONIX, seconds=0.3, failed=False, empty=False)
+    ranking.record(NutrientSource.SPOONACULAR, seconds=0.3, failed=False, empty=False)
+    for _ in range(5):
+        ranking.record(
+            NutrientSource.NUTRITIONIX, seconds=0.02, failed=True, empty=True
+        )
+    assert ranking.order(SOURCES) == [
+        NutrientSource.SPOONACULAR,
+        NutrientSource.EDAMAM,
+        NutrientSource.NUTRITIONIX,
+    ]
+
+
+def test_order_demotes_empty_answers():
+    ranking = provider_ranking()
+    ranking.record(NutrientSource.NUTRITIONIX, seconds=0.5, failed=False, empty=True)
+    assert ranking.order(SOURCES)[-1] == NutrientSource.NUTRITIONIX
+
+
+def test_order_promotes_fast_providers():
+    ranking = provider_ranking()
+    ranking.record(NutrientSource.EDAMAM, seconds=0.1, failed=False, empty=False)
+    ranking.record(NutrientSource.NUTRITIONIX, seconds=2, failed=False, empty=False)
+    assert ranking.order(SOURCES) == [
+        NutrientSource.EDAMAM,
+        NutrientSource.SPOONACULAR,
+        NutrientSource.NUTRITIONIX,
+    ]
+
+
+def test_order_with_weights_and_costs():
+    ranking = provider_ranking(
+        weights={NutrientSource.EDAMAM: 3},
+        costs_per_call={NutrientSource.NUTRITIONIX: 2},
+    )
+    assert ranking.order(SOURCES) == [
+        NutrientSource.EDAMAM,
+        NutrientSource.SPOONACULAR,
+        NutrientSource.NUTRITIONIX,
+    ]
+
+
+def test_order_with_pinned_order():
+    ranking = provider_ranking(pinned_order=[NutrientSource.EDAMAM])
+    ranking.record(NutrientSource.EDAMAM, seconds=0.5, failed=True, empty=True)
+    assert ranking.order(SOURCES) == [
+        NutrientSource.EDAMAM,
+        NutrientSource.NUTRITIONIX,
+        NutrientSource.SPOONACULAR,
+    ]
+
+
+def test_score_recovers_without_calls():
+    clock = Clock()
+    ranking = provider_ranking(clock=clock)
+    ranking.record(NutrientSource.NUTRITIONIX, seconds=0.5, failed=True, empty=True)
+    failed_score = ranking.score(NutrientSource.NUTRITIONIX)
+    clock.now = 60
+    assert ranking.score(NutrientSource.NUTRITIONIX) == 1.5 * failed_score
+    clock.now = 6000
+    assert ranking.order(SOURCES) == SOURCES
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from fastapi_boilerplate.utils.daily_budget import DailyBudget
+from fastapi_boilerplate.utils.provider_scheduler import (
+    ProviderScheduler,
+    ProviderThrottledError,
+)
+from fastapi_boilerplate.utils.token_bucket import TokenBucket
+
+
+def provider_scheduler(
+    *, rate_per_second=100, capacity=100, limit=0, max_concurrency=10, max_wait=0.05
+):
+    return ProviderScheduler(
+        token_bucket=TokenBucket(rate_per_second=rate_per_second, capacity=capacity),
+        daily_budget=DailyBudget(limit=limit),
+        max_concurrency=max_concurrency,
+        max_wait_seconds=max_wait,
+    )
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_schedules_calls():
+    scheduler = provider_scheduler(limit=2)
+    async with scheduler.schedule():
+        pass
+    assert scheduler.daily_budget.remaining == 1
+    assert scheduler.remaining_quota() == 0.5
+    assert not scheduler.semaphore.locked()
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_load():
+    scheduler = provider_scheduler(max_concurrency=4)
+    assert scheduler.load() == 0
+    async with scheduler.schedule():
+        assert scheduler.load() == 0.25
+    assert scheduler.load() == 0
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_rejects_without_daily_budget():
+    scheduler = provider_scheduler(limit=1)
+    async with scheduler.schedule():
+        pass
+    assert not scheduler.has_budget()
+    with pytest.raises(ProviderThrottledError) as error:
+        async with scheduler.schedule():
+            pass
+    assert error.value.reason == "daily_quota"
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_waits_for_tokens():
+    scheduler = provider_scheduler(rate_per_second=50, capacity=1)
+    async with scheduler.schedule():
+        pass
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    async with scheduler.schedule():
+        pass
+    assert loop.time() - started_at >= 0.015
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_rejects_when_rate_limited():
+    scheduler = provider_scheduler(rate_per_second=1, capacity=1)
+    async with scheduler.schedule():
+        pass
+    with pytest.raises(ProviderThrottledError) as error:
+        async with scheduler.schedule():
+            pass
+    assert error.value.reason == "rate"
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_limits_concurrency():
+    scheduler = provider_scheduler(max_concurrency=1, max_wait=0.01)
+    async with scheduler.schedule():
+        with pytest.raises(ProviderThrottledError) as error:
+            async with scheduler.schedule():
+                pass
+    assert error.value.reason == "concurrency"
+    async with scheduler.schedule():
+        pass
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_throttled():
+    scheduler = provider_scheduler(rate_per_second=1, capacity=5)
+    scheduler.throttled()
+    with pytest.raises(ProviderThrottledError):
+        async with scheduler.schedule():
+            pass
+
+
+@pytest.mark.anyio
+async def test_provider_scheduler_without_limits():
+    scheduler = ProviderScheduler(
+        token_bucket=None,
+        daily_budget=DailyBudget(limit=0),
+        max_concurrency=None,
+        max_wait_seconds=0.05,
+    )
+    async with scheduler.schedule():
+        assert scheduler.load() == 0
+    assert scheduler.remaining_quota() is None
+    scheduler.throttled()
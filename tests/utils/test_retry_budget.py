@@ -0,0 +1,25 @@
+from fastapi_boilerplate.utils.retry_budget import RetryBudget
+
+
+def test_retry_budget_starts_full():
+    retry_budget = RetryBudget(ratio=0.1, capacity=2)
+    assert retry_budget.try_withdraw()
+    assert retry_budget.try_withdraw()
+    assert not retry_budget.try_withdraw()
+
+
+def test_retry_budget_allows_a_share_of_calls():
+    retry_budget = RetryBudget(ratio=0.1, capacity=1)
+    retry_budget.try_withdraw()
+    retries = 0
+    for _ in range(100):
+        retry_budget.deposit()
+        retries += retry_budget.try_withdraw()
+    assert retries == 10
+
+
+def test_retry_budget_is_capped():
+    retry_budget = RetryBudget(ratio=0.5, capacity=1)
+    for _ in range(10):
+        retry_budget.deposit()
+    assert retry_budget.tokens == 1
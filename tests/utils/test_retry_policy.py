@@ -0,0 +1,48 @@
+from fastapi_boilerplate.utils.retry_budget import RetryBudget
+from fastapi_boilerplate.utils.retry_policy import RetryPolicy
+
+
+def retry_policy(**kwargs):
+    return RetryPolicy(
+        **{
+            "max_attempts": 4,
+            "base_delay_seconds": 0.1,
+            "max_delay_seconds": 0.3,
+            "time_budget_seconds": 1,
+            "retry_budget": RetryBudget(ratio=0.1, capacity=10),
+            "random": lambda: 1.0,
+            **kwargs,
+        }
+    )
+
+
+def test_backoff_grows_exponentially_up_to_max_delay():
+    policy = retry_policy()
+    assert policy.backoff(attempt=1, elapsed_seconds=0) == 0.1
+    assert policy.backoff(attempt=2, elapsed_seconds=0) == 0.2
+    assert policy.backoff(attempt=3, elapsed_seconds=0) == 0.3
+
+
+def test_backoff_is_jittered():
+    policy = retry_policy(random=lambda: 0.5)
+    assert policy.backoff(attempt=2, elapsed_seconds=0) == 0.1
+
+
+def test_backoff_stops_after_max_attempts():
+    policy = retry_policy()
+    assert policy.backoff(attempt=4, elapsed_seconds=0) is None
+
+
+def test_backoff_stops_at_time_budget():
+    policy = retry_policy()
+    assert policy.backoff(attempt=1, elapsed_seconds=0.85) == 0.1
+    assert policy.backoff(attempt=1, elapsed_seconds=0.95) is None
+
+
+def test_backoff_stops_without_retry_budget():
+    policy = retry_policy(retry_budget=RetryBudget(ratio=0.1, capacity=1))
+    assert policy.backoff(attempt=1, elapsed_seconds=0) == 0.1
+    assert policy.backoff(attempt=1, elapsed_seconds=0) is None
+    for _ in range(10):
+        policy.start()
+    assert policy.backoff(attempt=1, elapsed_seconds=0) == 0.1
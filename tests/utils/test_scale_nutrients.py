@@ -0,0 +1,68 @@
+from fastapi_boilerplate.types import BaseNutrients, Nutrients, NutrientSource
+from fastapi_boilerplate.utils.scale_nutrients import scale_nutrients, to_base_nutrients
+
+TWO_APPLES = Nutrients(
+    name="apple",
+    quantity=2,
+    unit="medium",
+    calories_kcal=18928,
+    weight_grams=36400,
+    calories_kcal_per_gram=52,
+    protein_grams=94,
+    sodium_mg=364,
+    source=NutrientSource.NUTRITIONIX,
+)
+
+
+def test_to_base_nutrients():
+    base_nutrients = to_base_nutrients(TWO_APPLES, 2)
+    assert base_nutrients.quantity_per_unit == 1
+    assert base_nutrients.grams_per_unit == 182
+    assert base_nutrients.per_gram["calories_kcal"] == 0.52
+    assert set(base_nutrients.per_gram) == {
+        "calories_kcal",
+        "protein_grams",
+        "sodium_mg",
+    }
+
+
+def test_to_base_nutrients_without_weight():
+    nutrients = Nutrients(
+        name="apple",
+        quantity=1,
+        unit="medium",
+        calories_kcal=9464,
+        source=NutrientSource.NUTRITIONIX,
+    )
+    assert to_base_nutrients(nutrients, 1) is None
+
+
+def test_scale_nutrients():
+    base_nutrients = to_base_nutrients(TWO_APPLES, 2)
+    assert scale_nutrients(base_nutrients, 2) == TWO_APPLES
+    assert scale_nutrients(base_nutrients, 3) == Nutrients(
+        name="apple",
+        quantity=3,
+        unit="medium",
+        calories_kcal=28392,
+        weight_grams=54600,
+        calories_kcal_per_gram=52,
+        protein_grams=141,
+        sodium_mg=546,
+        source=NutrientSource.NUTRITIONIX,
+    )
+
+
+def test_scale_nutrients_without_calories():
+    base_nutrients = BaseNutrients(
+        name="water",
+        unit="cup",
+        quantity_per_unit=1,
+        grams_per_unit=240,
+        per_gram={},
+        source=NutrientSource.EDAMAM,
+    )
+    nutrients = scale_nutrients(base_nutrients, 0.5)
+    assert nutrients.quantity == 0
+    assert nutrients.calories_kcal is None
+    assert nutrients.weight_grams == 12000
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from fastapi_boilerplate.utils.single_flight import SingleFlight
+
+
+def counted(result, delay: float = 0.01):
+    calls = []
+
+    async def call():
+        calls.append(True)
+        await asyncio.sleep(delay)
+        return result
+
+    return call, calls
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_concurrent_calls():
+    single_flight = SingleFlight()
+    call, calls = counted("result")
+    results = await asyncio.gather(
+        single_flight.execute("key", call), single_flight.execute("key", call)
+    )
+    assert results == ["result", "result"]
+    assert calls == [True]
+    assert "key" not in single_flight
+
+
+@pytest.mark.anyio
+async def test_single_flight_does_not_share_different_keys():
+    single_flight = SingleFlight()
+    call, calls = counted("result")
+    await asyncio.gather(
+        single_flight.execute("key_1", call), single_flight.execute("key_2", call)
+    )
+    assert calls == [True, True]
+
+
+@pytest.mark.anyio
+async def test_single_flight_does_not_share_finished_calls():
+    single_flight = SingleFlight()
+    call, calls = counted("result")
+    await single_flight.execute("key", call)
+    await single_flight.execute("key", call)
+    assert calls == [True, True]
+
+
+@pytest.mark.anyio
+async def test_single_flight_survives_cancelled_first_caller():
+    single_flight = SingleFlight()
+    call, calls = counted("result", delay=0.05)
+    first = asyncio.create_task(single_flight.execute("key", call))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(single_flight.execute("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await follower == "result"
+    assert first.cancelled()
+    assert calls == [True]
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_exceptions():
+    single_flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise ValueError("test_error")
+
+    results = await asyncio.gather(
+        single_flight.execute("key", call),
+        single_flight.execute("key", call),
+        return_exceptions=True,
+    )
+    assert [str(result) for result in results] == ["test_error", "test_error"]
+    assert "key" not in single_flight
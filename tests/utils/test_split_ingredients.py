@@ -0,0 +1,17 @@
+from fastapi_boilerplate.utils.split_ingredients import split_ingredients
+
+
+def test_split_ingredients_with_single_ingredient():
+    assert split_ingredients("1 Apple") == ["1 apple"]
+
+
+def test_split_ingredients_with_many_ingredients():
+    assert split_ingredients("apple, Banana ,milk") == ["apple", "banana", "milk"]
+
+
+def test_split_ingredients_keeps_duplicates_and_order():
+    assert split_ingredients("milk, apple, milk") == ["milk", "apple", "milk"]
+
+
+def test_split_ingredients_with_empty_query():
+    assert split_ingredients(" , ") == []
@@ -0,0 +1,42 @@
+from fastapi_boilerplate.utils.token_bucket import TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_reserves_available_tokens():
+    token_bucket = TokenBucket(rate_per_second=1, capacity=2, clock=Clock())
+    assert token_bucket.reserve(max_wait_seconds=0) == 0
+    assert token_bucket.reserve(max_wait_seconds=0) == 0
+    assert token_bucket.reserve(max_wait_seconds=0) is None
+
+
+def test_token_bucket_queues_reservations():
+    token_bucket = TokenBucket(rate_per_second=2, capacity=1, clock=Clock())
+    assert token_bucket.reserve(max_wait_seconds=1) == 0
+    assert token_bucket.reserve(max_wait_seconds=1) == 0.5
+    assert token_bucket.reserve(max_wait_seconds=1) == 1
+    assert token_bucket.reserve(max_wait_seconds=1) is None
+
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = Clock()
+    token_bucket = TokenBucket(rate_per_second=1, capacity=2, clock=clock)
+    token_bucket.reserve(max_wait_seconds=0)
+    token_bucket.reserve(max_wait_seconds=0)
+    clock.now = 10
+    assert token_bucket.reserve(max_wait_seconds=0) == 0
+    assert token_bucket.reserve(max_wait_seconds=0) == 0
+    assert token_bucket.reserve(max_wait_seconds=0) is None
+
+
+def test_token_bucket_drain():
+    token_bucket = TokenBucket(rate_per_second=1, capacity=5, clock=Clock())
+    token_bucket.drain()
+    assert token_bucket.reserve(max_wait_seconds=0) is None
+    assert token_bucket.reserve(max_wait_seconds=1) == 1
@@ -0,0 +1,56 @@
+from fastapi_boilerplate.utils.trigram_index import TrigramIndex, trigrams
+
+
+def test_trigrams():
+    assert trigrams("milk") == {"  m", " mi", "mil", "ilk", "lk "}
+
+
+def test_match():
+    trigram_index = TrigramIndex(0.6)
+    for name in ["banana", "Banana ", "bread", "banana bread", "milk"]:
+        trigram_index.add(name)
+    assert len(trigram_index) == 4
+    assert trigram_index.match("Banana") == ("banana", 1.0)
+    assert trigram_index.match("bananna") == ("banana", 0.75)
+    assert trigram_index.match("banana breads")[0] == "banana bread"
+    assert trigram_index.match("silk") is None
+    assert trigram_index.match("") is None
+
+
+def similarity(a: str, b: str) -> float:
+    return len(trigrams(a) & trigrams(b)) / len(trigrams(a) | trigrams(b))
+
+
+def test_match_finds_every_similar_name():
+    trigram_index = TrigramIndex(0.7)
+    names = [f"{food} {i}" for food in ["apple", "milk", "rice"] for i in range(50)]
+    for name in names:
+        trigram_index.add(name)
+    assert "milk 42" in trigram_index
+    for query in ["aple 4", "milk 4 2", "rice 1", "rise 12", "apple pie"]:
+        best = max(similarity(query, name) for name in names)
+        match = trigram_index.match(query)
+        if best >= 0.7:
+            assert match[1] == best
+        else:
+            assert match is None
+
+
+def test_add():
+    trigram_index = TrigramIndex(0.6)
+    assert trigram_index.add("milk")
+    assert not trigram_index.add(" MILK")
+    assert not trigram_index.add(" ")
+
+
+def test_swap_indexes_names_added_during_build():
+    trigram_index = TrigramIndex(0.6)
+    trigram_index.add("milk")
+    trigram_index.add("banana", rebuild=False)
+    assert trigram_index.needs_rebuild()
+    ranks, postings = trigram_index.build(trigram_index.counts.copy(), 2)
+    trigram_index.add("chocolate", rebuild=False)
+    trigram_index.swap(ranks, postings, 2)
+    assert not trigram_index.needs_rebuild()
+    assert trigram_index.match("bananna")[0] == "banana"
+    assert trigram_index.match("chocolatte")[0] == "chocolate"